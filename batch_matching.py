@@ -0,0 +1,168 @@
+import os
+import time
+from array import array
+from collections import deque
+from typing import List, Iterable, Iterator, Tuple, Optional
+from graphHelpers import FREE, Graph, Matching
+from components import pack_edges, solve_packed, process_pool
+
+CHUNK_SIZE = 256
+
+
+class MatchingBatch:
+    """
+    Solves many independent graphs and streams their maximum matchings back.
+
+    Graphs are read lazily from the iterable and packed into chunks of chunk_size instances.
+    A chunk travels to a worker as three flat int arrays (vertex counts, edge sources and edge
+    targets) and is solved as one disjoint union with compute_maximum_matching_csr, so the
+    per-instance Python overhead is a few array appends; only the int32 mate array comes back.
+    At most four chunks per worker are in flight, which bounds memory for endless inputs.
+    """
+
+    def __init__(self, graphs: Iterable[Graph], workers: Optional[int] = None, backend: str = "auto", initializer: Optional[str] = None,
+                 chunk_size: int = CHUNK_SIZE, ordered: bool = True):
+        """
+        Args:
+            graphs (Iterable[Graph]): The instances to solve.
+            workers (int, optional): Number of worker processes. 1 solves every chunk in this
+                process. Defaults to os.cpu_count().
+            backend (str, optional): An engine accepted by compute_maximum_matching_csr. It is
+                chosen per chunk, and stored in the engine attribute of every matching.
+            initializer (str, optional): A heuristic from initial_matching.py to run first.
+            chunk_size (int, optional): Number of instances shipped to a worker at once.
+            ordered (bool, optional): Yield results in input order. Otherwise they are yielded
+                chunk by chunk as workers complete them.
+        """
+        self.graphs = graphs
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.initializer = initializer
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        self.instances = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns:
+            float: Instances solved per second spent packing, solving and unpacking them so far.
+        """
+        return self.instances / self.elapsed if self.elapsed else 0.0
+
+    def __iter__(self) -> Iterator[Tuple[int, Matching]]:
+        """
+        Yields:
+            Tuple[int, Matching]: The position of a graph in the input and its maximum matching.
+        """
+        # Only the time spent inside the batch counts towards elapsed, not the consumer's time
+        # between items.
+        start = time.perf_counter()
+        for chunk, result in self.solve_chunks():
+            matchings = list(unpack_chunk(chunk, *result))
+            self.elapsed += time.perf_counter() - start
+            self.instances += len(matchings)
+            yield from matchings
+            start = time.perf_counter()
+        self.elapsed += time.perf_counter() - start
+
+    def solve_chunks(self) -> Iterator[Tuple[tuple, Tuple[array, str]]]:
+        """
+        Yields:
+            Tuple[tuple, Tuple[array, str]]: Every packed chunk with the result of solve_chunk.
+        """
+        chunks = pack_chunks(self.graphs, self.chunk_size)
+        if self.workers == 1:
+            for chunk in chunks:
+                yield chunk, solve_chunk(*chunk[2:], self.backend, self.initializer)
+            return
+        with process_pool(self.workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                if len(pending) >= 4 * self.workers:
+                    yield from self.collect(pending)
+                pending.append((chunk, executor.submit(solve_chunk, *chunk[2:], self.backend, self.initializer)))
+            while pending:
+                yield from self.collect(pending)
+
+    def collect(self, pending: deque) -> Iterator[Tuple[tuple, Tuple[array, str]]]:
+        """
+        Removes finished chunks from the in-flight queue: the oldest one when results are ordered,
+        otherwise every chunk that is done once at least one is.
+        """
+        if self.ordered:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+            return
+        from concurrent.futures import wait, FIRST_COMPLETED
+        done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+        for item in [item for item in pending if item[1] in done]:
+            pending.remove(item)
+            yield item[0], item[1].result()
+
+def pack_chunks(graphs: Iterable[Graph], chunk_size: int) -> Iterator[Tuple[int, List[list], array, array, array]]:
+    """
+    Groups graphs into chunks and numbers the vertices of every chunk consecutively.
+
+    Args:
+        graphs (Iterable[Graph]): The instances to pack.
+        chunk_size (int): Number of instances per chunk.
+
+    Yields:
+        Tuple[int, List[list], array, array, array]: The input position of the first instance,
+        the vertex labels of every instance, which stay in this process, and the vertex counts,
+        edge sources and edge targets that are sent to the worker.
+    """
+    first, offset, labels, sizes, sources, targets = 0, 0, [], array('i'), array('i'), array('i')
+    for graph in graphs:
+        nodes = list(graph.adjacency)
+        index = {node: offset + position for position, node in enumerate(nodes)}
+        pack_edges(graph.edge_order.values(), index, sources, targets)
+        labels.append(nodes)
+        sizes.append(len(nodes))
+        offset += len(nodes)
+        if len(sizes) == chunk_size:
+            yield first, labels, sizes, sources, targets
+            first, offset = first + len(sizes), 0
+            labels, sizes, sources, targets = [], array('i'), array('i'), array('i')
+    if sizes:
+        yield first, labels, sizes, sources, targets
+
+def solve_chunk(sizes: array, sources: array, targets: array, backend: str = "auto", initializer: Optional[str] = None) -> Tuple[array, str]:
+    """
+    Computes the maximum matching of every instance of a chunk. This is the function run by the worker processes.
+
+    Args:
+        sizes (array): Number of vertices of every instance.
+        sources (array): First endpoint of every edge, numbered across the chunk.
+        targets (array): Second endpoint of every edge.
+        backend (str, optional): An engine accepted by compute_maximum_matching_csr.
+        initializer (str, optional): A heuristic from initial_matching.py to run first.
+
+    Returns:
+        Tuple[array, str]: The partner of every vertex of the chunk, or FREE, and the engine that ran.
+    """
+    graph = solve_packed(sum(sizes), sources, targets, backend=backend, initializer=initializer)
+    mate = array('i')
+    mate.frombytes(graph.mate.tobytes())
+    return mate, graph.engine
+
+def unpack_chunk(chunk: Tuple[int, List[list], array, array, array], mate: array, engine: str) -> Iterator[Tuple[int, Matching]]:
+    """
+    Turns the mate array of a chunk back into one Matching per instance.
+
+    Yields:
+        Tuple[int, Matching]: The input position of every instance and its matching.
+    """
+    first, labels, sizes = chunk[:3]
+    offset = 0
+    for position, nodes in enumerate(labels):
+        matching = Matching()
+        for vertex, node in enumerate(nodes):
+            partner = mate[offset + vertex]
+            if partner != FREE and offset + vertex < partner:
+                matching.add_edge(node, nodes[partner - offset])
+        matching.engine = engine
+        offset += sizes[position]
+        yield first + position, matching
@@ -0,0 +1,45 @@
+"""
+Compares solving many small graphs one compute_maximum_matching call at a time with compute_maximum_matching_batch.
+
+Usage: python benchmarks/bench_batch.py [instances] [max nodes] [average degree] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench_phases import random_graph
+from blossomAlgo import compute_maximum_matching, compute_maximum_matching_batch
+from graphHelpers import Matching
+from listeners import NullListener
+
+
+def main():
+    instances = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    max_nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    degree = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    rng = random.Random(seed)
+    graphs = [random_graph(nodes, min(degree, nodes - 1), seed + index)
+              for index, nodes in enumerate(rng.randint(2, max_nodes) for _ in range(instances))]
+    print(f"{instances} graphs, {sum(len(graph.edges) for graph in graphs)} edges in total")
+
+    start = time.perf_counter()
+    expected = [len(compute_maximum_matching(graph, Matching(), NullListener()).edges) for graph in graphs]
+    elapsed = time.perf_counter() - start
+    print(f"{'run':<30}{'instances/s':>14}")
+    print(f"{'one call per graph':<30}{instances / elapsed:>14.0f}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        for ordered in (True, False):
+            batch = compute_maximum_matching_batch(graphs, workers=workers, ordered=ordered)
+            for index, matching in batch:
+                assert len(matching.edges) == expected[index]
+            print(f"{f'batch, {workers} workers' + ('' if ordered else ', unordered'):<30}{batch.throughput:>14.0f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures how solving connected components on a process pool scales with the number of workers.
+
+The graph is a disjoint union of seeded random graphs of mixed sizes, with many tiny components.
+
+Usage: python benchmarks/bench_components.py [components] [largest component] [average degree] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench_phases import random_graph
+from blossomAlgo import compute_maximum_matching
+from graphHelpers import Graph, Matching
+from listeners import NullListener
+
+
+def disjoint_union(components: int, largest: int, degree: float, seed: int) -> Graph:
+    """
+    Builds a graph made of random components whose sizes range from 2 to largest vertices.
+
+    Args:
+        components (int): Number of components.
+        largest (int): Size of the largest component. Sizes are drawn towards the small end.
+        degree (float): Average vertex degree inside every component.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        Graph: The generated graph.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    offset = 0
+    for index in range(components):
+        size = max(2, int(largest * rng.random() ** 4))
+        part = random_graph(size, min(degree, size - 1), seed + index)
+        for vertex in part.nodes:
+            graph.add_node(vertex + offset)
+        for vertex1, vertex2 in part.edges:
+            graph.add_edge(vertex1 + offset, vertex2 + offset)
+        offset += size
+    return graph
+
+
+def main():
+    components = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    largest = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    degree = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    graph = disjoint_union(components, largest, degree, seed)
+    print(f"{len(graph.nodes)} nodes, {len(graph.edges)} edges, {components} components")
+
+    start = time.perf_counter()
+    baseline = compute_maximum_matching(graph, Matching(), NullListener(), backend="edmonds", multi_path=True)
+    serial = time.perf_counter() - start
+    print(f"{'workers':<10}{'edges':>8}{'seconds':>10}{'speedup':>10}")
+    print(f"{'none':<10}{len(baseline.edges):>8}{serial:>10.2f}{1.0:>10.1f}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        matching = compute_maximum_matching(graph, Matching(), NullListener(), backend="edmonds", workers=workers)
+        elapsed = time.perf_counter() - start
+        assert len(matching.edges) == len(baseline.edges)
+        print(f"{workers:<10}{len(matching.edges):>8}{elapsed:>10.2f}{serial / elapsed:>10.1f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
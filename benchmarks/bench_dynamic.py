@@ -0,0 +1,53 @@
+"""
+Measures the latency of DynamicMatching updates against solving the changed graph from scratch.
+
+Usage: python benchmarks/bench_dynamic.py [nodes] [average degree] [updates] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench_phases import random_graph
+from dynamic_matching import DynamicMatching
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    updates = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    # Offset from the graph's seed so the inserted pairs are not the graph's own edges replayed.
+    rng = random.Random(seed + 1)
+    graph = random_graph(nodes, degree, seed)
+    dynamic = DynamicMatching(graph)
+    print(f"{nodes} nodes, {len(graph.edges)} edges, {len(dynamic.matching.edges)} matched edges")
+
+    latencies = {"insert_edge": [], "delete_edge": []}
+    initial_augmentations = dynamic.augmentations
+    for _ in range(updates):
+        if rng.random() < 0.5:
+            operation, edge = "insert_edge", rng.sample(range(nodes), 2)
+        else:
+            operation, edge = "delete_edge", rng.choice(list(dynamic.matching.edges) if rng.random() < 0.5 else graph.edges)
+        start = time.perf_counter()
+        getattr(dynamic, operation)(*edge)
+        latencies[operation].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    DynamicMatching(graph.copy())
+    full_solve = time.perf_counter() - start
+
+    print(f"{'update':<14}{'count':>7}{'mean ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for operation, samples in latencies.items():
+        samples.sort()
+        if samples:
+            print(f"{operation:<14}{len(samples):>7}{1000 * sum(samples) / len(samples):>10.3f}"
+                  f"{1000 * samples[int(0.99 * (len(samples) - 1))]:>10.3f}{1000 * samples[-1]:>10.3f}")
+    print(f"full solve: {1000 * full_solve:.1f} ms, {dynamic.augmentations - initial_augmentations} augmentations over all updates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Measures how long matching_export takes to write SVG and PNG pictures of a maximum matching on a
+large grid graph. Runs without a display.
+
+Usage: python benchmarks/bench_export.py [rows] [columns] [png size]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from generators import grid_graph
+from blossomAlgo import compute_maximum_matching
+from graphHelpers import Matching
+from matching_export import write_svg, write_png
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    graph = grid_graph(rows, columns)
+    matching = compute_maximum_matching(graph, Matching())
+    positions = {node: (node % columns, node // columns) for node in graph.nodes}
+    print(f"{len(graph.nodes)} nodes, {len(graph.edges)} edges, {len(matching.edges)} matched")
+    print(f"{'format':<10}{'seconds':>10}{'bytes':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write, options in (("svg", write_svg, {}), ("svgz", write_svg, {}),
+                                     ("png", write_png, {"width": size, "height": size})):
+            path = os.path.join(directory, f"matching.{name}")
+            start = time.perf_counter()
+            write(graph, matching, positions, path, **options)
+            print(f"{name:<10}{time.perf_counter() - start:>10.3f}{os.path.getsize(path):>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
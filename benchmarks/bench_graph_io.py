@@ -0,0 +1,67 @@
+"""
+Compares building a CSR graph from a text edge list with mapping the binary format of graph_io.py.
+
+Usage: python benchmarks/bench_graph_io.py [nodes] [average degree] [seed]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench_phases import random_graph
+from blossomAlgo import compute_maximum_matching_csr
+from graphHelpers import CSRGraph
+from graph_io import save_graph, load_graph
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    graph = CSRGraph.from_graph(random_graph(nodes, degree, seed))
+    with tempfile.TemporaryDirectory() as directory:
+        text_path, binary_path = os.path.join(directory, "graph.txt"), os.path.join(directory, "graph.bin")
+        with open(text_path, "w") as file:
+            for vertex in graph:
+                for neighbor in graph[vertex]:
+                    if vertex < neighbor:
+                        file.write(f"{vertex}\t{neighbor}\n")
+        start = time.perf_counter()
+        save_graph(graph, binary_path)
+        save_time = time.perf_counter() - start
+        print(f"{nodes} nodes, {graph.edge_count()} edges: text {os.path.getsize(text_path) >> 20} MiB, "
+              f"binary {os.path.getsize(binary_path) >> 20} MiB, saved in {save_time:.2f} s")
+
+        start = time.perf_counter()
+        sources, targets = [], []
+        with open(text_path) as file:
+            for line in file:
+                source, target = line.split()
+                sources.append(int(source))
+                targets.append(int(target))
+        parsed = CSRGraph.from_edges(nodes, sources, targets)
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mapped = load_graph(binary_path)
+        load_time = time.perf_counter() - start
+        print(f"{'load':<18}{'seconds':>10}")
+        print(f"{'parse text':<18}{parse_time:>10.3f}")
+        print(f"{'load_graph':<18}{load_time:>10.6f}")
+
+        start = time.perf_counter()
+        compute_maximum_matching_csr(parsed, "edmonds")
+        in_memory = time.perf_counter() - start
+        start = time.perf_counter()
+        compute_maximum_matching_csr(mapped, "edmonds")
+        on_map = time.perf_counter() - start
+        assert sum(1 for vertex in parsed if parsed.mate[vertex] >= 0) == sum(1 for vertex in mapped if mapped.mate[vertex] >= 0)
+        print(f"{'solve in memory':<18}{in_memory:>10.3f}")
+        print(f"{'solve on mmap':<18}{on_map:>10.3f}")
+        del mapped
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measures the cold start of importing the algorithms in fresh interpreters and checks that it loads no GUI module.
+
+Usage: python benchmarks/bench_import.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+STATEMENTS = (
+    "from blossomAlgo import compute_maximum_matching",
+    "import graph_visualizer",
+)
+# Modules that the algorithms must not import: the GUI and the process pool are loaded on first use.
+LAZY_MODULES = ("tkinter", "graphics", "graph_visualizer", "concurrent.futures")
+
+
+def cold_start(statement: str, runs: int) -> float:
+    """
+    Runs a statement in fresh interpreters and returns the median wall time in seconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def loaded_modules(statement: str):
+    """
+    Returns the modules of LAZY_MODULES that a statement imports.
+    """
+    check = f"{statement}\nimport sys\nprint(' '.join(name for name in {LAZY_MODULES!r} if name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", check], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # Warm the bytecode cache so that compilation is not measured.
+    subprocess.run([sys.executable, "-c", "import blossomAlgo, graph_visualizer"], cwd=ROOT, check=True)
+    baseline = cold_start("pass", runs)
+    print(f"interpreter startup {baseline * 1000:.1f} ms, median of {runs} runs")
+    print(f"{'statement':<52}{'median ms':>10}{'import ms':>10}  loaded")
+    for statement in STATEMENTS:
+        elapsed = cold_start(statement, runs)
+        print(f"{statement:<52}{elapsed * 1000:>10.1f}{(elapsed - baseline) * 1000:>10.1f}  {' '.join(loaded_modules(statement))}")
+    leaked = loaded_modules(STATEMENTS[0])
+    if leaked:
+        print(f"importing the algorithms loaded {', '.join(leaked)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
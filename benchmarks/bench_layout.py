@@ -0,0 +1,48 @@
+"""
+Measures how long the layouts of layout.py take on seeded graphs of growing size, and how far
+Barnes-Hut repulsion is from the exact one. Runs without a display; needs NumPy.
+
+Usage: python benchmarks/bench_layout.py [largest node count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import numpy as np
+
+from generators import grid_graph, random_regular_graph
+from layout import circular_layout, bipartite_layout, spectral_layout, fruchterman_reingold_layout, _exact_repulsion, _grid_repulsion
+
+LAYOUTS = (("force", fruchterman_reingold_layout), ("spectral", spectral_layout),
+           ("circular", circular_layout), ("bipartite", bipartite_layout))
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    points = np.random.default_rng(0).uniform(0, 100, (5000, 2))
+    exact, approximate = _exact_repulsion(points), _grid_repulsion(points)
+    error = np.linalg.norm(exact - approximate, axis=1) / np.linalg.norm(exact, axis=1)
+    print(f"Barnes-Hut repulsion on 5000 points: median error {np.median(error):.4f}, 95th percentile {np.percentile(error, 95):.4f}")
+    print(f"{'graph':<22}{'nodes':>8}{'edges':>8}" + "".join(f"{name:>11}" for name, _ in LAYOUTS))
+    size = 1000
+    while size <= largest:
+        columns = int(size ** 0.5)
+        for name, graph in ((f"grid {size // columns}x{columns}", grid_graph(size // columns, columns)),
+                            ("random 3-regular", random_regular_graph(size, 3, 0))):
+            row = f"{name:<22}{len(graph.nodes):>8}{len(graph.edges):>8}"
+            for layout_name, layout in LAYOUTS:
+                start = time.perf_counter()
+                try:
+                    layout(graph)
+                    row += f"{time.perf_counter() - start:>11.3f}"
+                except ValueError:
+                    row += f"{'-':>11}"
+            print(row)
+        size *= 10
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Measures what the listener costs: no listener, the NullListener, the CountingListener and a TraceRecorder on the same graph.
+
+Usage: python benchmarks/bench_listeners.py [nodes] [average degree] [seed] [repeat]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench_phases import random_graph
+from blossomAlgo import compute_maximum_matching
+from graphHelpers import Matching
+from listeners import NullListener, CountingListener
+from matching_trace import TraceRecorder
+
+ENGINES = (("edmonds", False), ("edmonds", True), ("micali_vazirani", False))
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    repeat = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    graph = random_graph(nodes, degree, seed)
+    print(f"{nodes} nodes, {len(graph.edges)} edges, seed {seed}")
+    print(f"{'engine':<16}{'multi_path':<12}{'none':>10}{'null':>10}{'counting':>10}{'trace':>10}{'overhead':>10}")
+    for backend, multi_path in ENGINES:
+        timings = {}
+        for name, make_listener in (("none", lambda: None), ("null", NullListener), ("counting", CountingListener),
+                                    ("trace", lambda: TraceRecorder(os.devnull))):
+            best = float("inf")
+            for _ in range(repeat):
+                listener = make_listener()
+                start = time.perf_counter()
+                compute_maximum_matching(graph, Matching(), listener, backend=backend, multi_path=multi_path)
+                best = min(best, time.perf_counter() - start)
+                if isinstance(listener, TraceRecorder):
+                    listener.close()
+            timings[name] = best
+        print(f"{backend:<16}{str(multi_path):<12}{timings['none']:>10.3f}{timings['null']:>10.3f}{timings['counting']:>10.3f}"
+              f"{timings['trace']:>10.3f}{timings['counting'] / timings['none']:>9.2f}x")
+    counters = CountingListener()
+    compute_maximum_matching(graph, Matching(), counters, backend="edmonds")
+    for event, value in counters.summary().items():
+        print(f"{event:<24}{value}")
+
+
+if __name__ == "__main__":
+    main()
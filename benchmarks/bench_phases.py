@@ -0,0 +1,68 @@
+"""
+Compares how many searches each engine and initializer needs and how long it takes on seeded random graphs.
+
+Usage: python benchmarks/bench_phases.py [nodes] [average degree] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from blossomAlgo import compute_maximum_matching
+from graphHelpers import Graph, Matching
+from listeners import NullListener
+
+RUNS = (
+    ("edmonds", False, None),
+    ("edmonds", True, None),
+    ("micali_vazirani", False, None),
+    ("edmonds", False, "greedy"),
+    ("edmonds", False, "min_degree"),
+    ("edmonds", False, "karp_sipser"),
+)
+
+
+def random_graph(nodes: int, degree: float, seed: int) -> Graph:
+    """
+    Builds a G(n, m) random graph with the given average degree.
+
+    Args:
+        nodes (int): Number of vertices.
+        degree (float): Average vertex degree.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        Graph: The generated graph.
+    """
+    rng = random.Random(seed)
+    edges = set()
+    while len(edges) < int(nodes * degree / 2):
+        node1, node2 = rng.randrange(nodes), rng.randrange(nodes)
+        if node1 != node2:
+            edges.add((min(node1, node2), max(node1, node2)))
+    graph = Graph()
+    graph.nodes = list(range(nodes))
+    graph.edges = [list(edge) for edge in sorted(edges)]
+    return graph
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    graph = random_graph(nodes, degree, seed)
+    print(f"{nodes} nodes, {len(graph.edges)} edges, seed {seed}")
+    print(f"{'engine':<16}{'multi_path':<12}{'initializer':<13}{'size':>8}{'phases':>8}{'seconds':>10}")
+    for backend, multi_path, initializer in RUNS:
+        start = time.perf_counter()
+        matching = compute_maximum_matching(graph, Matching(), NullListener(), backend=backend, multi_path=multi_path,
+                                            initializer=initializer)
+        elapsed = time.perf_counter() - start
+        print(f"{matching.engine:<16}{str(multi_path):<12}{str(initializer):<13}{len(matching.edges):>8}"
+              f"{matching.phases:>8}{elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Measures the throughput of the streaming graph readers of graph_io.py in edges per second.
+
+Usage: python benchmarks/bench_readers.py [edges] [nodes] [seed]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from graph_io import read_edges
+
+
+def main():
+    edges = int(sys.argv[1]) if len(sys.argv) > 1 else 5000000
+    nodes = int(sys.argv[2]) if len(sys.argv) > 2 else edges // 2
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    rng = random.Random(seed)
+    pairs = [(rng.randint(1, nodes), rng.randint(1, nodes)) for _ in range(edges)]
+    writers = {
+        "edge_list": ("graph.tsv", "", "{}\t{}\n"),
+        "dimacs": ("graph.col", f"p edge {nodes} {edges}\n", "e {} {}\n"),
+        "matrix_market": ("graph.mtx", f"%%MatrixMarket matrix coordinate pattern symmetric\n{nodes} {nodes} {edges}\n", "{} {}\n"),
+    }
+    print(f"{edges} edges over {nodes} nodes")
+    print(f"{'format':<16}{'MiB':>8}{'edges':>12}{'seconds':>10}{'M edges/s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format, (name, header, line) in writers.items():
+            path = os.path.join(directory, name)
+            with open(path, "w") as file:
+                file.write(header)
+                file.writelines(line.format(*pair) for pair in pairs)
+            start = time.perf_counter()
+            _, sources, _ = read_edges(path, file_format)
+            elapsed = time.perf_counter() - start
+            print(f"{file_format:<16}{os.path.getsize(path) >> 20:>8}{len(sources):>12}{elapsed:>10.2f}{edges / elapsed / 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures how fast GraphVisualizer draws and recolours a graph with autoflush on, with autoflush off,
+and with changes batched into frames. Needs a display.
+
+Usage: python benchmarks/bench_render.py [nodes] [average degree] [seed] [changes per frame]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench_phases import random_graph
+from graph_visualizer import GraphVisualizer
+
+SIZE = 800
+MODES = ("autoflush", "manual", "batch")
+
+
+def render(graph, positions, mode: str, per_frame: int, seed: int):
+    """
+    Draws the graph, then colours every edge red and back in the given mode.
+
+    Returns:
+        Tuple[float, int, float, int]: Seconds spent drawing, canvas items created, seconds spent recolouring and frames drawn.
+    """
+    visualizer = GraphVisualizer(SIZE, SIZE, autoflush=mode == "autoflush", frame_rate=None)
+    try:
+        start = time.perf_counter()
+        if mode == "batch":
+            with visualizer.batch():
+                draw(visualizer, graph, positions)
+        else:
+            draw(visualizer, graph, positions)
+            visualizer.refresh()
+            visualizer.win.update()
+        drawn = time.perf_counter() - start
+        items = len(visualizer.drawn)
+        edges = list(graph.edges)
+        random.Random(seed).shuffle(edges)
+        changes = [(vertex1, vertex2, color) for color in ("red", "black") for vertex1, vertex2 in edges]
+        frames = 0
+        start = time.perf_counter()
+        for first in range(0, len(changes), per_frame):
+            if mode == "batch":
+                with visualizer.batch():
+                    for vertex1, vertex2, color in changes[first:first + per_frame]:
+                        visualizer.update_edge(vertex1, vertex2, color)
+            else:
+                for vertex1, vertex2, color in changes[first:first + per_frame]:
+                    visualizer.update_edge(vertex1, vertex2, color)
+                visualizer.win.update()
+            frames += 1
+        return drawn, items, time.perf_counter() - start, frames
+    finally:
+        visualizer.close()
+
+def draw(visualizer, graph, positions):
+    for node in graph.nodes:
+        visualizer.draw_node(node, *positions[node])
+    for vertex1, vertex2 in graph.edges:
+        visualizer.draw_edge(vertex1, vertex2)
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    per_frame = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+    graph = random_graph(nodes, degree, seed)
+    rng = random.Random(seed)
+    positions = {node: (rng.uniform(20, SIZE - 20), rng.uniform(20, SIZE - 20)) for node in graph.nodes}
+    print(f"{nodes} nodes, {len(graph.edges)} edges, {per_frame} changes per frame")
+    print(f"{'mode':<12}{'draw s':>10}{'items':>10}{'items/s':>12}{'recolour s':>12}{'changes/s':>12}{'frames':>8}")
+    for mode in MODES:
+        try:
+            drawn, items, recoloured, frames = render(graph, positions, mode, per_frame, seed)
+        except Exception as error:
+            print(f"cannot open a window: {error}")
+            return 1
+        print(f"{mode:<12}{drawn:>10.3f}{items:>10}{items / drawn:>12.0f}{recoloured:>12.3f}{2 * len(graph.edges) / recoloured:>12.0f}{frames:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Compares root paths and tree paths from BFS (shortest_path) with the parent pointers kept by Tree.
+
+Usage: python benchmarks/bench_tree_paths.py [depth] [queries]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from graphHelpers import Tree, shortest_path
+
+
+def forked_tree(depth: int) -> Tree:
+    """
+    Builds a tree made of two branches of the given depth hanging from a shared stem.
+
+    Args:
+        depth (int): Number of vertices on the stem and on each branch.
+
+    Returns:
+        Tree: The tree, rooted at 0. The branch leaves are 3 * depth - 1 and 2 * depth - 1.
+    """
+    tree = Tree(0)
+    for vertex in range(1, depth):
+        tree.add_edge(vertex - 1, vertex)
+    previous_left = previous_right = depth - 1
+    for offset in range(depth):
+        tree.add_edge(previous_left, depth + offset)
+        tree.add_edge(previous_right, 2 * depth + offset)
+        previous_left, previous_right = depth + offset, 2 * depth + offset
+    return tree
+
+
+def measure(query, queries: int) -> float:
+    """
+    Returns the average running time of a query in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(queries):
+        query()
+    return (time.perf_counter() - start) / queries
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    tree = forked_tree(depth)
+    leaf1, leaf2 = 2 * depth - 1, 3 * depth - 1
+    assert shortest_path(tree.graph, tree.root, leaf1) == tree.path_to_root(leaf1)[::-1]
+    assert shortest_path(tree.graph, leaf1, leaf2) == tree.path(leaf1, leaf2)
+
+    print(f"{len(tree.nodes)} vertices, branch depth {2 * depth}")
+    print(f"{'query':<12}{'bfs ms':>10}{'parent ms':>12}{'speedup':>10}")
+    for name, bfs, pointers in (
+        ("root path", lambda: shortest_path(tree.graph, tree.root, leaf1), lambda: tree.path_to_root(leaf1)),
+        ("leaf path", lambda: shortest_path(tree.graph, leaf1, leaf2), lambda: tree.path(leaf1, leaf2)),
+    ):
+        bfs_time, pointer_time = measure(bfs, queries), measure(pointers, queries)
+        print(f"{name:<12}{bfs_time * 1000:>10.3f}{pointer_time * 1000:>12.3f}{bfs_time / pointer_time:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures how long GraphVisualizer takes to show a view of a large graph while zooming in from the
+whole graph to a few vertices and panning, with viewport culling and level of detail. Needs a display.
+
+Usage: python benchmarks/bench_viewport.py [rows] [columns] [zoom steps]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from generators import grid_graph
+from graph_visualizer import GraphVisualizer
+
+SIZE = 800
+SPACING = 60
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    graph = grid_graph(rows, columns)
+    rng = random.Random(0)
+    print(f"{len(graph.nodes)} nodes, {len(graph.edges)} edges")
+    try:
+        visualizer = GraphVisualizer(SIZE, SIZE, frame_rate=None)
+    except Exception as error:
+        print(f"cannot open a window: {error}")
+        return 1
+    try:
+        start = time.perf_counter()
+        for node in graph.nodes:
+            visualizer.draw_node(node, (node % columns + rng.uniform(-0.3, 0.3)) * SPACING,
+                                 (node // columns + rng.uniform(-0.3, 0.3)) * SPACING)
+        for vertex1, vertex2 in graph.edges:
+            visualizer.draw_edge(vertex1, vertex2)
+        print(f"indexed in {time.perf_counter() - start:.3f} s")
+        print(f"{'view':<10}{'zoom':>10}{'seconds':>10}{'nodes':>8}{'labels':>8}{'edges':>8}{'bundles':>8}")
+        views = [("fit", lambda: visualizer.fit()), ("fit again", lambda: visualizer.fit())]
+        views += [("zoom in", lambda: visualizer.zoom_by(2))] * steps
+        views += [("pan", lambda: visualizer.pan(SIZE / 4, SIZE / 8))]
+        for name, change in views:
+            change()
+            start = time.perf_counter()
+            visualizer.flush()
+            print(f"{name:<10}{visualizer.zoom:>10.4f}{time.perf_counter() - start:>10.3f}{len(visualizer.node_objects):>8}"
+                  f"{len(visualizer.label_objects):>8}{len(visualizer.edge_objects):>8}{len(visualizer.bundle_objects):>8}")
+    finally:
+        visualizer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
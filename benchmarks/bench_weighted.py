@@ -0,0 +1,49 @@
+"""
+Times the primal-dual maximum-weight matching on a seeded random graph with integer weights.
+
+If networkx is installed, its max_weight_matching is run on the same graph to compare the total weight.
+
+Usage: python benchmarks/bench_weighted.py [nodes] [average degree] [max weight] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench_phases import random_graph
+from weighted_matching import maximum_weight_matching
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 6.0
+    max_weight = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    rng = random.Random(seed)
+    graph = random_graph(nodes, degree, seed)
+    for vertex1, vertex2 in list(graph.edges):
+        graph.add_edge(vertex1, vertex2, rng.randint(1, max_weight))
+    print(f"{nodes} nodes, {len(graph.edges)} edges, weights 1..{max_weight}")
+
+    print(f"{'mode':<18}{'edges':>8}{'weight':>12}{'seconds':>10}")
+    for name, options in (("max weight", {}), ("max cardinality", {"maxcardinality": True})):
+        start = time.perf_counter()
+        matching = maximum_weight_matching(graph, **options)
+        print(f"{name:<18}{len(matching.edges):>8}{matching.weight:>12}{time.perf_counter() - start:>10.2f}")
+
+    try:
+        import networkx
+    except ImportError:
+        return
+    reference = networkx.Graph()
+    reference.add_weighted_edges_from(graph.weighted_edges())
+    start = time.perf_counter()
+    edges = networkx.max_weight_matching(reference)
+    weight = sum(reference[vertex1][vertex2]["weight"] for vertex1, vertex2 in edges)
+    print(f"{'networkx':<18}{len(edges):>8}{weight:>12}{time.perf_counter() - start:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
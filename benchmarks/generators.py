@@ -0,0 +1,183 @@
+"""
+Seeded graph generators for the benchmark suite. Every generator returns a Graph whose vertices
+are numbered from 0, and the same arguments always give the same graph.
+"""
+import math
+import os
+import random
+import sys
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from graphHelpers import Graph
+
+
+def gnp_graph(nodes: int, probability: float, seed: int) -> Graph:
+    """
+    Builds an Erdos-Renyi G(n, p) graph in O(n + m) by skipping geometrically over absent edges.
+
+    Args:
+        nodes (int): Number of vertices.
+        probability (float): Probability of every edge.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        Graph: The generated graph.
+    """
+    rng = random.Random(seed)
+    graph = empty_graph(nodes)
+    if probability <= 0:
+        return graph
+    if probability >= 1:
+        return complete_graph(nodes)
+    log_q = math.log(1 - probability)
+    vertex, neighbor = 1, -1
+    while vertex < nodes:
+        neighbor += 1 + int(math.log(1 - rng.random()) / log_q)
+        while neighbor >= vertex and vertex < nodes:
+            neighbor -= vertex
+            vertex += 1
+        if vertex < nodes:
+            graph.add_edge(neighbor, vertex)
+    return graph
+
+def random_regular_graph(nodes: int, degree: int, seed: int) -> Graph:
+    """
+    Builds a random degree-regular simple graph by pairing vertex stubs, restarting on a self-loop or a repeated edge.
+
+    Args:
+        nodes (int): Number of vertices. nodes * degree must be even.
+        degree (int): Degree of every vertex.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        Graph: The generated graph.
+    """
+    if nodes * degree % 2 or degree >= nodes:
+        raise ValueError("A degree-regular graph needs nodes * degree even and degree < nodes")
+    rng = random.Random(seed)
+    while True:
+        stubs = [vertex for vertex in range(nodes) for _ in range(degree)]
+        rng.shuffle(stubs)
+        edges = set()
+        for index in range(0, len(stubs), 2):
+            vertex1, vertex2 = sorted(stubs[index:index + 2])
+            if vertex1 == vertex2 or (vertex1, vertex2) in edges:
+                break
+            edges.add((vertex1, vertex2))
+        else:
+            graph = empty_graph(nodes)
+            for vertex1, vertex2 in sorted(edges):
+                graph.add_edge(vertex1, vertex2)
+            return graph
+
+def grid_graph(rows: int, columns: int) -> Graph:
+    """
+    Builds a rows x columns grid. Grids are bipartite and have long augmenting paths.
+
+    Args:
+        rows (int): Number of rows.
+        columns (int): Number of columns.
+
+    Returns:
+        Graph: The generated graph, vertex row * columns + column at each position.
+    """
+    graph = empty_graph(rows * columns)
+    for row in range(rows):
+        for column in range(columns):
+            vertex = row * columns + column
+            if column + 1 < columns:
+                graph.add_edge(vertex, vertex + 1)
+            if row + 1 < rows:
+                graph.add_edge(vertex, vertex + columns)
+    return graph
+
+def nested_odd_cycles(levels: int, cycle: int, seed: int) -> Graph:
+    """
+    Builds a blossom-heavy graph: an odd cycle of odd cycles of ... of single vertices.
+
+    A gadget of level k is made of cycle gadgets of level k - 1 joined in a ring, each by one
+    edge between random vertices of neighbouring gadgets. Every gadget has an odd number of
+    vertices, so the searches keep contracting blossoms nested levels deep. Vertex numbers are
+    shuffled so that the input order does not follow the structure.
+
+    Args:
+        levels (int): Nesting depth. The graph has cycle ** levels vertices.
+        cycle (int): Odd length of every ring, at least 3.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        Graph: The generated graph.
+    """
+    if cycle < 3 or cycle % 2 == 0:
+        raise ValueError("The ring length must be odd and at least 3")
+    rng = random.Random(seed)
+    gadgets = [[vertex] for vertex in range(cycle ** levels)]
+    edges = []
+    while len(gadgets) > 1:
+        rings = []
+        for start in range(0, len(gadgets), cycle):
+            ring = gadgets[start:start + cycle]
+            for index, gadget in enumerate(ring):
+                edges.append((rng.choice(gadget), rng.choice(ring[(index + 1) % cycle])))
+            rings.append([vertex for gadget in ring for vertex in gadget])
+        gadgets = rings
+    names = list(range(cycle ** levels))
+    rng.shuffle(names)
+    graph = empty_graph(len(names))
+    for vertex1, vertex2 in edges:
+        graph.add_edge(names[vertex1], names[vertex2])
+    return graph
+
+def complete_graph(nodes: int) -> Graph:
+    """
+    Builds the complete graph on the given number of vertices.
+    """
+    graph = empty_graph(nodes)
+    for vertex1 in range(nodes):
+        for vertex2 in range(vertex1 + 1, nodes):
+            graph.add_edge(vertex1, vertex2)
+    return graph
+
+def bipartite_graph(left: int, right: int, probability: float, seed: int) -> Graph:
+    """
+    Builds a random bipartite graph with every left-right edge present with the given probability.
+
+    Args:
+        left (int): Number of left vertices, numbered 0..left - 1.
+        right (int): Number of right vertices, numbered after the left ones.
+        probability (float): Probability of every edge.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        Graph: The generated graph.
+    """
+    rng = random.Random(seed)
+    graph = empty_graph(left + right)
+    if probability <= 0:
+        return graph
+    log_q = math.log(1 - probability) if probability < 1 else None
+    position = -1
+    while True:
+        position += 1 if log_q is None else 1 + int(math.log(1 - rng.random()) / log_q)
+        if position >= left * right:
+            return graph
+        graph.add_edge(position // right, left + position % right)
+
+def empty_graph(nodes: int) -> Graph:
+    graph = Graph()
+    graph.nodes = list(range(nodes))
+    return graph
+
+
+# Families used by the suite. Each builds a graph of about size vertices and average degree 3, except
+# the complete graph, which gets about 3 * size edges.
+GENERATORS: Dict[str, Callable[[int, int], Graph]] = {
+    "gnp": lambda size, seed: gnp_graph(size, 3 / max(size - 1, 1), seed),
+    "regular": lambda size, seed: random_regular_graph(size + size % 2, 3, seed),
+    "grid": lambda size, seed: grid_graph(max(1, math.isqrt(size)), max(1, math.isqrt(size))),
+    "odd_cycles": lambda size, seed: nested_odd_cycles(max(1, round(math.log(size, 3))), 3, seed),
+    "complete": lambda size, seed: complete_graph(max(2, math.isqrt(6 * size))),
+    "bipartite": lambda size, seed: bipartite_graph(size // 2, size - size // 2, 6 / max(size, 1), seed),
+}
@@ -0,0 +1,213 @@
+"""
+Runs every matching engine headlessly on the seeded graph families of generators.py across sizes,
+records wall time, peak memory, augmentations and blossoms contracted to JSON, and compares two runs.
+
+Usage:
+    python benchmarks/suite.py run [--sizes 100 1000 ...] [--engines ...] [--generators ...] [--out run.json]
+    python benchmarks/suite.py compare old.json new.json [--threshold 0.1]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from blossomAlgo import compute_maximum_matching
+from generators import GENERATORS
+from graphHelpers import Graph, Matching, two_coloring
+from listeners import NullListener
+
+FORMAT_VERSION = 1
+ENGINES = {
+    "edmonds": {"backend": "edmonds"},
+    "edmonds_multi_path": {"backend": "edmonds", "multi_path": True},
+    "micali_vazirani": {"backend": "micali_vazirani"},
+    "hopcroft_karp": {"backend": "hopcroft_karp"},
+    "contraction": {"backend": "contraction"},
+}
+# The contraction engine copies the graph for every blossom, so it only runs up to this size by default.
+CONTRACTION_MAX_SIZE = 1000
+
+
+def measure(graph: Graph, options: Dict[str, object], repeat: int) -> Dict[str, object]:
+    """
+    Solves a graph repeat times for timing and once more under tracemalloc for the peak memory.
+
+    Args:
+        graph (Graph): The graph to solve.
+        options (Dict[str, object]): Keyword arguments for compute_maximum_matching.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        Dict[str, object]: The measurements of one case.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matching = compute_maximum_matching(graph, Matching(), NullListener(), **options)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    compute_maximum_matching(graph, Matching(), NullListener(), **options)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "matching": len(matching.edges),
+        "seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "peak_bytes": peak,
+        "phases": matching.phases,
+        "augmentations": matching.augmentations,
+        "blossoms": matching.blossoms,
+    }
+
+def run_suite(sizes: List[int], engines: List[str], generators: List[str], seed: int = 0, repeat: int = 3,
+              contraction_max_size: int = CONTRACTION_MAX_SIZE) -> Dict[str, object]:
+    """
+    Measures every engine on every generator and size. Hopcroft-Karp only runs on bipartite graphs,
+    and a case whose engine raises is recorded with the error instead of measurements.
+
+    Args:
+        sizes (List[int]): Graph sizes passed to the generators.
+        engines (List[str]): Names from ENGINES.
+        generators (List[str]): Names from GENERATORS.
+        seed (int, optional): Seed for the generators.
+        repeat (int, optional): Number of timed runs per case; the fastest is reported.
+        contraction_max_size (int, optional): Largest size the contraction engine runs on.
+
+    Returns:
+        Dict[str, object]: The run, ready to be written as JSON.
+    """
+    results = []
+    for generator in generators:
+        for size in sizes:
+            graph = GENERATORS[generator](size, seed)
+            bipartite = two_coloring(graph.adjacency) is not None
+            for engine in engines:
+                if (engine == "hopcroft_karp" and not bipartite) or (engine == "contraction" and size > contraction_max_size):
+                    continue
+                result = {"generator": generator, "size": size, "engine": engine, "nodes": len(graph.nodes), "edges": len(graph.edges)}
+                try:
+                    result.update(measure(graph, ENGINES[engine], repeat))
+                except Exception as error:
+                    result["error"] = f"{type(error).__name__}: {error}"
+                    print(f"{generator:<12}{size:>8}{engine:>20}  failed: {error}", flush=True)
+                    results.append(result)
+                    continue
+                results.append(result)
+                print(f"{generator:<12}{size:>8}{engine:>20}{result['seconds']:>10.3f} s{result['peak_bytes'] / 2 ** 20:>9.1f} MiB"
+                      f"{result['augmentations']:>8} aug{result['blossoms']:>8} blossoms", flush=True)
+    return {
+        "version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def scaling_exponents(run: Dict[str, object]) -> Dict[str, float]:
+    """
+    Fits time ~ size ** k by least squares on log-log scale for every generator and engine.
+
+    Returns:
+        Dict[str, float]: The exponent k keyed by "generator/engine", for curves with two sizes or more.
+    """
+    curves = {}
+    for result in run["results"]:
+        if result.get("seconds", 0) > 0:
+            curves.setdefault(f"{result['generator']}/{result['engine']}", []).append(
+                (math.log(result["edges"] + result["nodes"]), math.log(result["seconds"])))
+    exponents = {}
+    for name, points in curves.items():
+        if len(points) > 1:
+            mean_x = statistics.mean(x for x, _ in points)
+            mean_y = statistics.mean(y for _, y in points)
+            spread = sum((x - mean_x) ** 2 for x, _ in points)
+            if spread:
+                exponents[name] = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+    return exponents
+
+def compare_runs(old: Dict[str, object], new: Dict[str, object], threshold: float = 0.1) -> List[str]:
+    """
+    Prints the time and memory ratios of the cases two runs have in common.
+
+    Args:
+        old (Dict[str, object]): The baseline run.
+        new (Dict[str, object]): The run to check.
+        threshold (float, optional): Relative slowdown or memory growth reported as a regression.
+
+    Returns:
+        List[str]: A line for every regression, including matchings of a different size.
+    """
+    baseline = {(result["generator"], result["size"], result["engine"]): result for result in old["results"]}
+    regressions = []
+    print(f"{'case':<42}{'old s':>10}{'new s':>10}{'time':>8}{'memory':>8}")
+    for result in new["results"]:
+        key = (result["generator"], result["size"], result["engine"])
+        if key not in baseline:
+            continue
+        before = baseline[key]
+        case = "/".join(map(str, key))
+        if "error" in result or "error" in before:
+            if "error" in result and "error" not in before:
+                regressions.append(f"{case}: {result['error']}")
+            print(f"{case:<42}{'failed' if 'error' in before else '':>10}{'failed' if 'error' in result else '':>10}")
+            continue
+        time_ratio = result["seconds"] / before["seconds"] if before["seconds"] else 1.0
+        memory_ratio = result["peak_bytes"] / before["peak_bytes"] if before["peak_bytes"] else 1.0
+        flags = []
+        if time_ratio > 1 + threshold:
+            flags.append("slower")
+        if memory_ratio > 1 + threshold:
+            flags.append("more memory")
+        if result["matching"] != before["matching"]:
+            flags.append(f"matching size {before['matching']} -> {result['matching']}")
+        print(f"{case:<42}{before['seconds']:>10.3f}{result['seconds']:>10.3f}{time_ratio:>8.2f}{memory_ratio:>8.2f}  {', '.join(flags)}")
+        if flags:
+            regressions.append(f"{case}: {', '.join(flags)}")
+    return regressions
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="measure the engines and write a JSON run")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 3000])
+    run_parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    run_parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--contraction-max-size", type=int, default=CONTRACTION_MAX_SIZE)
+    run_parser.add_argument("--out", default="benchmark.json")
+    compare_parser = commands.add_parser("compare", help="compare two JSON runs")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    options = parser.parse_args(arguments)
+
+    if options.command == "run":
+        run = run_suite(options.sizes, options.engines, options.generators, options.seed, options.repeat, options.contraction_max_size)
+        with open(options.out, "w") as file:
+            json.dump(run, file, indent=1)
+        for name, exponent in sorted(scaling_exponents(run).items()):
+            print(f"{name:<36} time ~ (V + E) ^ {exponent:.2f}")
+        print(f"wrote {len(run['results'])} results to {options.out}")
+        return 0
+    with open(options.old) as file:
+        old = json.load(file)
+    with open(options.new) as file:
+        new = json.load(file)
+    regressions = compare_runs(old, new, options.threshold)
+    print(f"{len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
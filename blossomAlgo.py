@@ -1,52 +1,675 @@
-import copy
-from graphHelpers import Graph, Matching, add_edge_to_matching, remove_edge_from_matching, shortest_path, shortest_distance, contract_nodes, aux_add_edge_to_matching, Forest, Tree
-from typing import List
-from graph_visualizer import GraphVisualizer
+from collections import deque
+from graphHelpers import EVEN, ODD, Graph, Matching, CSRGraph, add_edge_to_matching, remove_edge_from_matching, ContractedGraph, aux_add_edge_to_matching, two_coloring, Forest, Tree
+from typing import List, Dict, Iterable, Optional, Callable, Tuple
+from listeners import MatchingListener, active_listener
+from micali_vazirani import micali_vazirani_phase
+from hopcroft_karp import hopcroft_karp_phase
+from initial_matching import INITIALIZERS
+from weighted_matching import maximum_weight_matching
+from components import solve_components
+from batch_matching import MatchingBatch, CHUNK_SIZE
 
+BACKENDS = ("auto", "edmonds", "hopcroft_karp", "micali_vazirani", "contraction")
+CSR_BACKENDS = ("auto", "edmonds", "hopcroft_karp", "micali_vazirani")
 
-def compute_maximum_matching(graph: Graph, matching: Matching, visualizer: GraphVisualizer) -> List[int]:
+
+def __getattr__(name: str):
+    # GraphVisualizer is re-exported for convenience but imported on first access, so that
+    # importing the algorithms never loads tkinter or needs a display.
+    if name == "GraphVisualizer":
+        from graph_visualizer import GraphVisualizer
+        return GraphVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def compute_maximum_matching(graph: Graph, matching: Matching, listener: Optional[MatchingListener] = None, backend: str = "auto", multi_path: bool = False,
+                             initializer: Optional[str] = None, workers: Optional[int] = None) -> List[int]:
     """
-    Computes the maximum matching for a given graph with visualization.
+    Computes the maximum matching for a given graph, reporting its progress to an optional listener.
 
     Args:
         graph (Graph): An instance of the Graph class defined in graph_helpers.py.
         matching (Matching): An instance of the Matching class defined in graph_helpers.py.
-        visualizer (GraphVisualizer): An instance of the GraphVisualizer class for visualization.
+        listener (MatchingListener, optional): Receives the events of the computation, see listeners.py.
+            A GraphVisualizer animates them. Defaults to none.
+        backend (str, optional): The search engine to use. "auto" (default) runs "hopcroft_karp" when
+            a two-colouring pass shows the graph is bipartite and "edmonds" otherwise. "edmonds" finds
+            one augmenting path per search with find_augmenting_path_edmonds, "hopcroft_karp" and
+            "micali_vazirani" augment along a maximal set of shortest vertex-disjoint paths per phase
+            in O(E * sqrt(V)) overall, and "contraction" uses the original find_augmenting_path.
+            The engine that ran is stored in matching.engine.
+        multi_path (bool, optional): With the "edmonds" engine, augment along every vertex-disjoint
+            augmenting path closed during one forest growth before growing a new forest, instead
+            of stopping at the first one. The number of searches that augmented is stored in
+            matching.phases for every engine, the number of augmenting paths applied in
+            matching.augmentations and the number of blossoms contracted in matching.blossoms.
+        initializer (str, optional): A linear-time heuristic that extends the matching before the
+            exact search starts, one of "greedy", "min_degree" and "karp_sipser". Defaults to none.
+        workers (int, optional): Split the graph into connected components and solve them on a
+            pool of this many processes with compute_maximum_matching_by_components. Defaults to
+            solving the whole graph in this process.
 
     Returns:
         List[int]: A list of edges that form the maximum matching in the given graph.
     """
-    aug_path = find_augmenting_path(graph, matching, visualizer)
-    if not aug_path:
-        return matching
-    for index in range(len(aug_path) - 1):
-        if index % 2 == 0:
-            add_edge_to_matching(matching, aug_path[index], aug_path[index + 1])
-            visualizer.update_edge(aug_path[index], aug_path[index + 1], "red")
+    check_choice("backend", backend, BACKENDS)
+    listener = active_listener(listener)
+    if workers is not None:
+        return compute_maximum_matching_by_components(graph, matching, listener, backend, initializer, workers, multi_path)
+    if initializer is not None:
+        check_choice("initializer", initializer, INITIALIZERS)
+        for vertex1, vertex2 in INITIALIZERS[initializer](build_adjacency(graph), build_mate(matching)):
+            augment_matching(matching, [vertex1, vertex2], listener)
+    stats = {"blossoms": 0}
+    if backend in ("auto", "hopcroft_karp"):
+        adjacency = build_adjacency(graph)
+        coloring = two_coloring(adjacency)
+        if coloring is None and backend == "hopcroft_karp":
+            raise ValueError("The hopcroft_karp backend needs a bipartite graph")
+        if coloring is not None:
+            left = [vertex for vertex, color in coloring.items() if color == 0]
+            return compute_maximum_matching_by_phases(graph, matching, listener, "hopcroft_karp",
+                                                      lambda adjacency, mate: hopcroft_karp_phase(adjacency, mate, left))
+        backend = "edmonds"
+    if backend == "micali_vazirani":
+        return compute_maximum_matching_by_phases(graph, matching, listener, backend,
+                                                  lambda adjacency, mate: micali_vazirani_phase(adjacency, mate, stats, listener), stats)
+    if backend == "edmonds" and multi_path:
+        return compute_maximum_matching_by_phases(graph, matching, listener, backend,
+                                                  lambda adjacency, mate: edmonds_phase(adjacency, mate, stats, listener), stats)
+    matching.engine = backend
+    matching.phases = 0
+    matching.augmentations = 0
+    while True:
+        if listener is not None:
+            listener.phase_started(backend)
+        if backend == "contraction":
+            aug_path = find_augmenting_path(graph, matching, listener, stats=stats)
         else:
-            remove_edge_from_matching(matching, aug_path[index], aug_path[index + 1])
-            visualizer.update_edge(aug_path[index], aug_path[index + 1], "black")
-        visualizer.wait_for_click()
-    return compute_maximum_matching(graph, matching, visualizer)
+            aug_path = find_augmenting_path_edmonds(graph, matching, stats, listener)
+        matching.blossoms = stats["blossoms"]
+        if listener is not None:
+            listener.phase_finished(backend, 1 if aug_path else 0)
+        if not aug_path:
+            return matching
+        matching.phases += 1
+        matching.augmentations += 1
+        if matching.augmentations > len(graph.adjacency) // 2:
+            raise RuntimeError(f"The {backend} engine keeps returning paths that do not augment the matching")
+        augment_matching(matching, aug_path, listener)
+
+def compute_maximum_matching_by_phases(graph: Graph, matching: Matching, listener: Optional[MatchingListener], engine: str,
+                                       phase: Callable[[Dict[int, List[int]], Dict[int, int]], List[List[int]]],
+                                       stats: Optional[Dict[str, int]] = None) -> Matching:
+    """
+    Computes the maximum matching by repeating search phases until one finds no augmenting path.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py.
+        matching (Matching): An instance of the Matching class defined in graph_helpers.py.
+        listener (MatchingListener, optional): Receives the phase and augmentation events, or None.
+        engine (str): The name recorded in matching.engine.
+        phase (Callable): Returns vertex-disjoint augmenting paths for an adjacency dict and a mate dict.
+        stats (Dict[str, int], optional): The counters the phase function updates. Its "blossoms"
+            count is copied to matching.blossoms.
+
+    Returns:
+        Matching: The maximum matching.
+    """
+    matching.engine = engine
+    matching.phases = 0
+    matching.augmentations = 0
+    adjacency = build_adjacency(graph)
+    mate = build_mate(matching)
+    while True:
+        if listener is not None:
+            listener.phase_started(engine)
+        paths = phase(adjacency, mate)
+        if listener is not None:
+            listener.phase_finished(engine, len(paths))
+        if not paths:
+            break
+        matching.phases += 1
+        matching.augmentations += len(paths)
+        for aug_path in paths:
+            for index in range(0, len(aug_path) - 1, 2):
+                mate[aug_path[index]] = aug_path[index + 1]
+                mate[aug_path[index + 1]] = aug_path[index]
+            augment_matching(matching, aug_path, listener)
+    matching.blossoms = stats["blossoms"] if stats is not None else 0
+    return matching
+
+def compute_maximum_matching_by_components(graph: Graph, matching: Matching, listener: Optional[MatchingListener] = None, backend: str = "auto",
+                                            initializer: Optional[str] = None, workers: Optional[int] = None, multi_path: bool = False) -> Matching:
+    """
+    Computes the maximum matching by solving the connected components of the graph independently.
+
+    No augmenting path crosses two components, so they are solved with compute_maximum_matching_csr
+    on a process pool (see components.py), small ones batched together, and the results merged
+    into the matching.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py.
+        matching (Matching): An instance of the Matching class defined in graph_helpers.py.
+        listener (MatchingListener, optional): Receives the events of the computation, see listeners.py.
+            A GraphVisualizer animates them. Defaults to none.
+        backend (str, optional): "auto" (default), "edmonds", "hopcroft_karp" or "micali_vazirani".
+            With "auto" every task picks its own engine; the distinct engines that ran are stored
+            in matching.engine, joined by "+".
+        initializer (str, optional): A heuristic from initial_matching.py, run inside every task.
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        multi_path (bool, optional): As for compute_maximum_matching. The phases, augmentations
+            and blossoms of all tasks are summed into the matching's counters.
+
+    Returns:
+        Matching: The maximum matching.
+    """
+    check_choice("backend", backend, CSR_BACKENDS)
+    if initializer is not None:
+        check_choice("initializer", initializer, INITIALIZERS)
+    edges, engines, counters = solve_components(graph.adjacency, matching.mate, backend, initializer, workers, multi_path=multi_path)
+    for vertex1, vertex2 in edges:
+        if matching.mate.get(vertex1) == vertex2:
+            continue
+        for vertex in (vertex1, vertex2):
+            partner = matching.mate.get(vertex)
+            if partner is not None:
+                remove_edge_from_matching(matching, vertex, partner)
+                if listener is not None:
+                    listener.edge_unmatched(vertex, partner)
+        add_edge_to_matching(matching, vertex1, vertex2)
+        if listener is not None:
+            listener.edge_matched(vertex1, vertex2)
+    matching.engine = "+".join(sorted(set(engines))) or backend
+    matching.phases, matching.augmentations, matching.blossoms = counters
+    return matching
+
+def compute_maximum_matching_csr(graph: CSRGraph, backend: str = "auto", initializer: Optional[str] = None,
+                                 listener: Optional[MatchingListener] = None, multi_path: bool = True) -> CSRGraph:
+    """
+    Computes the maximum matching of a CSR graph in place, without visualization.
+
+    The engines read neighbours straight from the offset and neighbour arrays and augment the
+    int32 graph.mate array, so no per-edge Python objects are created for the input.
+
+    Args:
+        graph (CSRGraph): An instance of the CSRGraph class defined in graph_helpers.py.
+        backend (str, optional): "auto" (default), "edmonds", "hopcroft_karp" or "micali_vazirani",
+            as for compute_maximum_matching.
+        initializer (str, optional): A heuristic from initial_matching.py to run first.
+        listener (MatchingListener, optional): Receives the phase and search events. Augmentations
+            of the mate array are not reported.
+        multi_path (bool, optional): With the "edmonds" engine, augment along every vertex-disjoint
+            path of a forest (default) or only the first one, as for compute_maximum_matching.
+
+    Returns:
+        CSRGraph: The graph, with graph.mate, graph.engine, graph.phases, graph.augmentations and
+        graph.blossoms filled in.
+    """
+    check_choice("backend", backend, CSR_BACKENDS)
+    listener = active_listener(listener)
+    if initializer is not None:
+        check_choice("initializer", initializer, INITIALIZERS)
+        INITIALIZERS[initializer](graph, graph.mate)
+    stats = {"blossoms": 0}
+    phase = micali_vazirani_phase if backend == "micali_vazirani" else edmonds_phase
+    if backend in ("auto", "hopcroft_karp"):
+        coloring = two_coloring(graph)
+        if coloring is None and backend == "hopcroft_karp":
+            raise ValueError("The hopcroft_karp backend needs a bipartite graph")
+        if coloring is not None:
+            left = [vertex for vertex, color in coloring.items() if color == 0]
+            backend, phase = "hopcroft_karp", lambda adjacency, mate, stats, listener: hopcroft_karp_phase(adjacency, mate, left)
+        else:
+            backend = "edmonds"
+    if backend == "edmonds" and not multi_path:
+        phase = lambda adjacency, mate, stats, listener: [path for path in [edmonds_search(adjacency, mate, stats=stats, listener=listener)] if path]
+    graph.engine = backend
+    graph.phases = 0
+    graph.augmentations = 0
+    while True:
+        if listener is not None:
+            listener.phase_started(backend)
+        paths = phase(graph, graph.mate, stats, listener)
+        if listener is not None:
+            listener.phase_finished(backend, len(paths))
+        if not paths:
+            break
+        graph.phases += 1
+        graph.augmentations += len(paths)
+        for aug_path in paths:
+            for index in range(0, len(aug_path) - 1, 2):
+                graph.mate[aug_path[index]] = aug_path[index + 1]
+                graph.mate[aug_path[index + 1]] = aug_path[index]
+    graph.blossoms = stats["blossoms"]
+    return graph
+
+def compute_maximum_matching_batch(graphs: Iterable[Graph], workers: Optional[int] = None, backend: str = "auto",
+                                   initializer: Optional[str] = None, chunk_size: int = CHUNK_SIZE, ordered: bool = True) -> MatchingBatch:
+    """
+    Computes the maximum matchings of many small independent graphs on a process pool, without visualization.
+
+    Args:
+        graphs (Iterable[Graph]): The instances to solve. They are read lazily.
+        workers (int, optional): Number of worker processes; 1 solves everything in this process.
+            Defaults to os.cpu_count().
+        backend (str, optional): "auto" (default), "edmonds", "hopcroft_karp" or "micali_vazirani".
+        initializer (str, optional): A heuristic from initial_matching.py to run first.
+        chunk_size (int, optional): Number of instances sent to a worker at once.
+        ordered (bool, optional): Yield the results in input order (default) or as chunks complete.
+
+    Returns:
+        MatchingBatch: An iterable of (input position, Matching) pairs defined in batch_matching.py.
+        Its instances, elapsed and throughput attributes report progress while it is consumed.
+    """
+    check_choice("backend", backend, CSR_BACKENDS)
+    if initializer is not None:
+        check_choice("initializer", initializer, INITIALIZERS)
+    return MatchingBatch(graphs, workers, backend, initializer, chunk_size, ordered)
+
+def compute_maximum_weight_matching(graph: Graph, matching: Matching, listener: Optional[MatchingListener] = None, maxcardinality: bool = False,
+                                    min_cost_perfect: bool = False) -> Matching:
+    """
+    Computes the maximum-weight matching for a given graph, reporting the edges it changes to an optional listener.
+
+    The weighted engine in weighted_matching.py cannot start from a partial matching, so the
+    edges already in the matching are dropped and replaced by the ones it returns.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py, with edge weights.
+        matching (Matching): An instance of the Matching class defined in graph_helpers.py.
+        listener (MatchingListener, optional): Receives the events of the computation, see listeners.py.
+            A GraphVisualizer animates them. Defaults to none.
+        maxcardinality (bool, optional): Return the heaviest matching among those of maximum cardinality.
+        min_cost_perfect (bool, optional): Return the cheapest perfect matching instead.
+
+    Returns:
+        Matching: The matching, with matching.engine and matching.weight filled in.
+    """
+    listener = active_listener(listener)
+    result = maximum_weight_matching(graph, maxcardinality, min_cost_perfect)
+    for vertex1, vertex2 in list(matching.edges):
+        remove_edge_from_matching(matching, vertex1, vertex2)
+        if listener is not None:
+            listener.edge_unmatched(vertex1, vertex2)
+    for vertex1, vertex2 in result.edges:
+        add_edge_to_matching(matching, vertex1, vertex2)
+        if listener is not None:
+            listener.edge_matched(vertex1, vertex2)
+    matching.engine = result.engine
+    matching.weight = result.weight
+    return matching
+
+def check_choice(option: str, value: str, choices: Iterable[str]):
+    """
+    Raises a ValueError if an option is not one of its allowed values.
+
+    Args:
+        option (str): The name of the option, used in the message.
+        value (str): The value that was passed.
+        choices (Iterable[str]): The allowed values.
+    """
+    if value not in choices:
+        raise ValueError("Unknown {} {!r}, expected one of {}".format(option, value, ", ".join(choices)))
+
+def build_adjacency(graph: Graph) -> Dict[int, List[int]]:
+    """
+    Builds the neighbour lists of every vertex of the graph.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py.
+
+    Returns:
+        Dict[int, List[int]]: The adjacency list representation of the graph.
+    """
+    return {node: list(neighbors) for node, neighbors in graph.adjacency.items()}
+
+def build_mate(matching: Matching) -> Dict[int, int]:
+    """
+    Maps every matched vertex to its partner.
+
+    Args:
+        matching (Matching): An instance of the Matching class defined in graph_helpers.py.
+
+    Returns:
+        Dict[int, int]: The partner of each matched vertex.
+    """
+    return dict(matching.mate)
+
+def augment_matching(matching: Matching, aug_path: List[int], listener: Optional[MatchingListener] = None) -> Matching:
+    """
+    Flips the edges of an augmenting path in the matching.
+
+    Matched edges of the path are removed before the unmatched ones are added, so that
+    add_edge_to_matching never sees an endpoint that is still covered.
+
+    Args:
+        matching (Matching): The matching to augment in place.
+        aug_path (List[int]): An augmenting path, starting and ending at free vertices.
+        listener (MatchingListener, optional): Receives the augmentation and edge events, in path order.
+
+    Returns:
+        Matching: The augmented matching.
+    """
+    for index in range(1, len(aug_path) - 1, 2):
+        remove_edge_from_matching(matching, aug_path[index], aug_path[index + 1])
+    for index in range(0, len(aug_path) - 1, 2):
+        add_edge_to_matching(matching, aug_path[index], aug_path[index + 1])
+    if listener is not None:
+        listener.augmentation_started(aug_path)
+        for index in range(len(aug_path) - 1):
+            if index % 2 == 0:
+                listener.edge_matched(aug_path[index], aug_path[index + 1])
+            else:
+                listener.edge_unmatched(aug_path[index], aug_path[index + 1])
+        listener.augmentation_finished(aug_path)
+    return matching
+
+def find_augmenting_path_edmonds(graph: Graph, matching: Matching, stats: Optional[Dict[str, int]] = None,
+                                 listener: Optional[MatchingListener] = None) -> List[int]:
+    """
+    Finds an augmenting path with Edmonds' search, keeping blossoms in place.
+
+    Unlike find_augmenting_path, no contracted copy of the graph is ever built. Every vertex
+    carries a union-find label whose representative stores the base of the outermost blossom
+    containing it, so contracting a blossom is a handful of unions and the path is lifted back
+    through parent pointers. A single search costs O(E * alpha(V)), giving O(V * E) overall.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py.
+        matching (Matching): An instance of the Matching class defined in graph_helpers.py.
+        stats (Dict[str, int], optional): Its "blossoms" count is increased by the number of blossoms contracted.
+        listener (MatchingListener, optional): Receives the vertex, edge and blossom events of the search.
+
+    Returns:
+        List[int]: A list of nodes that form an augmenting path if one exists. Returns an empty list if no augmenting path is found.
+    """
+    return edmonds_search(build_adjacency(graph), build_mate(matching), stats=stats, listener=listener)
+
+def edmonds_search(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], roots: Optional[Iterable[int]] = None,
+                   stats: Optional[Dict[str, int]] = None, listener: Optional[MatchingListener] = None) -> List[int]:
+    """
+    Grows one alternating forest and returns the first augmenting path it closes.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, mapping each matched vertex to its partner.
+        roots (Iterable[int], optional): Free vertices to grow trees from. Defaults to every free vertex.
+        stats (Dict[str, int], optional): Its "blossoms" count is increased by the number of blossoms contracted.
+        listener (MatchingListener, optional): Receives the vertex, edge and blossom events of the search.
+
+    Returns:
+        List[int]: An augmenting path from one free vertex to another, or an empty list.
+    """
+    paths = grow_alternating_forest(adjacency, mate, roots, max_paths=1, stats=stats, listener=listener)
+    return paths[0] if paths else []
+
+def edmonds_phase(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], stats: Optional[Dict[str, int]] = None,
+                  listener: Optional[MatchingListener] = None) -> List[List[int]]:
+    """
+    Grows one alternating forest and returns every augmenting path it closes.
+
+    Once a path is found, the trees at both of its ends are frozen and the forest keeps growing
+    from the others, so the paths are vertex-disjoint and can all be applied to the matching.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, mapping each matched vertex to its partner.
+            It is not modified; the caller augments along the returned paths.
+        stats (Dict[str, int], optional): Its "blossoms" count is increased by the number of blossoms contracted.
+        listener (MatchingListener, optional): Receives the vertex, edge and blossom events of the search.
 
-def find_augmenting_path(graph: Graph, matching: List[int], visualizer: GraphVisualizer, blossoms: List[List[int]] = []) -> List[int]:
+    Returns:
+        List[List[int]]: Vertex-disjoint augmenting paths. An empty list means the matching is already maximum.
+    """
+    return grow_alternating_forest(adjacency, mate, stats=stats, listener=listener)
+
+def grow_alternating_forest(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], roots: Optional[Iterable[int]] = None,
+                            max_paths: Optional[int] = None, stats: Optional[Dict[str, int]] = None,
+                            listener: Optional[MatchingListener] = None) -> List[List[int]]:
+    """
+    Grows an alternating forest with blossoms tracked in place by union-find base labels.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, mapping each matched vertex to its partner.
+        roots (Iterable[int], optional): Free vertices to grow trees from. Defaults to every free vertex.
+        max_paths (int, optional): Stop after this many paths. Defaults to collecting all of them.
+        stats (Dict[str, int], optional): Its "blossoms" count is increased by the number of blossoms contracted.
+        listener (MatchingListener, optional): Receives the vertex, edge and blossom events of the search.
+
+    Returns:
+        List[List[int]]: Vertex-disjoint augmenting paths, each from one free vertex to another.
+    """
+    listener = active_listener(listener)
+    label = {}
+    root_of = {}
+    frozen = set()
+    paths = []
+    parent = {}
+    bridge = {}
+    union_parent = {}
+    union_size = {}
+    base = {}
+    queue = deque()
+
+    def find(vertex):
+        root = vertex
+        while root in union_parent:
+            root = union_parent[root]
+        while vertex != root:
+            next_vertex = union_parent[vertex]
+            union_parent[vertex] = root
+            vertex = next_vertex
+        return root
+
+    def blossom_base(vertex):
+        root = find(vertex)
+        return base.get(root, root)
+
+    def union(vertex, target):
+        root1, root2 = find(vertex), find(target)
+        if root1 == root2:
+            return
+        size1, size2 = union_size.get(root1, 1), union_size.get(root2, 1)
+        if size1 > size2:
+            root1, root2 = root2, root1
+        union_parent[root1] = root2
+        union_size[root2] = size1 + size2
+
+    def step_up(blossom):
+        # Moves from a blossom base to the base of the next even blossom towards the root.
+        if blossom not in mate:
+            return None
+        return blossom_base(parent[mate[blossom]])
+
+    def find_common_base(blossom1, blossom2):
+        seen = set()
+        while blossom1 is not None or blossom2 is not None:
+            if blossom1 is not None:
+                if blossom1 in seen:
+                    return blossom1
+                seen.add(blossom1)
+                blossom1 = step_up(blossom1)
+            blossom1, blossom2 = blossom2, blossom1
+        return None
+
+    def contract(vertex, neighbor, common_base):
+        cycle = []
+        for near, far in ((vertex, neighbor), (neighbor, vertex)):
+            blossom = blossom_base(near)
+            while blossom != common_base:
+                odd_vertex = mate[blossom]
+                union(blossom, common_base)
+                union(odd_vertex, common_base)
+                base[find(common_base)] = common_base
+                bridge[odd_vertex] = (near, far)
+                label[odd_vertex] = EVEN
+                queue.append(odd_vertex)
+                cycle += (blossom, odd_vertex)
+                blossom = blossom_base(parent[odd_vertex])
+        return cycle
+
+    def path_to_root(vertex, backwards):
+        # Expands P(vertex), the even alternating path from an even vertex down to its root,
+        # with an explicit stack so nested blossoms never recurse. A task (v, stop, backwards)
+        # emits P(v) up to and including stop, reversed when backwards is set.
+        path = []
+        stack = [(vertex, None, backwards)]
+        while stack:
+            task = stack.pop()
+            if len(task) == 1:
+                path.append(task[0])
+                continue
+            current, stop, backwards = task
+            if current == stop or current not in mate:
+                path.append(current)
+            elif current in bridge:
+                near, far = bridge[current]
+                if backwards:
+                    stack.append((near, current, False))
+                    stack.append((far, stop, True))
+                else:
+                    stack.append((far, stop, False))
+                    stack.append((near, current, True))
+            else:
+                odd_vertex = mate[current]
+                if backwards:
+                    stack.append((current,))
+                    stack.append((odd_vertex,))
+                    if odd_vertex != stop:
+                        stack.append((parent[odd_vertex], stop, True))
+                else:
+                    if odd_vertex != stop:
+                        stack.append((parent[odd_vertex], stop, False))
+                    stack.append((odd_vertex,))
+                    stack.append((current,))
+        return path
+
+    if roots is None:
+        roots = [vertex for vertex in adjacency if vertex not in mate]
+    search_listener = listener if listener is not None and listener.search_events else None
+    for root in roots:
+        label[root] = EVEN
+        root_of[root] = root
+        queue.append(root)
+        if search_listener is not None:
+            search_listener.vertex_labelled(root, EVEN)
+    edge_scanned = search_listener.edge_scanned if search_listener is not None else None
+
+    while queue:
+        vertex = queue.popleft()
+        tree = root_of[vertex]
+        for neighbor in adjacency[vertex]:
+            if tree in frozen:
+                break
+            if edge_scanned is not None:
+                edge_scanned(vertex, neighbor)
+            vertex_base, neighbor_base = blossom_base(vertex), blossom_base(neighbor)
+            if vertex_base == neighbor_base:
+                continue
+            neighbor_label = label.get(neighbor)
+            if neighbor_label is None:
+                if neighbor not in mate:
+                    paths.append(path_to_root(vertex, True) + [neighbor])
+                    label[neighbor] = EVEN
+                    root_of[neighbor] = tree
+                    frozen.add(tree)
+                    if search_listener is not None:
+                        search_listener.vertex_labelled(neighbor, EVEN)
+                else:
+                    label[neighbor] = ODD
+                    parent[neighbor] = vertex
+                    label[mate[neighbor]] = EVEN
+                    root_of[neighbor] = root_of[mate[neighbor]] = tree
+                    queue.append(mate[neighbor])
+                    if search_listener is not None:
+                        search_listener.vertex_labelled(neighbor, ODD)
+                        search_listener.vertex_labelled(mate[neighbor], EVEN)
+            elif neighbor_label == EVEN and root_of[neighbor] not in frozen:
+                common_base = find_common_base(vertex_base, neighbor_base)
+                if common_base is not None:
+                    cycle = contract(vertex, neighbor, common_base)
+                    if stats is not None:
+                        stats["blossoms"] += 1
+                    if listener is not None:
+                        listener.blossom_contracted(common_base, cycle)
+                    if search_listener is not None:
+                        for odd_vertex in cycle[1::2]:
+                            search_listener.vertex_labelled(odd_vertex, EVEN)
+                    continue
+                paths.append(path_to_root(vertex, True) + path_to_root(neighbor, False))
+                frozen.add(tree)
+                frozen.add(root_of[neighbor])
+            if len(paths) == max_paths:
+                return paths
+    return paths
+
+def find_augmenting_path(graph: Graph, matching: List[int], listener: Optional[MatchingListener] = None, blossoms: Optional[List[int]] = None,
+                         stats: Optional[Dict[str, int]] = None) -> List[int]:
     """
     Finds an augmenting path in the graph given a current matching.
 
+    Every blossom met during the search is contracted into a copy of the graph and the search is
+    repeated on that copy. The contracted levels are kept on an explicit stack and expanded again
+    once a path is found, so nested blossoms never deepen the Python call stack.
+
     Args:
         graph (Graph): An instance of the Graph class defined in graph_helpers.py.
         matching (Matching): An instance of the Matching class defined in graph_helpers.py.
-        visualizer (GraphVisualizer): An instance of the GraphVisualizer class for visualization.
-        blossoms (List[List[int]], optional): A list of blossoms detected in previous calls to this function.
+        listener (MatchingListener, optional): Receives the vertex, edge and blossom events of the search.
+        blossoms (List[int], optional): Receives the contracted blossom vertices while the search is nested.
+        stats (Dict[str, int], optional): Its "blossoms" count is increased by the number of blossoms contracted.
 
     Returns:
         List[int]: A list of nodes that form an augmenting path if one exists. Returns an empty list if no augmenting path is found.
     """
+    listener = active_listener(listener)
+    if blossoms is None:
+        blossoms = []
+    contracted = []
+    while True:
+        aug_path, blossom = search_alternating_forest(graph, matching, listener)
+        if blossom is None:
+            break
+        blossom_cycle, neighbor = blossom
+        contracted.append((graph, matching, blossom_cycle, neighbor))
+        blossoms.append(neighbor)
+        graph, matching = contract_blossom(graph, matching, blossom_cycle, neighbor)
+        if listener is not None:
+            listener.blossom_contracted(neighbor, [vertex for vertex in blossom_cycle[:-1] if vertex != neighbor])
+    if stats is not None:
+        stats["blossoms"] += len(contracted)
+    while contracted:
+        graph, matching, blossom_cycle, neighbor = contracted.pop()
+        blossoms.pop()
+        if listener is not None:
+            listener.blossom_expanded(neighbor, [vertex for vertex in blossom_cycle[:-1] if vertex != neighbor])
+        if neighbor in aug_path:
+            aug_path = expand_blossom(graph, matching, aug_path, blossom_cycle, neighbor)
+    return aug_path
+
+def search_alternating_forest(graph: Graph, matching: Matching, listener: Optional[MatchingListener] = None) -> Tuple[List[int], Optional[Tuple[List[int], int]]]:
+    """
+    Grows an alternating forest until it finds an augmenting path or a blossom.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py.
+        matching (Matching): An instance of the Matching class defined in graph_helpers.py.
+        listener (MatchingListener, optional): Receives the vertex and edge events of the search.
+
+    Returns:
+        Tuple[List[int], Optional[Tuple[List[int], int]]]: The augmenting path (empty if none was found)
+        and, if the search stopped at a blossom instead, its closed cycle and the vertex it contracts into.
+    """
+    if listener is not None and not listener.search_events:
+        listener = None
+
     def initialize_forest_and_unmatched_nodes():
         forest = Forest()
         unmatched_nodes = []
         for node in graph.nodes:
-            if all(node not in edge for edge in matching.edges):
+            if node not in matching.nodes:
                 forest.add_tree(Tree(node))
                 unmatched_nodes.append(node)
         return forest, unmatched_nodes
@@ -63,73 +686,95 @@ def find_augmenting_path(graph: Graph, matching: List[int], visualizer: GraphVis
         vertex_edges = graph.get_edges(vertex)
         for edge in vertex_edges:
             neighbor = edge[1] if vertex == edge[0] else edge[0]
+            if listener is not None:
+                listener.edge_scanned(vertex, neighbor)
             if edge in unmarked_edges or edge[::-1] in unmarked_edges:
                 neighbor_in_forest = forest.is_in_forest(neighbor)
                 if not neighbor_in_forest:
                     handle_new_neighbor(vertex_tree_index, edge, neighbor)
                 else:
                     neighbor_tree_index = forest.get_tree_by_node(neighbor)
-                    if (
-                        shortest_distance(
-                            forest.tree_graph(neighbor_tree_index),
-                            neighbor,
-                            forest.get_root(neighbor),
-                        )
-                        % 2 == 0
-                    ):
+                    if forest.get_parity(neighbor) == EVEN:
                         if neighbor_tree_index != vertex_tree_index:
-                            return find_path_between_trees(vertex_tree_index, neighbor_tree_index, vertex, neighbor)
+                            return find_path_between_trees(vertex_tree_index, neighbor_tree_index, vertex, neighbor), None
                         else:
                             # if both the current vertex and its neighbor are in the same BFS tree 
                             # and the distance from the root to the neighbor is even, the distance 
                             # from the root to the current vertex must also be even
                             return handle_blossom(vertex, neighbor, vertex_tree_index)
-        return None
+        return [], None
 
     def handle_new_neighbor(vertex_tree_index, edge, neighbor):
-        forest.tree(vertex_tree_index).add_edge(edge[0], edge[1])
+        forest.add_edge(vertex_tree_index, edge[0], edge[1])
         neighbor_matching = matching.get_edges(neighbor)
-        forest.tree(vertex_tree_index).add_edge(neighbor_matching[0], neighbor_matching[1])
+        forest.add_edge(vertex_tree_index, neighbor_matching[0], neighbor_matching[1])
         neighbor_of_neighbor = neighbor_matching[0] if neighbor_matching[0] != neighbor else neighbor_matching[1]
         unmatched_nodes.append(neighbor_of_neighbor)
-        visualizer.update_node(neighbor, "yellow")
+        if listener is not None:
+            listener.vertex_labelled(neighbor, ODD)
+            listener.vertex_labelled(neighbor_of_neighbor, EVEN)
 
     def find_path_between_trees(vertex_tree_index, neighbor_tree_index, vertex, neighbor):
-        path_v = shortest_path(forest.tree_graph(vertex_tree_index), forest.get_root(vertex), vertex)
-        path_n = shortest_path(forest.tree_graph(neighbor_tree_index), neighbor, forest.get_root(neighbor))
-        return path_v + path_n
+        path_v = forest.tree(vertex_tree_index).path_to_root(vertex)
+        path_n = forest.tree(neighbor_tree_index).path_to_root(neighbor)
+        return path_v[::-1] + path_n
 
     def handle_blossom(vertex, neighbor, vertex_tree_index):
-        blossom_cycle = shortest_path(forest.tree_graph(vertex_tree_index), vertex, neighbor)
+        blossom_cycle = forest.tree(vertex_tree_index).path(vertex, neighbor)
         blossom_cycle.append(vertex)
-        temp_contracted_graph, temp_contracted_matching = contract_blossom(graph, matching, blossom_cycle, neighbor)
-        blossoms.append(neighbor)
-        aug_path = find_augmenting_path(temp_contracted_graph, temp_contracted_matching, visualizer, blossoms)
-        blossoms.pop()
-        if neighbor in aug_path:
-            return expand_blossom(aug_path, blossom_cycle, neighbor)
-        return aug_path
-
-    def contract_blossom(graph, matching, blossom_cycle, neighbor):
-        temp_contracted_graph = copy.deepcopy(graph)
-        temp_contracted_matching = copy.deepcopy(matching)
-        for index in range(len(blossom_cycle) - 1):
-            if blossom_cycle[index] != neighbor:
-                temp_contracted_graph = contract_nodes(temp_contracted_graph, blossom_cycle[index], neighbor)
-                if blossom_cycle[index] in temp_contracted_matching.nodes:
-                    remove_edge = matching.get_edges(blossom_cycle[index])
-                    remove_edge_from_matching(temp_contracted_matching, remove_edge[0], remove_edge[1])
-                    if not (remove_edge[0] in blossom_cycle and remove_edge[1] in blossom_cycle):
-                        vertex_outside_blossom = remove_edge[0] if remove_edge[0] != blossom_cycle[index] else remove_edge[1]
-                        aux_add_edge_to_matching(temp_contracted_matching, neighbor, vertex_outside_blossom)
-        return temp_contracted_graph, temp_contracted_matching
-
-    def expand_blossom(aug_path, blossom_cycle, neighbor):
-        left_path = aug_path[:aug_path.index(neighbor)]
-        right_path = aug_path[aug_path.index(neighbor) + 1:]
-        base_blossom, blossom_base_vertex = get_base_blossom(blossom_cycle, matching)
-        return combine_paths(left_path, right_path, base_blossom, blossom_base_vertex)
+        return [], (blossom_cycle, neighbor)
+
+    forest, unmatched_nodes = initialize_forest_and_unmatched_nodes()
+    unmarked_edges = get_unmarked_edges()
+
+    for vertex in unmatched_nodes:
+        vertex_tree_index = forest.get_tree_by_node(vertex)
+        aug_path, blossom = process_unmatched_node(vertex, vertex_tree_index, unmarked_edges)
+        if aug_path or blossom:
+            return aug_path, blossom
+
+    return [], None
 
+def contract_blossom(graph: Graph, matching: Matching, blossom_cycle: List[int], neighbor: int) -> Tuple[Graph, Matching]:
+    """
+    Contracts a blossom into a single vertex on copies of the graph and the matching.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py.
+        matching (Matching): An instance of the Matching class defined in graph_helpers.py.
+        blossom_cycle (List[int]): The closed odd cycle, first vertex repeated at the end.
+        neighbor (int): The cycle vertex the blossom is contracted into.
+
+    Returns:
+        Tuple[Graph, Matching]: The contracted graph and matching.
+    """
+    contracted_view = ContractedGraph(graph)
+    temp_contracted_matching = matching.copy()
+    for index in range(len(blossom_cycle) - 1):
+        if blossom_cycle[index] != neighbor:
+            contracted_view.contract(blossom_cycle[index], neighbor)
+            if blossom_cycle[index] in temp_contracted_matching.nodes:
+                remove_edge = matching.get_edges(blossom_cycle[index])
+                remove_edge_from_matching(temp_contracted_matching, remove_edge[0], remove_edge[1])
+                if not (remove_edge[0] in blossom_cycle and remove_edge[1] in blossom_cycle):
+                    vertex_outside_blossom = remove_edge[0] if remove_edge[0] != blossom_cycle[index] else remove_edge[1]
+                    aux_add_edge_to_matching(temp_contracted_matching, neighbor, vertex_outside_blossom)
+    return contracted_view.materialize(), temp_contracted_matching
+
+def expand_blossom(graph: Graph, matching: Matching, aug_path: List[int], blossom_cycle: List[int], neighbor: int) -> List[int]:
+    """
+    Lifts an augmenting path through a contracted blossom back into the uncontracted graph.
+
+    Args:
+        graph (Graph): The graph before the blossom was contracted.
+        matching (Matching): The matching before the blossom was contracted.
+        aug_path (List[int]): An augmenting path in the contracted graph passing through neighbor.
+        blossom_cycle (List[int]): The closed odd cycle, first vertex repeated at the end.
+        neighbor (int): The cycle vertex the blossom was contracted into.
+
+    Returns:
+        List[int]: The augmenting path in the uncontracted graph.
+    """
     def get_base_blossom(blossom_cycle, matching):
         base_index, blossom_base_vertex = -1, None
         extended_blossom = blossom_cycle + [blossom_cycle[1]]
@@ -184,13 +829,7 @@ def find_augmenting_path(graph: Graph, matching: List[int], visualizer: GraphVis
             count += 1
         return lifted_cycle
 
-    forest, unmatched_nodes = initialize_forest_and_unmatched_nodes()
-    unmarked_edges = get_unmarked_edges()
-
-    for vertex in unmatched_nodes:
-        vertex_tree_index = forest.get_tree_by_node(vertex)
-        aug_path = process_unmatched_node(vertex, vertex_tree_index, unmarked_edges)
-        if aug_path:
-            return aug_path
-
-    return []
+    left_path = aug_path[:aug_path.index(neighbor)]
+    right_path = aug_path[aug_path.index(neighbor) + 1:]
+    base_blossom, blossom_base_vertex = get_base_blossom(blossom_cycle, matching)
+    return combine_paths(left_path, right_path, base_blossom, blossom_base_vertex)
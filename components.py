@@ -0,0 +1,208 @@
+from array import array
+from typing import List, Dict, Iterable, Tuple, Optional
+from graphHelpers import FREE, CSRGraph
+
+BATCH_EDGES = 20000
+
+
+def connected_components(adjacency: Dict[int, Iterable[int]]) -> List[List[int]]:
+    """
+    Splits a graph into its connected components in O(V + E) with an iterative depth-first search.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+
+    Returns:
+        List[List[int]]: The vertices of every component, in the order they were first reached.
+    """
+    seen = set()
+    components = []
+    for start in adjacency:
+        if start in seen:
+            continue
+        seen.add(start)
+        component = [start]
+        stack = [start]
+        while stack:
+            for neighbor in adjacency[stack.pop()]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    component.append(neighbor)
+                    stack.append(neighbor)
+        components.append(component)
+    return components
+
+def component_batches(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], batch_edges: int = BATCH_EDGES) -> List[Tuple[array, array, array, array]]:
+    """
+    Packs the components that can still grow their matching into tasks of about batch_edges edges.
+
+    Augmenting paths never leave a component and join two free vertices, so components with
+    fewer than two free vertices are skipped. Larger components come first and each of them is a
+    task of its own once it reaches batch_edges; the small ones are appended to a shared task
+    until it does, so thousands of tiny components cost a handful of round trips to the pool.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, mapping each matched vertex to its partner.
+        batch_edges (int, optional): Number of edges at which a task is closed.
+
+    Returns:
+        List[Tuple[array, array, array, array]]: For every task, the vertex labels followed by
+        the edge sources, edge targets and initial partners as positions into the labels.
+    """
+    components = []
+    for component in connected_components(adjacency):
+        free = sum(1 for vertex in component if vertex not in mate)
+        if free >= 2:
+            edges = sum(len(adjacency[vertex]) for vertex in component) // 2
+            components.append((edges, component))
+    components.sort(key=lambda item: item[0], reverse=True)
+
+    batches = []
+    batch, batch_size = [], 0
+    for edges, component in components:
+        batch.extend(component)
+        batch_size += edges
+        if batch_size >= batch_edges:
+            batches.append(pack_batch(adjacency, mate, batch))
+            batch, batch_size = [], 0
+    if batch:
+        batches.append(pack_batch(adjacency, mate, batch))
+    return batches
+
+def pack_batch(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], vertices: List[int]) -> Tuple[array, array, array, array]:
+    """
+    Encodes whole components as flat integer arrays, which pickle to a few compact byte strings.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching.
+        vertices (List[int]): The vertices of one or more complete components.
+
+    Returns:
+        Tuple[array, array, array, array]: Labels, edge sources, edge targets and partners.
+    """
+    labels = array('q', vertices)
+    index = {vertex: position for position, vertex in enumerate(vertices)}
+    sources, targets = array('i'), array('i')
+    pack_edges(((vertex, neighbor) for vertex in vertices for neighbor in adjacency[vertex] if vertex < neighbor), index, sources, targets)
+    partners = array('i', (index[mate[vertex]] if vertex in mate else FREE for vertex in vertices))
+    return labels, sources, targets, partners
+
+def pack_edges(edges: Iterable[Tuple[int, int]], index: Dict[int, int], sources: array, targets: array):
+    """
+    Appends edges to flat endpoint arrays as vertex positions, dropping self-loops.
+
+    Args:
+        edges (Iterable[Tuple[int, int]]): The edges, each listed once.
+        index (Dict[int, int]): The position of every vertex.
+        sources (array): Receives the first endpoint of every edge.
+        targets (array): Receives the second endpoint of every edge.
+    """
+    for vertex1, vertex2 in edges:
+        if vertex1 != vertex2:
+            sources.append(index[vertex1])
+            targets.append(index[vertex2])
+
+def solve_packed(vertex_count: int, sources: array, targets: array, partners: Optional[array] = None, backend: str = "auto",
+                 initializer: Optional[str] = None, multi_path: bool = True) -> CSRGraph:
+    """
+    Builds a CSRGraph from packed edge arrays and computes its maximum matching.
+
+    Args:
+        vertex_count (int): Number of vertices.
+        sources (array): First endpoint of every edge.
+        targets (array): Second endpoint of every edge.
+        partners (array, optional): The initial partner of every vertex, or FREE. Defaults to an empty matching.
+        backend (str, optional): An engine accepted by compute_maximum_matching_csr.
+        initializer (str, optional): A heuristic from initial_matching.py to run first.
+        multi_path (bool, optional): As for compute_maximum_matching_csr.
+
+    Returns:
+        CSRGraph: The solved graph, with its mate array and counters filled in.
+    """
+    # Imported here because blossomAlgo imports this module.
+    from blossomAlgo import compute_maximum_matching_csr
+    graph = CSRGraph.from_edges(vertex_count, sources, targets)
+    if partners is not None:
+        graph.mate[:] = partners
+    return compute_maximum_matching_csr(graph, backend, initializer, multi_path=multi_path)
+
+def process_pool(workers: Optional[int]):
+    """
+    Starts a pool of worker processes.
+
+    Args:
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+
+    Returns:
+        ProcessPoolExecutor: The pool, to be used as a context manager.
+    """
+    # Imported here because the process pool machinery takes longer to import than the algorithms.
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers)
+
+def solve_batch(labels: array, sources: array, targets: array, partners: array, backend: str = "auto",
+                initializer: Optional[str] = None, multi_path: bool = True) -> Tuple[array, str, int, int, int]:
+    """
+    Computes the maximum matching of one task. This is the function run by the worker processes.
+
+    Args:
+        labels (array): Vertex labels of the task.
+        sources (array): First endpoint of every edge, as a position into labels.
+        targets (array): Second endpoint of every edge.
+        partners (array): The initial partner of every vertex, or FREE.
+        backend (str, optional): An engine accepted by compute_maximum_matching_csr.
+        initializer (str, optional): A heuristic from initial_matching.py to run first.
+        multi_path (bool, optional): As for compute_maximum_matching_csr.
+
+    Returns:
+        Tuple[array, str, int, int, int]: The matched label pairs, flattened, followed by the
+        engine that ran and its phase, augmentation and blossom counts.
+    """
+    graph = solve_packed(len(labels), sources, targets, partners, backend, initializer, multi_path)
+    pairs = array('q')
+    for vertex in graph:
+        if vertex < graph.mate[vertex]:
+            pairs.append(labels[vertex])
+            pairs.append(labels[graph.mate[vertex]])
+    return pairs, graph.engine, graph.phases, graph.augmentations, graph.blossoms
+
+def solve_components(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], backend: str = "auto", initializer: Optional[str] = None,
+                     workers: Optional[int] = None, batch_edges: int = BATCH_EDGES,
+                     multi_path: bool = True) -> Tuple[List[Tuple[int, int]], List[str], Tuple[int, int, int]]:
+    """
+    Computes a maximum matching by solving the connected components independently.
+
+    Tasks are handed to a ProcessPoolExecutor with the given number of workers. With a single
+    worker, or a single task, they are solved in this process.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching. It is not modified.
+        backend (str, optional): An engine accepted by compute_maximum_matching_csr.
+        initializer (str, optional): A heuristic from initial_matching.py to run first.
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        batch_edges (int, optional): Edge count at which small components stop being batched together.
+        multi_path (bool, optional): As for compute_maximum_matching_csr.
+
+    Returns:
+        Tuple[List[Tuple[int, int]], List[str], Tuple[int, int, int]]: The matched edges of the
+        components that were solved, the engines that ran and the total phase, augmentation and
+        blossom counts.
+    """
+    batches = component_batches(adjacency, mate, batch_edges)
+    if workers == 1 or len(batches) <= 1:
+        results = [solve_batch(*batch, backend, initializer, multi_path) for batch in batches]
+    else:
+        with process_pool(workers) as executor:
+            results = list(executor.map(solve_batch, *zip(*batches), [backend] * len(batches), [initializer] * len(batches),
+                                        [multi_path] * len(batches)))
+    edges, engines, phases, augmentations, blossoms = [], [], 0, 0, 0
+    for pairs, engine, batch_phases, batch_augmentations, batch_blossoms in results:
+        edges.extend(zip(pairs[::2], pairs[1::2]))
+        engines.append(engine)
+        phases += batch_phases
+        augmentations += batch_augmentations
+        blossoms += batch_blossoms
+    return edges, engines, (phases, augmentations, blossoms)
@@ -0,0 +1,152 @@
+from typing import List, Iterable, Optional
+from graphHelpers import Graph, Matching, add_edge_to_matching, remove_edge_from_matching
+from blossomAlgo import edmonds_search, edmonds_phase
+
+
+class DynamicMatching:
+    """
+    Keeps a maximum matching of a graph up to date while edges and vertices come and go.
+
+    Every update starts at most one Edmonds search, directly on graph.adjacency and matching.mate.
+    It is rooted at the update's own vertices when a new augmenting path has to start there, and
+    at every free vertex when a new edge joins two matched vertices. Removing an unmatched edge or
+    a free vertex never needs a search at all. A search that finds no path visits everything
+    reachable from its roots, which can be most of the graph.
+    """
+
+    def __init__(self, graph: Graph, matching: Optional[Matching] = None):
+        """
+        Args:
+            graph (Graph): The graph to track. It is updated in place by the methods below.
+            matching (Matching, optional): A matching of the graph to start from. It is extended
+                to a maximum matching right away. Defaults to an empty Matching.
+        """
+        self.graph = graph
+        self.matching = Matching() if matching is None else matching
+        self.augmentations = 0
+        paths = edmonds_phase(graph.adjacency, self.matching.mate)
+        while paths:
+            for aug_path in paths:
+                self.augment(aug_path)
+            paths = edmonds_phase(graph.adjacency, self.matching.mate)
+
+    def insert_edge(self, vertex1: int, vertex2: int) -> List[int]:
+        """
+        Adds an edge and repairs the matching.
+
+        Any new augmenting path has to use the new edge. If one endpoint is free it is an end of
+        that path, so the search is grown from it alone. If both are matched, the path runs
+        free ... partner1 - vertex1 - vertex2 - partner2 ... free and the search is grown from every
+        free vertex: rooting it at the two partners instead needs two searches and is about twice
+        as slow on sparse random graphs, because a failed search costs the same either way and a
+        single root takes longer to reach a free vertex.
+
+        Args:
+            vertex1 (int): The first vertex of the edge.
+            vertex2 (int): The second vertex of the edge.
+
+        Returns:
+            List[int]: The augmenting path that was applied, or an empty list.
+        """
+        if self.graph.has_edge(vertex1, vertex2):
+            return []
+        self.graph.add_edge(vertex1, vertex2)
+        if vertex1 == vertex2:
+            return []
+        mate = self.matching.mate
+        if vertex1 not in mate and vertex2 not in mate:
+            return self.augment([vertex1, vertex2])
+        if vertex1 not in mate:
+            return self.search([vertex1])
+        if vertex2 not in mate:
+            return self.search([vertex2])
+        return self.search()
+
+    def delete_edge(self, vertex1: int, vertex2: int) -> List[int]:
+        """
+        Removes an edge and repairs the matching.
+
+        Removing an unmatched edge keeps the matching maximum. Removing a matched edge frees both
+        endpoints, and at most one augmentation, starting at one of them, is needed.
+
+        Args:
+            vertex1 (int): The first vertex of the edge.
+            vertex2 (int): The second vertex of the edge.
+
+        Returns:
+            List[int]: The augmenting path that was applied, or an empty list.
+        """
+        self.graph.remove_edge(vertex1, vertex2)
+        if not self.matching.has_edge(vertex1, vertex2):
+            return []
+        remove_edge_from_matching(self.matching, vertex1, vertex2)
+        return self.search([vertex1, vertex2])
+
+    def insert_vertex(self, node: int, neighbors: Iterable[int] = ()) -> List[int]:
+        """
+        Adds a vertex with its edges and repairs the matching.
+
+        The new vertex is free, so any new augmenting path starts at it.
+
+        Args:
+            node (int): The vertex to add.
+            neighbors (Iterable[int], optional): Existing vertices to connect it to.
+
+        Returns:
+            List[int]: The augmenting path that was applied, or an empty list.
+        """
+        self.graph.add_node(node)
+        for neighbor in neighbors:
+            self.graph.add_edge(node, neighbor)
+        return self.search([node])
+
+    def delete_vertex(self, node: int) -> List[int]:
+        """
+        Removes a vertex with its edges and repairs the matching.
+
+        Only the former partner of a matched vertex can start a new augmenting path.
+
+        Args:
+            node (int): The vertex to remove.
+
+        Returns:
+            List[int]: The augmenting path that was applied, or an empty list.
+        """
+        partner = self.matching.mate.get(node)
+        if partner is not None:
+            remove_edge_from_matching(self.matching, node, partner)
+        self.graph.remove_node(node)
+        if partner is None or partner == node:
+            return []
+        return self.search([partner])
+
+    def search(self, roots: Optional[List[int]] = None) -> List[int]:
+        """
+        Grows one alternating forest from the given free vertices and applies the path it finds.
+
+        Args:
+            roots (List[int], optional): Free vertices to grow trees from. Defaults to every free vertex.
+
+        Returns:
+            List[int]: The augmenting path that was applied, or an empty list.
+        """
+        return self.augment(edmonds_search(self.graph.adjacency, self.matching.mate, roots))
+
+    def augment(self, aug_path: List[int]) -> List[int]:
+        """
+        Flips the edges of an augmenting path in the matching.
+
+        Args:
+            aug_path (List[int]): An augmenting path, or an empty list.
+
+        Returns:
+            List[int]: The same path.
+        """
+        if not aug_path:
+            return aug_path
+        for index in range(1, len(aug_path) - 1, 2):
+            remove_edge_from_matching(self.matching, aug_path[index], aug_path[index + 1])
+        for index in range(0, len(aug_path) - 1, 2):
+            add_edge_to_matching(self.matching, aug_path[index], aug_path[index + 1])
+        self.augmentations += 1
+        return aug_path
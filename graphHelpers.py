@@ -1,6 +1,9 @@
-import copy
+from array import array
 from collections import deque
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional, Iterable
+
+FREE = -1
+EVEN, ODD = 0, 1
 
 def bfs_util(graph: Dict[int, List[int]], source: int, destination: int) -> Tuple[Dict[int, Any], int]:
     """
@@ -70,29 +73,52 @@ def shortest_distance(graph: Dict[int, List[int]], source: int, destination: int
     _, distance = bfs_util(graph, source, destination)
     return distance
 
-def contract_nodes(graph: 'Graph', node1: int, node2: int) -> 'Graph':
+def two_coloring(graph: Dict[int, List[int]]) -> Optional[Dict[int, int]]:
     """
-    Contract two nodes into a single node in the graph.
+    Colour the graph with two colours so that no edge joins vertices of the same colour.
+    
+    Args:
+        graph (Dict[int, List[int]]): The adjacency list representation of the graph.
     
+    Returns:
+        Optional[Dict[int, int]]: The colour (0 or 1) of every node, or None if the graph is not bipartite.
+    """
+    color = {}
+    for source in graph:
+        if source in color:
+            continue
+        color[source] = 0
+        bfs_queue = deque([source])
+        while bfs_queue:
+            current = bfs_queue.popleft()
+            for neighbour in graph[current]:
+                if neighbour not in color:
+                    color[neighbour] = 1 - color[current]
+                    bfs_queue.append(neighbour)
+                elif color[neighbour] == color[current]:
+                    return None
+    return color
+
+def contract_nodes(graph: 'Graph', node1: int, node2: int) -> 'ContractedGraph':
+    """
+    Contract two nodes into a single node in the graph.
+
+    A Graph is left unchanged: the result is a new ContractedGraph view over it, so no edge is
+    copied. A ContractedGraph is contracted in place and returned, so chaining k contractions
+    through view = contract_nodes(view, ...) costs O(k α(k)); call copy() first to keep the
+    earlier view, and materialize() when a standalone Graph is needed.
+
     Args:
-        graph (Graph): The graph object.
+        graph (Graph): The graph object, or a ContractedGraph to contract further.
         node1 (int): The first node to contract.
         node2 (int): The second node to contract.
-    
+
     Returns:
-        Graph: A new graph object with the nodes contracted.
+        ContractedGraph: A view of the graph in which node1 is merged into node2.
     """
-    new_graph = copy.deepcopy(graph)
-    new_graph.nodes.remove(node1)
-    for edge in new_graph.edges:
-        if node1 == edge[0]:
-            edge[0] = node2
-        elif node1 == edge[1]:
-            edge[1] = node2
-    new_graph.edges = [list(edge) for edge in set(tuple(edge) for edge in new_graph.edges)]
-    if [node2, node2] in new_graph.edges:
-        new_graph.edges.remove([node2, node2])
-    return new_graph
+    view = graph if isinstance(graph, ContractedGraph) else ContractedGraph(graph)
+    view.contract(node1, node2)
+    return view
 
 def add_edge_to_matching(matching: 'Matching', vertex1: int, vertex2: int) -> 'Matching':
     """
@@ -106,10 +132,9 @@ def add_edge_to_matching(matching: 'Matching', vertex1: int, vertex2: int) -> 'M
     Returns:
         Matching: The updated matching object.
     """
-    if vertex1 in matching.nodes or vertex2 in matching.nodes or [vertex1, vertex2] in matching.edges or [vertex2, vertex1] in matching.edges:
+    if vertex1 in matching.nodes or vertex2 in matching.nodes or matching.has_edge(vertex1, vertex2):
         return matching
-    matching.edges.append([vertex1, vertex2])
-    matching.nodes.extend([vertex1, vertex2])
+    matching.add_edge(vertex1, vertex2)
     return matching
 
 def aux_add_edge_to_matching(matching: 'Matching', vertex1: int, vertex2: int) -> 'Matching':
@@ -124,12 +149,8 @@ def aux_add_edge_to_matching(matching: 'Matching', vertex1: int, vertex2: int) -
     Returns:
         Matching: The updated matching object.
     """
-    if [vertex1, vertex2] not in matching.edges and [vertex2, vertex1] not in matching.edges:
-        matching.edges.append([vertex1, vertex2])
-        if vertex1 not in matching.nodes:
-            matching.nodes.append(vertex1)
-        if vertex2 not in matching.nodes:
-            matching.nodes.append(vertex2)
+    if not matching.has_edge(vertex1, vertex2):
+        matching.add_edge(vertex1, vertex2)
     return matching
 
 def remove_edge_from_matching(matching: 'Matching', vertex1: int, vertex2: int) -> 'Matching':
@@ -144,31 +165,30 @@ def remove_edge_from_matching(matching: 'Matching', vertex1: int, vertex2: int)
     Returns:
         Matching: The updated matching object.
     """
-    if [vertex1, vertex2] in matching.edges:
-        matching.edges.remove([vertex1, vertex2])
-    elif [vertex2, vertex1] in matching.edges:
-        matching.edges.remove([vertex2, vertex1])
-    if vertex1 in matching.nodes:
-        matching.nodes.remove(vertex1)
-    if vertex2 in matching.nodes:
-        matching.nodes.remove(vertex2)
+    if matching.has_edge(vertex1, vertex2):
+        matching.remove_edge(vertex1, vertex2)
     return matching
 
 class Forest:
     def __init__(self):
         self.tree_list = []
+        self.tree_of = {}
 
     def add_tree(self, tree: 'Tree'):
+        for node in tree.nodes:
+            self.tree_of.setdefault(node, len(self.tree_list))
         self.tree_list.append(tree)
 
+    def add_edge(self, tree_index: int, vertex1: int, vertex2: int):
+        self.tree_list[tree_index].add_edge(vertex1, vertex2)
+        self.tree_of.setdefault(vertex1, tree_index)
+        self.tree_of.setdefault(vertex2, tree_index)
+
     def get_tree_by_node(self, node: int) -> int:
-        for index, tree in enumerate(self.tree_list):
-            if node in tree.nodes:
-                return index
-        return -1
+        return self.tree_of.get(node, -1)
 
     def is_in_forest(self, node: int) -> bool:
-        return any(node in tree.nodes for tree in self.tree_list)
+        return node in self.tree_of
 
     def tree(self, tree_index: int) -> 'Tree':
         return self.tree_list[tree_index]
@@ -177,22 +197,35 @@ class Forest:
         return self.tree_list[tree_index].graph
 
     def get_root(self, node: int) -> int:
-        for tree in self.tree_list:
-            if node in tree.nodes:
-                return tree.root
-        return -1
+        if node not in self.tree_of:
+            return -1
+        return self.tree_list[self.tree_of[node]].root
+
+    def get_parent(self, node: int) -> Optional[int]:
+        return self.tree_list[self.tree_of[node]].parent[node]
+
+    def get_parity(self, node: int) -> int:
+        return self.tree_list[self.tree_of[node]].depth[node] % 2
 
 class Tree:
     def __init__(self, root: int):
         self.root = root
         self.nodes = [root]
         self.graph = {root: []}
+        self.parent = {root: None}
+        self.depth = {root: 0}
 
     def add_edge(self, vertex1: int, vertex2: int):
-        if vertex1 not in self.nodes:
+        if vertex1 not in self.parent and vertex2 in self.parent:
+            vertex1, vertex2 = vertex2, vertex1
+        if vertex1 not in self.parent:
             self.nodes.append(vertex1)
-        if vertex2 not in self.nodes:
+            self.parent[vertex1] = None
+            self.depth[vertex1] = 0
+        if vertex2 not in self.parent:
             self.nodes.append(vertex2)
+            self.parent[vertex2] = vertex1
+            self.depth[vertex2] = self.depth[vertex1] + 1
         if vertex1 not in self.graph:
             self.graph[vertex1] = []
         if vertex2 not in self.graph:
@@ -202,36 +235,432 @@ class Tree:
         if vertex1 not in self.graph[vertex2]:
             self.graph[vertex2].append(vertex1)
 
+    def path_to_root(self, node: int) -> List[int]:
+        path = []
+        while node is not None:
+            path.append(node)
+            node = self.parent[node]
+        return path
+
+    def lowest_common_ancestor(self, vertex1: int, vertex2: int) -> Optional[int]:
+        while self.depth[vertex1] > self.depth[vertex2]:
+            vertex1 = self.parent[vertex1]
+        while self.depth[vertex2] > self.depth[vertex1]:
+            vertex2 = self.parent[vertex2]
+        while vertex1 != vertex2 and vertex1 is not None:
+            vertex1, vertex2 = self.parent[vertex1], self.parent[vertex2]
+        return vertex1
+
+    def path(self, source: int, destination: int) -> List[int]:
+        ancestor = self.lowest_common_ancestor(source, destination)
+        if ancestor is None:
+            return []
+        path = []
+        while source != ancestor:
+            path.append(source)
+            source = self.parent[source]
+        path.append(ancestor)
+        tail = []
+        while destination != ancestor:
+            tail.append(destination)
+            destination = self.parent[destination]
+        path.extend(reversed(tail))
+        return path
+
 class Graph:
     def __init__(self):
-        self.edges = []
-        self.nodes = []
+        self.adjacency = {}
+        self.edge_order = {}
+        self.weights = {}
+
+    @property
+    def nodes(self) -> 'NodeView':
+        return NodeView(self)
+
+    @nodes.setter
+    def nodes(self, nodes: Iterable[int]):
+        nodes = list(nodes)
+        kept = set(nodes)
+        for node in list(self.adjacency):
+            if node not in kept:
+                self.remove_node(node)
+        self.adjacency = {node: self.adjacency.get(node, {}) for node in nodes}
+
+    @property
+    def edges(self) -> 'EdgeView':
+        return EdgeView(self)
+
+    @edges.setter
+    def edges(self, edges: Iterable[List[int]]):
+        edges = [tuple(edge) for edge in edges]
+        for vertex1, vertex2 in list(self.edge_order.values()):
+            self.remove_edge(vertex1, vertex2)
+        for edge in edges:
+            self.add_edge(*edge)
+
+    def add_node(self, node: int):
+        self.adjacency.setdefault(node, {})
+
+    def remove_node(self, node: int):
+        for neighbor in list(self.adjacency.get(node, ())):
+            self.remove_edge(node, neighbor)
+        self.adjacency.pop(node, None)
+
+    def add_edge(self, vertex1: int, vertex2: int, weight: Optional[float] = None):
+        key = edge_key(vertex1, vertex2)
+        if weight is not None:
+            self.weights[key] = weight
+        if key in self.edge_order:
+            return
+        self.edge_order[key] = (vertex1, vertex2)
+        self.adjacency.setdefault(vertex1, {})[vertex2] = None
+        self.adjacency.setdefault(vertex2, {})[vertex1] = None
+
+    def remove_edge(self, vertex1: int, vertex2: int):
+        key = edge_key(vertex1, vertex2)
+        del self.edge_order[key]
+        self.weights.pop(key, None)
+        del self.adjacency[vertex1][vertex2]
+        self.adjacency[vertex2].pop(vertex1, None)
+
+    def neighbors(self, node: int) -> Iterable[int]:
+        return self.adjacency.get(node, {}).keys()
+
+    def copy(self) -> 'Graph':
+        graph = type(self)()
+        graph.adjacency = {node: dict(neighbors) for node, neighbors in self.adjacency.items()}
+        graph.edge_order = dict(self.edge_order)
+        graph.weights = dict(self.weights)
+        return graph
+
+    def contract(self, node1: int, node2: int):
+        for neighbor in list(self.neighbors(node1)):
+            key = edge_key(node1, neighbor)
+            (vertex1, vertex2), weight = self.edge_order[key], self.weights.get(key)
+            self.remove_edge(vertex1, vertex2)
+            if neighbor != node2:
+                self.add_edge(node2 if vertex1 == node1 else vertex1, node2 if vertex2 == node1 else vertex2, weight)
+        self.remove_node(node1)
 
     def has_edge(self, vertex1: int, vertex2: int) -> bool:
-        return [vertex1, vertex2] in self.edges or [vertex2, vertex1] in self.edges
+        return edge_key(vertex1, vertex2) in self.edge_order
+
+    def weight(self, vertex1: int, vertex2: int) -> float:
+        return self.weights.get(edge_key(vertex1, vertex2), 1)
+
+    def weighted_edges(self) -> List[Tuple[int, int, float]]:
+        return [(vertex1, vertex2, self.weights.get(key, 1)) for key, (vertex1, vertex2) in self.edge_order.items()]
 
     def get_edges(self, node: int) -> List[List[int]]:
-        return [edge for edge in self.edges if node in edge]
+        return [list(self.edge_order[edge_key(node, neighbor)]) for neighbor in self.neighbors(node)]
 
 class Matching(Graph):
+    def __init__(self):
+        super().__init__()
+        self.mate = {}
+        self.engine = None
+        self.phases = 0
+        self.augmentations = 0
+        self.blossoms = 0
+
+    def copy(self) -> 'Matching':
+        matching = super().copy()
+        matching.mate = dict(self.mate)
+        return matching
+
+    def add_edge(self, vertex1: int, vertex2: int, weight: Optional[float] = None):
+        super().add_edge(vertex1, vertex2, weight)
+        self.mate[vertex1], self.mate[vertex2] = vertex2, vertex1
+
+    def remove_edge(self, vertex1: int, vertex2: int):
+        super().remove_edge(vertex1, vertex2)
+        for vertex in {vertex1, vertex2}:
+            if self.adjacency[vertex]:
+                self.mate[vertex] = next(iter(self.adjacency[vertex]))
+            else:
+                del self.adjacency[vertex]
+                self.mate.pop(vertex, None)
+
     def get_edges(self, node: int) -> List[int]:
-        for edge in self.edges:
-            if node in edge:
-                return edge
+        for neighbor in self.neighbors(node):
+            return list(self.edge_order[edge_key(node, neighbor)])
         return []
 
+class NodeView:
+    def __init__(self, graph: Graph):
+        self.graph = graph
+
+    def __iter__(self):
+        return iter(list(self.graph.adjacency))
+
+    def __len__(self) -> int:
+        return len(self.graph.adjacency)
+
+    def __contains__(self, node: int) -> bool:
+        return node in self.graph.adjacency
+
+    def __getitem__(self, index):
+        return list(self.graph.adjacency)[index]
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def append(self, node: int):
+        self.graph.add_node(node)
+
+    def extend(self, nodes: Iterable[int]):
+        for node in nodes:
+            self.graph.add_node(node)
+
+    def remove(self, node: int):
+        if node not in self.graph.adjacency:
+            raise ValueError("{!r} is not a node of the graph".format(node))
+        self.graph.remove_node(node)
+
+class EdgeView:
+    def __init__(self, graph: Graph):
+        self.graph = graph
+
+    def __iter__(self):
+        return (list(edge) for edge in list(self.graph.edge_order.values()))
+
+    def __len__(self) -> int:
+        return len(self.graph.edge_order)
+
+    def __contains__(self, edge: List[int]) -> bool:
+        return len(edge) == 2 and self.graph.has_edge(edge[0], edge[1])
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def append(self, edge: List[int]):
+        self.graph.add_edge(*edge)
+
+    def extend(self, edges: Iterable[List[int]]):
+        for edge in edges:
+            self.graph.add_edge(*edge)
+
+    def remove(self, edge: List[int]):
+        if edge not in self:
+            raise ValueError("{!r} is not an edge of the graph".format(edge))
+        self.graph.remove_edge(edge[0], edge[1])
+
+class ContractedGraph:
+    def __init__(self, base: Graph):
+        self.base = base
+        self.union_parent = {}
+        self.size = {}
+        self.name = {}
+        self.next_member = {}
+        self.contractions = []
+
+    def copy(self) -> 'ContractedGraph':
+        view = ContractedGraph(self.base)
+        view.union_parent = dict(self.union_parent)
+        view.size = dict(self.size)
+        view.name = dict(self.name)
+        view.next_member = dict(self.next_member)
+        view.contractions = list(self.contractions)
+        return view
+
+    def root(self, node: int) -> int:
+        root = node
+        while root in self.union_parent:
+            root = self.union_parent[root]
+        while node != root:
+            parent = self.union_parent[node]
+            self.union_parent[node] = root
+            node = parent
+        return root
+
+    def find(self, node: int) -> int:
+        root = self.root(node)
+        return self.name.get(root, root)
+
+    def contract(self, node1: int, node2: int) -> int:
+        root1, root2 = self.root(node1), self.root(node2)
+        label = self.name.get(root2, root2)
+        if root1 == root2:
+            return label
+        self.contractions.append((self.name.get(root1, root1), label))
+        if self.size.get(root1, 1) > self.size.get(root2, 1):
+            root1, root2 = root2, root1
+        self.union_parent[root1] = root2
+        self.size[root2] = self.size.pop(root1, 1) + self.size.get(root2, 1)
+        self.name.pop(root1, None)
+        self.name[root2] = label
+        self.next_member[root1], self.next_member[root2] = self.next_member.get(root2, root2), self.next_member.get(root1, root1)
+        return label
+
+    def members(self, node: int) -> List[int]:
+        start = self.root(node)
+        members = [start]
+        member = self.next_member.get(start, start)
+        while member != start:
+            members.append(member)
+            member = self.next_member.get(member, member)
+        return members
+
+    @property
+    def nodes(self) -> List[int]:
+        return [node for node in self.base.adjacency if self.find(node) == node]
+
+    @property
+    def edges(self) -> List[List[int]]:
+        return list(self.materialize().edges)
+
+    def neighbors(self, node: int) -> List[int]:
+        label = self.find(node)
+        neighbors = {}
+        for member in self.members(node):
+            for neighbor in self.base.neighbors(member):
+                representative = self.find(neighbor)
+                if representative != label:
+                    neighbors[representative] = None
+        return list(neighbors)
+
+    def has_edge(self, vertex1: int, vertex2: int) -> bool:
+        root1, root2 = self.root(vertex1), self.root(vertex2)
+        if root1 == root2:
+            return False
+        if self.size.get(root1, 1) > self.size.get(root2, 1):
+            root1, root2 = root2, root1
+        return any(self.root(neighbor) == root2 for member in self.members(root1) for neighbor in self.base.neighbors(member))
+
+    def get_edges(self, node: int) -> List[List[int]]:
+        label = self.find(node)
+        return [[label, neighbor] for neighbor in self.neighbors(node)]
+
+    def materialize(self) -> Graph:
+        graph = self.base.copy()
+        for node1, node2 in self.contractions:
+            graph.contract(node1, node2)
+        return graph
+
+class MateArray(array):
+    def __contains__(self, vertex: int) -> bool:
+        return self[vertex] != FREE
+
+    def get(self, vertex: int, default: Optional[int] = None) -> Optional[int]:
+        partner = self[vertex]
+        return default if partner == FREE else partner
+
+class CSRGraph:
+    def __init__(self, offsets: array, neighbors: array, labels: Optional[array] = None):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.labels = labels
+        self.mate = MateArray('i')
+        self.mate.frombytes((array('i', [FREE]) * (len(offsets) - 1)).tobytes())
+        self.engine = None
+        self.phases = 0
+        self.augmentations = 0
+        self.blossoms = 0
+
+    @classmethod
+    def from_edges(cls, node_count: int, sources: Iterable[int], targets: Iterable[int], labels: Optional[array] = None) -> 'CSRGraph':
+        sources = sources if isinstance(sources, array) else array('i', sources)
+        targets = targets if isinstance(targets, array) else array('i', targets)
+        offsets = array('i', [0]) * (node_count + 1)
+        for vertex in sources:
+            offsets[vertex + 1] += 1
+        for vertex in targets:
+            offsets[vertex + 1] += 1
+        for vertex in range(node_count):
+            offsets[vertex + 1] += offsets[vertex]
+        neighbors = array('i', [0]) * offsets[node_count]
+        position = offsets[:-1]
+        for vertex1, vertex2 in zip(sources, targets):
+            neighbors[position[vertex1]] = vertex2
+            position[vertex1] += 1
+            neighbors[position[vertex2]] = vertex1
+            position[vertex2] += 1
+        return cls(offsets, neighbors, labels)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CSRGraph':
+        labels = array('q', graph.adjacency)
+        index = {node: position for position, node in enumerate(labels)}
+        offsets = array('i', [0]) * (len(labels) + 1)
+        neighbors = array('i')
+        for position, node in enumerate(labels):
+            neighbors.extend(index[neighbor] for neighbor in graph.adjacency[node])
+            offsets[position + 1] = len(neighbors)
+        return cls(offsets, neighbors, labels)
+
+    def to_graph(self) -> Graph:
+        graph = Graph()
+        graph.nodes = [self.label(vertex) for vertex in self]
+        for vertex in self:
+            for neighbor in self[vertex]:
+                if vertex <= neighbor:
+                    graph.add_edge(self.label(vertex), self.label(neighbor))
+        return graph
+
+    def to_matching(self) -> Matching:
+        matching = Matching()
+        for vertex in self:
+            partner = self.mate[vertex]
+            if vertex < partner:
+                matching.add_edge(self.label(vertex), self.label(partner))
+        matching.engine = self.engine
+        matching.phases = self.phases
+        matching.augmentations = self.augmentations
+        matching.blossoms = self.blossoms
+        return matching
+
+    def label(self, vertex: int) -> int:
+        return vertex if self.labels is None else self.labels[vertex]
+
+    def edge_count(self) -> int:
+        return len(self.neighbors) // 2
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        return iter(range(len(self.offsets) - 1))
+
+    def __contains__(self, vertex: int) -> bool:
+        return 0 <= vertex < len(self.offsets) - 1
+
+    def __getitem__(self, vertex: int) -> array:
+        return self.neighbors[self.offsets[vertex]:self.offsets[vertex + 1]]
+
+def edge_key(vertex1: int, vertex2: int) -> Tuple[int, int]:
+    """
+    Orders the endpoints of an undirected edge so that both orientations share one key.
+
+    Args:
+        vertex1 (int): The first vertex of the edge.
+        vertex2 (int): The second vertex of the edge.
+
+    Returns:
+        Tuple[int, int]: The endpoints in ascending order.
+    """
+    return (vertex1, vertex2) if vertex1 <= vertex2 else (vertex2, vertex1)
+
 
 
 """
-1. import copy:
-   - Purpose: Provides functions for deep and shallow copying of objects.
-   - Usage: Used in the contract_nodes function to create a deep copy of the graph when contracting nodes, ensuring the original graph remains unchanged.
+1. from array import array:
+   - Purpose: Provides compact arrays of machine integers.
+   - Usage: Used by CSRGraph for its offset, neighbour, label and mate arrays.
 
 2. from collections import deque:
    - Purpose: Provides a double-ended queue that supports adding and removing elements from both ends efficiently.
    - Usage: Used in the bfs_util function to implement the breadth-first search (BFS) queue.
 
-3. from typing import List, Dict, Tuple, Any:
+3. from typing import List, Dict, Tuple, Any, Optional, Iterable:
    - Purpose: Provides type hints for function arguments and return values.
    - Usage: Used throughout the code to specify the expected types of variables and function return values, improving code readability and type checking.
 """
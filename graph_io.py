@@ -0,0 +1,310 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import chain, count, filterfalse, repeat
+from operator import and_, or_, lshift, rshift
+from typing import List, Iterable, Iterator, Tuple, Optional, Union, BinaryIO
+from graphHelpers import Graph, CSRGraph
+
+MAGIC = b"BLOSSOMG"
+VERSION = 1
+HAS_LABELS = 1
+HEADER = struct.Struct("<8sIIQQBB14x")
+ALIGNMENT = 8
+INT32_MAX = 2 ** 31 - 1
+CHUNK_BYTES = 1 << 22
+
+
+def save_graph(graph: Union[Graph, CSRGraph], path: str):
+    """
+    Writes a graph in the binary CSR format read by load_graph.
+
+    The file starts with a 48-byte little-endian header: the magic bytes b"BLOSSOMG", the format
+    version, flags (bit 0: a label section follows), the vertex count, the length of the
+    neighbour section, and the byte width (4 or 8) of indices and of labels. It is followed by
+    the offsets (vertex count + 1 entries) and neighbours as int32 or int64, and the original
+    node ids when they are not 0..n-1, each section starting at a multiple of 8 bytes. Sections
+    are stored in the byte order of the machine and only little-endian machines are supported.
+
+    Args:
+        graph (Graph | CSRGraph): The graph to save. A Graph is converted with CSRGraph.from_graph.
+        path (str): The file to write.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("The binary graph format is little-endian")
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_graph(graph)
+    node_count, entry_count = len(graph), len(graph.neighbors)
+    index_width = 4 if max(node_count, entry_count) <= INT32_MAX else 8
+    labels = graph.labels
+    if labels is not None and all(label == vertex for vertex, label in enumerate(labels)):
+        labels = None
+    label_width = 0
+    if labels is not None:
+        label_width = 4 if all(-INT32_MAX <= label <= INT32_MAX for label in labels) else 8
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, HAS_LABELS if labels is not None else 0, node_count, entry_count, index_width, label_width))
+        write_section(file, graph.offsets, index_width)
+        write_section(file, graph.neighbors, index_width)
+        if labels is not None:
+            write_section(file, labels, label_width)
+
+def load_graph(path: str) -> CSRGraph:
+    """
+    Maps a file written by save_graph into memory without reading it.
+
+    The offset, neighbour and label arrays of the returned graph are read-only memoryviews
+    over a shared mmap, so loading takes constant time, pages are only read when the engines
+    touch them, and processes that load the same file share one copy in the page cache.
+    Only graph.mate is allocated, so compute_maximum_matching_csr runs on the mapped arrays.
+
+    Args:
+        path (str): A file written by save_graph.
+
+    Returns:
+        CSRGraph: The mapped graph.
+    """
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} is too short for a graph header")
+    magic, version, flags, node_count, entry_count, index_width, label_width = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary graph file")
+    if version != VERSION:
+        raise ValueError(f"{path} has format version {version}, expected {VERSION}")
+    if sys.byteorder != "little":
+        raise ValueError("The binary graph format is little-endian")
+
+    view = memoryview(buffer)
+    position = HEADER.size
+    offsets, position = read_section(view, position, node_count + 1, index_width)
+    neighbors, position = read_section(view, position, entry_count, index_width)
+    labels = None
+    if flags & HAS_LABELS:
+        labels, position = read_section(view, position, node_count, label_width)
+    return CSRGraph(offsets, neighbors, labels)
+
+def write_section(file, values, width: int):
+    """
+    Writes integers as int32 or int64 and pads the file to the next multiple of ALIGNMENT bytes.
+    """
+    array("i" if width == 4 else "q", values).tofile(file)
+    file.write(b"\0" * (-file.tell() % ALIGNMENT))
+
+def read_section(view: memoryview, position: int, count: int, width: int):
+    """
+    Returns a typed memoryview of count int32 or int64 values and the aligned position after it.
+    """
+    end = position + count * width
+    if end > len(view):
+        raise ValueError("The graph file is truncated")
+    section = view[position:end].cast("i" if width == 4 else "q")
+    return section, end + (-end % ALIGNMENT)
+
+def read_graph(path: str, file_format: Optional[str] = None, chunk_size: int = CHUNK_BYTES) -> Graph:
+    """
+    Reads a DIMACS, METIS, Matrix Market or edge-list file into a Graph.
+
+    Args:
+        path (str): The file to read.
+        file_format (str, optional): One of READERS. Defaults to the one registered for the file
+            extension in EXTENSIONS.
+        chunk_size (int, optional): Number of bytes parsed at a time.
+
+    Returns:
+        Graph: The graph, with the node ids used in the file.
+    """
+    labels, sources, targets = read_edges(path, file_format, chunk_size)
+    graph = Graph()
+    graph.nodes = labels
+    for source, target in zip(sources, targets):
+        graph.add_edge(labels[source], labels[target])
+    return graph
+
+def read_csr_graph(path: str, file_format: Optional[str] = None, chunk_size: int = CHUNK_BYTES) -> CSRGraph:
+    """
+    Reads a DIMACS, METIS, Matrix Market or edge-list file into a CSRGraph labelled with the node ids used in the file.
+
+    Args:
+        path (str): The file to read.
+        file_format (str, optional): One of READERS, as for read_graph.
+        chunk_size (int, optional): Number of bytes parsed at a time.
+
+    Returns:
+        CSRGraph: The graph.
+    """
+    labels, sources, targets = read_edges(path, file_format, chunk_size)
+    return CSRGraph.from_edges(len(labels), sources, targets, labels)
+
+def read_edges(path: str, file_format: Optional[str] = None, chunk_size: int = CHUNK_BYTES) -> Tuple[array, array, array]:
+    """
+    Reads the edges of a graph file chunk by chunk and normalizes them on the fly.
+
+    Node ids are numbered in order of first appearance, reading each edge's endpoints left to
+    right, after the vertices of a header that declares the vertex count, so isolated vertices
+    are kept. Each undirected edge is packed into one
+    integer key, low id in the upper 32 bits, and collected in a set, which drops duplicates
+    like the set(tuple(...)) in contract_nodes; self-loops are removed at the end. Only one
+    chunk of text is held at a time, but the id map and the edge set grow with the graph: peak
+    memory is about 180 bytes per edge, and CPython parses about 0.2-0.3M edges per second.
+
+    Args:
+        path (str): The file to read.
+        file_format (str, optional): One of READERS, as for read_graph.
+        chunk_size (int, optional): Number of bytes parsed at a time.
+
+    Returns:
+        Tuple[array, array, array]: The node ids, followed by the two endpoints of every edge as
+        positions into the node ids.
+    """
+    if file_format is None:
+        file_format = EXTENSIONS.get(os.path.splitext(path)[1].lower(), "edge_list")
+    if file_format not in READERS:
+        raise ValueError(f"Unknown graph file format {file_format!r}, expected one of {tuple(READERS)}")
+    index = {}
+    keys = set()
+    with open(path, "rb") as file:
+        for nodes, sources, targets in READERS[file_format](file, chunk_size):
+            new_nodes = dict.fromkeys(chain(nodes, chain.from_iterable(zip(sources, targets))))
+            index.update(zip(filterfalse(index.__contains__, new_nodes), count(len(index))))
+            sources = list(map(index.__getitem__, sources))
+            targets = list(map(index.__getitem__, targets))
+            keys.update(map(or_, map(lshift, map(min, sources, targets), repeat(32)), map(max, sources, targets)))
+    keys.difference_update(vertex << 32 | vertex for vertex in range(len(index)))
+    return (array('q', index), array('i', map(rshift, keys, repeat(32))), array('i', map(and_, keys, repeat(0xFFFFFFFF))))
+
+def read_edge_list(file: BinaryIO, chunk_size: int) -> Iterator[Tuple[Iterable[int], List[int], List[int]]]:
+    """
+    Parses whitespace-separated edge lists. Extra columns, such as weights, are ignored, and
+    lines starting with # or % are comments.
+    """
+    for chunk in read_chunks(file, chunk_size):
+        yield ((), *split_columns(chunk, 2, (b"#", b"%")))
+
+def read_dimacs(file: BinaryIO, chunk_size: int) -> Iterator[Tuple[Iterable[int], List[int], List[int]]]:
+    """
+    Parses DIMACS .col files: "c" comment lines, a "p edge <vertices> <edges>" line and "e <u> <v>"
+    edge lines with vertices numbered from 1.
+    """
+    for chunk in read_chunks(file, chunk_size):
+        tokens = chunk.split()
+        if len(tokens) == 3 * tokens.count(b"e") and tokens[::3].count(b"e") == len(tokens) // 3:
+            yield (), list(map(int, tokens[1::3])), list(map(int, tokens[2::3]))
+            continue
+        nodes, sources, targets = (), [], []
+        for line in chunk.splitlines():
+            fields = line.split()
+            if fields and fields[0] == b"e":
+                sources.append(int(fields[1]))
+                targets.append(int(fields[2]))
+            elif fields and fields[0] == b"p":
+                nodes = range(1, int(fields[2]) + 1)
+        yield nodes, sources, targets
+
+def read_metis(file: BinaryIO, chunk_size: int) -> Iterator[Tuple[Iterable[int], List[int], List[int]]]:
+    """
+    Parses METIS .graph files: a "<vertices> <edges> [fmt [ncon]]" header followed by one line
+    of neighbours per vertex, numbered from 1. The fmt digits flag vertex sizes, vertex weights
+    (ncon of them) and edge weights, which are skipped. Lines starting with % are comments.
+    """
+    vertex, vertex_count, skip, step = 0, None, 0, 1
+    for chunk in read_chunks(file, chunk_size):
+        nodes, sources, targets = (), [], []
+        for line in chunk.splitlines():
+            if line.startswith(b"%"):
+                continue
+            fields = line.split()
+            if vertex_count is None:
+                if not fields:
+                    continue
+                vertex_count = int(fields[0])
+                fmt = fields[2].decode().zfill(3) if len(fields) > 2 else "000"
+                skip = (fmt[0] == "1") + (fmt[1] == "1") * (int(fields[3]) if len(fields) > 3 else 1)
+                step = 2 if fmt[2] == "1" else 1
+                nodes = range(1, vertex_count + 1)
+                continue
+            if vertex == vertex_count:
+                continue
+            vertex += 1
+            neighbors = fields[skip::step]
+            sources.extend(repeat(vertex, len(neighbors)))
+            targets.extend(map(int, neighbors))
+        yield nodes, sources, targets
+
+def read_matrix_market(file: BinaryIO, chunk_size: int) -> Iterator[Tuple[Iterable[int], List[int], List[int]]]:
+    """
+    Parses Matrix Market coordinate files. A square matrix is read as the adjacency matrix of
+    vertices 1..n and a rectangular one as a bipartite graph, with column j becoming vertex
+    rows + j. Values and the symmetry flag are ignored because edges are undirected.
+    """
+    banner = file.readline().split()
+    if banner[:2] != [b"%%MatrixMarket", b"matrix"] or banner[2:3] != [b"coordinate"]:
+        raise ValueError("Only Matrix Market matrices in coordinate format are supported")
+    columns = 2 if banner[3:4] == [b"pattern"] else 4 if banner[3:4] == [b"complex"] else 3
+    line = file.readline()
+    while line.startswith(b"%") or not line.strip():
+        line = file.readline()
+    rows, cols, _ = map(int, line.split())
+    offset = 0 if rows == cols else rows
+    yield range(1, max(rows, offset + cols) + 1), [], []
+    for chunk in read_chunks(file, chunk_size):
+        sources, targets = split_columns(chunk, columns, (b"%",))
+        if offset:
+            targets = [target + offset for target in targets]
+        yield (), sources, targets
+
+def read_chunks(file: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """
+    Reads a file in blocks of about chunk_size bytes that end at a line break.
+    """
+    rest = b""
+    while True:
+        block = file.read(chunk_size)
+        if not block:
+            break
+        block = rest + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            rest = block
+            continue
+        rest = block[cut:]
+        yield block[:cut]
+    if rest:
+        yield rest
+
+def split_columns(chunk: bytes, columns: int, comments: Tuple[bytes, ...]) -> Tuple[List[int], List[int]]:
+    """
+    Returns the first two columns of every line of a chunk as integers.
+
+    When the chunk has no comment characters, it is split in one call with a NUL token standing
+    in for every line break, and sliced, which keeps the Python work per edge to two int calls.
+    The NUL tokens must then sit after every columns fields, so a blank line or a line with a
+    missing or extra field sends the chunk to the line-by-line parser instead of shifting fields.
+    """
+    if not chunk.endswith(b"\n"):
+        chunk += b"\n"
+    if not any(comment in chunk for comment in comments):
+        lines = chunk.count(b"\n")
+        tokens = chunk.replace(b"\n", b" \0 ").split()
+        if len(tokens) == (columns + 1) * lines and tokens[columns::columns + 1].count(b"\0") == lines:
+            return list(map(int, tokens[::columns + 1])), list(map(int, tokens[1::columns + 1]))
+    sources, targets = [], []
+    for line in chunk.splitlines():
+        fields = line.split()
+        if len(fields) >= 2 and fields[0][:1] not in comments:
+            sources.append(int(fields[0]))
+            targets.append(int(fields[1]))
+    return sources, targets
+
+
+READERS = {
+    "edge_list": read_edge_list,
+    "dimacs": read_dimacs,
+    "metis": read_metis,
+    "matrix_market": read_matrix_market,
+}
+EXTENSIONS = {".col": "dimacs", ".graph": "metis", ".mtx": "matrix_market", ".tsv": "edge_list", ".txt": "edge_list", ".edges": "edge_list"}
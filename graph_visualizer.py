@@ -1,36 +1,304 @@
+import heapq
+import math
+from contextlib import contextmanager
+from itertools import islice
 from graphics import GraphWin, Point, Line, Circle, Text
+from graphHelpers import ODD
+from layout import layout_graph
+from listeners import MatchingListener
+from spatial_index import SpatialIndex, segment_intersects
 
-class GraphVisualizer:
-    def __init__(self, width, height):
-        self.win = GraphWin("Blossom Algorithm Visualization", width, height)
+FRAME_RATE = 30
+NODE_RADIUS = 20
+NODE_COLOR = "white"
+EDGE_COLOR = "black"
+# Level of detail. Nodes are drawn while at most MAX_NODES are in view and labelled while at
+# most MAX_LABELS are and the zoom is at least LABEL_ZOOM. Above MAX_EDGES edges in view, edges
+# are merged into the MAX_BUNDLES largest bundles between grid cells about BUNDLE_PIXELS wide
+# on screen; grids with more than MAX_GRID_BUNDLES bundles are coarsened.
+MAX_NODES = 2000
+MAX_LABELS = 200
+LABEL_ZOOM = 0.5
+MAX_EDGES = 5000
+MAX_BUNDLES = 2000
+MAX_GRID_BUNDLES = 100000
+MAX_BUNDLE_WIDTH = 8
+BUNDLE_PIXELS = 16
+ZOOM_STEP = 1.25
+# Pixels between neighbouring nodes when draw_graph lays out a graph too large for the window.
+LAYOUT_SPACING = 3 * NODE_RADIUS
+
+
+class GraphVisualizer(MatchingListener):
+    def __init__(self, width, height, autoflush=False, frame_rate=FRAME_RATE):
+        self.win = GraphWin("Blossom Algorithm Visualization", width, height, autoflush=autoflush)
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.max_nodes = MAX_NODES
+        self.max_labels = MAX_LABELS
+        self.max_edges = MAX_EDGES
+        self.max_bundles = MAX_BUNDLES
+        # The whole graph, drawn or not, and the indexes that find what is in view.
+        self.positions = {}
+        self.node_colors = {}
+        self.edge_colors = {}
+        self.node_index = SpatialIndex(max(width, height))
+        self.edge_index = SpatialIndex(max(width, height))
+        self.bundles = {}
+        # The canvas items of the current view.
+        self.drawn = []
         self.node_objects = {}
+        self.label_objects = {}
         self.edge_objects = {}
+        self.bundle_objects = []
+        # World coordinates of the top left corner and screen pixels per world unit.
+        self.left, self.top, self.zoom = 0.0, 0.0, 1.0
+        self.stale = True
+        self.moved = True
+        self.reindex = False
+        self._drag = None
+        self.win.bind("<MouseWheel>", lambda event: self._on_zoom(event, event.delta > 0))
+        self.win.bind("<Button-4>", lambda event: self._on_zoom(event, True))
+        self.win.bind("<Button-5>", lambda event: self._on_zoom(event, False))
+        for button in (2, 3):
+            self.win.bind(f"<ButtonPress-{button}>", self._on_drag_start)
+            self.win.bind(f"<B{button}-Motion>", self._on_drag)
+
+    @contextmanager
+    def batch(self):
+        with self.win.batch(self.frame_rate):
+            yield self
+            self.refresh()
+
+    def flush(self):
+        with self.win.batch(self.frame_rate):
+            self.refresh()
 
     def draw_node(self, node_id, x, y):
-        node = Circle(Point(x, y), 20)
-        node.setFill("white")
-        node.draw(self.win)
-        label = Text(Point(x, y), str(node_id))
-        label.draw(self.win)
-        self.node_objects[node_id] = node
+        if node_id in self.positions:
+            self.reindex = True
+        self.positions[node_id] = (x, y)
+        self.node_colors.setdefault(node_id, NODE_COLOR)
+        self.node_index.insert(node_id, x - NODE_RADIUS, y - NODE_RADIUS, x + NODE_RADIUS, y + NODE_RADIUS)
+        self.bundles.clear()
+        self.stale = True
 
     def draw_edge(self, node1_id, node2_id):
-        node1 = self.node_objects[node1_id].getCenter()
-        node2 = self.node_objects[node2_id].getCenter()
-        edge = Line(node1, node2)
-        edge.draw(self.win)
-        self.edge_objects[(node1_id, node2_id)] = edge
+        x1, y1 = self.positions[node1_id]
+        x2, y2 = self.positions[node2_id]
+        key = (node1_id, node2_id)
+        self.edge_colors[key] = EDGE_COLOR
+        self.edge_index.insert(key, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        self.bundles.clear()
+        self.stale = True
+
+    def draw_graph(self, graph, positions=None, method="auto"):
+        # Lays the graph out with layout_graph when no positions are given. A large graph gets
+        # a world about LAYOUT_SPACING pixels per node wide and the view is fitted to it.
+        scale = max(1.0, math.sqrt(len(graph.nodes)) * LAYOUT_SPACING / min(self.width, self.height))
+        if positions is None:
+            positions = layout_graph(graph, method, self.width * scale, self.height * scale)
+        with self.batch():
+            for node, (x, y) in positions.items():
+                self.draw_node(node, x, y)
+            for node1, node2 in graph.edges:
+                self.draw_edge(node1, node2)
+            if scale > 1:
+                self.fit()
 
     def update_edge(self, node1_id, node2_id, color):
-        edge = self.edge_objects[(node1_id, node2_id)]
-        edge.setFill(color)
+        key = (node1_id, node2_id) if (node1_id, node2_id) in self.edge_colors else (node2_id, node1_id)
+        previous = self.edge_colors[key]
+        if previous == color:
+            return
+        self.edge_colors[key] = color
+        for exponent, bundles in self.bundles.items():
+            cells = bundles is not None and self._bundle_cells(key, 2.0 ** exponent)
+            if cells:
+                old = cells + (previous,)
+                bundles[old] -= 1
+                if not bundles[old]:
+                    del bundles[old]
+                bundles[cells + (color,)] = bundles.get(cells + (color,), 0) + 1
+        edge = self.edge_objects.get(key)
+        if edge is not None:
+            edge.setFill(color)
+        elif self.bundle_objects:
+            self.stale = True
 
     def update_node(self, node_id, color):
-        node = self.node_objects[node_id]
-        node.setFill(color)
+        if self.node_colors[node_id] == color:
+            return
+        self.node_colors[node_id] = color
+        node = self.node_objects.get(node_id)
+        if node is not None:
+            node.setFill(color)
+
+    def viewport(self):
+        return (self.left, self.top, self.left + (self.width - 1) / self.zoom,
+                self.top + (self.height - 1) / self.zoom)
+
+    def set_view(self, left, top, zoom):
+        if zoom <= 0:
+            raise ValueError("zoom must be positive")
+        self.left, self.top, self.zoom = float(left), float(top), float(zoom)
+        self.moved = True
+        self.stale = True
+
+    def zoom_by(self, factor, x=None, y=None):
+        # Keeps the world point under the screen pixel (x, y), the centre by default, in place.
+        x = (self.width - 1) / 2 if x is None else x
+        y = (self.height - 1) / 2 if y is None else y
+        zoom = self.zoom * factor
+        self.set_view(self.left + x / self.zoom - x / zoom, self.top + y / self.zoom - y / zoom, zoom)
+
+    def pan(self, dx, dy):
+        # Moves the drawing by (dx, dy) screen pixels.
+        self.set_view(self.left - dx / self.zoom, self.top - dy / self.zoom, self.zoom)
+
+    def fit(self):
+        if not self.positions:
+            return
+        xs = [x for x, _ in self.positions.values()]
+        ys = [y for _, y in self.positions.values()]
+        width = max(xs) - min(xs) + 2 * NODE_RADIUS
+        height = max(ys) - min(ys) + 2 * NODE_RADIUS
+        zoom = min((self.width - 1) / width, (self.height - 1) / height)
+        self.set_view((min(xs) + max(xs) - (self.width - 1) / zoom) / 2,
+                      (min(ys) + max(ys) - (self.height - 1) / zoom) / 2, zoom)
+
+    def refresh(self):
+        if not self.stale:
+            return
+        self.stale = False
+        # Undrawing in drawing order keeps every removal from the window's item list cheap.
+        for item in self.drawn:
+            item.undraw()
+        self.drawn = []
+        self.node_objects, self.label_objects, self.edge_objects, self.bundle_objects = {}, {}, {}, []
+        if self.moved:
+            self.moved = False
+            left, top, right, bottom = self.viewport()
+            self.win.setCoords(left, bottom, right, top)
+        if self.reindex:
+            self.reindex = False
+            self.edge_index.clear()
+            for key in self.edge_colors:
+                (x1, y1), (x2, y2) = self.positions[key[0]], self.positions[key[1]]
+                self.edge_index.insert(key, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        view = self.viewport()
+        edges = []
+        for key in self.edge_index.query(*view):
+            (x1, y1), (x2, y2) = self.positions[key[0]], self.positions[key[1]]
+            if segment_intersects(x1, y1, x2, y2, *view):
+                edges.append(key)
+                if len(edges) > self.max_edges:
+                    break
+        if len(edges) > self.max_edges:
+            self._draw_bundles(view)
+        else:
+            for key in edges:
+                edge = Line(Point(*self.positions[key[0]]), Point(*self.positions[key[1]]))
+                if self.edge_colors[key] != EDGE_COLOR:
+                    edge.setFill(self.edge_colors[key])
+                self._draw(edge)
+                self.edge_objects[key] = edge
+        nodes = list(islice(self.node_index.query(*view), self.max_nodes + 1))
+        if len(nodes) > self.max_nodes:
+            return
+        labelled = self.zoom >= LABEL_ZOOM and len(nodes) <= self.max_labels
+        for node_id in nodes:
+            center = Point(*self.positions[node_id])
+            node = Circle(center, NODE_RADIUS)
+            node.setFill(self.node_colors[node_id])
+            self._draw(node)
+            self.node_objects[node_id] = node
+            if labelled:
+                label = Text(center, str(node_id))
+                self._draw(label)
+                self.label_objects[node_id] = label
+
+    def _draw(self, item):
+        item.draw(self.win)
+        self.drawn.append(item)
+
+    def _draw_bundles(self, view):
+        exponent, bundles = self._bundle_grid(math.ceil(math.log2(BUNDLE_PIXELS / self.zoom)))
+        size = 2.0 ** exponent
+        visible = []
+        for (cell1, cell2, color), count in bundles.items():
+            x1, y1, x2, y2 = (cell1[0] + 0.5) * size, (cell1[1] + 0.5) * size, (cell2[0] + 0.5) * size, (cell2[1] + 0.5) * size
+            if segment_intersects(x1, y1, x2, y2, *view):
+                visible.append((count, color, x1, y1, x2, y2))
+        visible = heapq.nlargest(self.max_bundles, visible, key=lambda bundle: bundle[0])
+        # Coloured bundles go on top, so that matched edges stay visible among unmatched ones.
+        visible.sort(key=lambda bundle: (bundle[1] != EDGE_COLOR, bundle[0]))
+        for count, color, x1, y1, x2, y2 in visible:
+            bundle = Line(Point(x1, y1), Point(x2, y2))
+            bundle.setFill(color)
+            bundle.setWidth(min(MAX_BUNDLE_WIDTH, 1 + int(math.log2(count))))
+            self._draw(bundle)
+            self.bundle_objects.append(bundle)
+
+    def _bundle_grid(self, exponent):
+        # Counts the edges between every pair of cells of side 2 ** exponent, per colour. Grids are
+        # cached until the graph changes; None marks a grid too fine to keep.
+        while True:
+            if exponent not in self.bundles:
+                size = 2.0 ** exponent
+                bundles = {}
+                for key, color in self.edge_colors.items():
+                    cells = self._bundle_cells(key, size)
+                    if cells:
+                        bundle = cells + (color,)
+                        bundles[bundle] = bundles.get(bundle, 0) + 1
+                        if len(bundles) > MAX_GRID_BUNDLES:
+                            bundles = None
+                            break
+                self.bundles[exponent] = bundles
+            if self.bundles[exponent] is not None:
+                return exponent, self.bundles[exponent]
+            exponent += 1
+
+    def _bundle_cells(self, key, size):
+        # The cells of both ends of an edge, smallest first, or None when they are the same cell.
+        (x1, y1), (x2, y2) = self.positions[key[0]], self.positions[key[1]]
+        cell1 = (math.floor(x1 / size), math.floor(y1 / size))
+        cell2 = (math.floor(x2 / size), math.floor(y2 / size))
+        if cell1 == cell2:
+            return None
+        return (cell1, cell2) if cell1 < cell2 else (cell2, cell1)
+
+    def _on_zoom(self, event, zoom_in):
+        self.zoom_by(ZOOM_STEP if zoom_in else 1 / ZOOM_STEP, event.x, event.y)
+        self.flush()
+
+    def _on_drag_start(self, event):
+        self._drag = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag is None:
+            return
+        self.pan(event.x - self._drag[0], event.y - self._drag[1])
+        self._drag = (event.x, event.y)
+        self.flush()
 
     def wait_for_click(self):
+        self.flush()
         self.win.getMouse()
 
+    def edge_matched(self, node1_id, node2_id):
+        self.update_edge(node1_id, node2_id, "red")
+        self.wait_for_click()
+
+    def edge_unmatched(self, node1_id, node2_id):
+        self.update_edge(node1_id, node2_id, "black")
+        self.wait_for_click()
+
+    def vertex_labelled(self, node_id, label):
+        if label == ODD:
+            self.update_node(node_id, "yellow")
+
     def close(self):
         self.win.close()
@@ -161,6 +161,7 @@ __version__ = "5.0"
 #     Added Entry boxes.
 
 import time, os, sys
+from contextlib import contextmanager
 
 try:  # import as appropriate for 2.x vs. 3.x
    import tkinter as tk
@@ -182,8 +183,18 @@ BAD_OPTION = "Illegal option value"
 ##########################################################################
 # global variables and funtions
 
-_root = tk.Tk()
-_root.withdraw()
+# The hidden root window is created by _get_root when the first window, image or
+# entry needs it, so importing this module does not open a display connection.
+_root = None
+
+def _get_root():
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+        # MacOS fix 1
+        _root.update()
+    return _root
 
 _update_lasttime = time.time()
 
@@ -198,7 +209,8 @@ def update(rate=None):
         else:
             _update_lasttime = now
 
-    _root.update()
+    if _root is not None:
+        _root.update()
 
 ############################################################################
 # Graphics classes start here
@@ -210,7 +222,7 @@ class GraphWin(tk.Canvas):
     def __init__(self, title="Graphics Window",
                  width=200, height=200, autoflush=True):
         assert type(title) == type(""), "Title must be a string"
-        master = tk.Toplevel(_root)
+        master = tk.Toplevel(_get_root())
         master.protocol("WM_DELETE_WINDOW", self.close)
         tk.Canvas.__init__(self, master, width=width, height=height,
                            highlightthickness=0, bd=0)
@@ -226,12 +238,14 @@ class GraphWin(tk.Canvas):
         self.height = int(height)
         self.width = int(width)
         self.autoflush = autoflush
+        self._queue = None
+        self._batchDepth = 0
         self._mouseCallback = None
         self.trans = None
         self.closed = False
         master.lift()
         self.lastKey = ""
-        if autoflush: _root.update()
+        if autoflush: _get_root().update()
 
     def __repr__(self):
         if self.isClosed():
@@ -283,7 +297,7 @@ class GraphWin(tk.Canvas):
 
     def __autoflush(self):
         if self.autoflush:
-            _root.update()
+            _get_root().update()
 
     
     def plot(self, x, y, color="black"):
@@ -303,11 +317,61 @@ class GraphWin(tk.Canvas):
     def flush(self):
         """Update drawing to the window"""
         self.__checkOpen()
+        self._flushQueue()
         self.update_idletasks()
+
+    @contextmanager
+    def batch(self, rate=None):
+        """Queue drawing and configuration changes made inside the
+        block and apply them in one Tk update when it ends. Objects
+        drawn in the block are created then, and several changes to
+        one object become a single itemconfig. Blocks may be nested;
+        only the outermost one flushes, at most rate times a second."""
+        self.__checkOpen()
+        if self._batchDepth == 0:
+            self._queue = {}
+            self._savedAutoflush = self.autoflush
+            self.autoflush = False
+        self._batchDepth += 1
+        try:
+            yield self
+        finally:
+            self._batchDepth -= 1
+            if self._batchDepth == 0:
+                self.autoflush = self._savedAutoflush
+                if not self.closed:
+                    self.flushFrame(rate)
+                self._queue = None
+
+    def flushFrame(self, rate=None):
+        """Apply queued changes and draw one frame, pausing so that
+        frames are drawn at most rate times a second"""
+        self.__checkOpen()
+        self._flushQueue()
+        update(rate)
+
+    def _queueItem(self, item, draw):
+        # Returns True if item was queued because a batch is open
+        if self._queue is None:
+            return False
+        if draw or item not in self._queue:
+            self._queue[item] = draw
+        return True
+
+    def _flushQueue(self):
+        if not self._queue:
+            return
+        queue, self._queue = self._queue, {}
+        for item, draw in queue.items():
+            if draw:
+                item.id = item._draw(self, item.config)
+            else:
+                self.itemconfig(item.id, item.config)
         
     def getMouse(self):
         """Wait for mouse click and return Point object representing
         the click"""
+        self._flushQueue()
         self.update()      # flush any prior clicks
         self.mouseX = None
         self.mouseY = None
@@ -325,6 +389,7 @@ class GraphWin(tk.Canvas):
         not been clicked since last call"""
         if self.isClosed():
             raise GraphicsError("checkMouse in closed window")
+        self._flushQueue()
         self.update()
         if self.mouseX != None and self.mouseY != None:
             x,y = self.toWorld(self.mouseX, self.mouseY)
@@ -336,6 +401,7 @@ class GraphWin(tk.Canvas):
 
     def getKey(self):
         """Wait for user to press a key and return it as a string."""
+        self._flushQueue()
         self.lastKey = ""
         while self.lastKey == "":
             self.update()
@@ -350,6 +416,7 @@ class GraphWin(tk.Canvas):
         """Return last key pressed or None if no key pressed since last call"""
         if self.isClosed():
             raise GraphicsError("checkKey in closed window")
+        self._flushQueue()
         self.update()
         key = self.lastKey
         self.lastKey = ""
@@ -481,10 +548,12 @@ class GraphicsObject:
         if self.canvas and not self.canvas.isClosed(): raise GraphicsError(OBJ_ALREADY_DRAWN)
         if graphwin.isClosed(): raise GraphicsError("Can't draw to closed window")
         self.canvas = graphwin
-        self.id = self._draw(graphwin, self.config)
         graphwin.addItem(self)
+        if graphwin._queueItem(self, True):
+            return self
+        self.id = self._draw(graphwin, self.config)
         if graphwin.autoflush:
-            _root.update()
+            _get_root().update()
         return self
 
             
@@ -495,10 +564,14 @@ class GraphicsObject:
         
         if not self.canvas: return
         if not self.canvas.isClosed():
-            self.canvas.delete(self.id)
+            queue = self.canvas._queue
+            if queue and self in queue:
+                del queue[self]
+            if self.id is not None:
+                self.canvas.delete(self.id)
             self.canvas.delItem(self)
             if self.canvas.autoflush:
-                _root.update()
+                _get_root().update()
         self.canvas = None
         self.id = None
 
@@ -510,7 +583,7 @@ class GraphicsObject:
         
         self._move(dx,dy)
         canvas = self.canvas
-        if canvas and not canvas.isClosed():
+        if canvas and not canvas.isClosed() and self.id is not None:
             trans = canvas.trans
             if trans:
                 x = dx/ trans.xscale 
@@ -520,7 +593,7 @@ class GraphicsObject:
                 y = dy
             self.canvas.move(self.id, x, y)
             if canvas.autoflush:
-                _root.update()
+                _get_root().update()
            
     def _reconfig(self, option, setting):
         # Internal method for changing configuration of the object
@@ -531,9 +604,11 @@ class GraphicsObject:
         options = self.config
         options[option] = setting
         if self.canvas and not self.canvas.isClosed():
+            if self.canvas._queueItem(self, False):
+                return
             self.canvas.itemconfig(self.id, options)
             if self.canvas.autoflush:
-                _root.update()
+                _get_root().update()
 
 
     def _draw(self, canvas, options):
@@ -787,7 +862,7 @@ class Entry(GraphicsObject):
         self.anchor = p.clone()
         #print self.anchor
         self.width = width
-        self.text = tk.StringVar(_root)
+        self.text = tk.StringVar(_get_root())
         self.text.set("")
         self.fill = "gray"
         self.color = "black"
@@ -882,10 +957,10 @@ class Image(GraphicsObject):
         self.imageId = Image.idCount
         Image.idCount = Image.idCount + 1
         if len(pixmap) == 1: # file name provided
-            self.img = tk.PhotoImage(file=pixmap[0], master=_root)
+            self.img = tk.PhotoImage(file=pixmap[0], master=_get_root())
         else: # width and height provided
             width, height = pixmap
-            self.img = tk.PhotoImage(master=_root, width=width, height=height)
+            self.img = tk.PhotoImage(master=_get_root(), width=width, height=height)
 
     def __repr__(self):
         return "Image({}, {}, {})".format(self.anchor, self.getWidth(), self.getHeight())
@@ -1008,8 +1083,5 @@ def test():
 #MacOS fix 2
 #tk.Toplevel(_root).destroy()
 
-# MacOS fix 1
-update()
-
 if __name__ == "__main__":
     test()
\ No newline at end of file
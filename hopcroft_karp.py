@@ -0,0 +1,73 @@
+from collections import deque
+from typing import List, Dict, Iterable
+
+INFINITY = float('inf')
+
+
+def hopcroft_karp_phase(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], left: Iterable[int]) -> List[List[int]]:
+    """
+    Runs one Hopcroft-Karp phase on a bipartite graph.
+
+    A BFS from every free left vertex layers the graph by alternating distance, then an iterative
+    DFS over the layers collects a maximal set of vertex-disjoint shortest augmenting paths.
+    Each phase costs O(E) and O(sqrt(V)) phases are needed.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, mapping each matched vertex to its partner.
+            It is not modified; the caller augments along the returned paths.
+        left (Iterable[int]): The vertices of one side of the bipartition.
+
+    Returns:
+        List[List[int]]: Vertex-disjoint augmenting paths, each starting at a free left vertex.
+        An empty list means the matching is already maximum.
+    """
+    roots = [vertex for vertex in left if vertex not in mate]
+    distance = {root: 0 for root in roots}
+    queue = deque(roots)
+    shortest = INFINITY
+    while queue:
+        vertex = queue.popleft()
+        if distance[vertex] >= shortest:
+            continue
+        for neighbor in adjacency[vertex]:
+            partner = mate.get(neighbor)
+            if partner is None:
+                shortest = min(shortest, distance[vertex] + 1)
+            elif partner not in distance:
+                distance[partner] = distance[vertex] + 1
+                queue.append(partner)
+    if shortest == INFINITY:
+        return []
+
+    paths = []
+    visited = set()
+    used = set()
+    for root in roots:
+        visited.add(root)
+        stack = [(root, iter(adjacency[root]))]
+        rights = []
+        while stack:
+            vertex, neighbors = stack[-1]
+            for neighbor in neighbors:
+                partner = mate.get(neighbor)
+                if partner is None:
+                    if neighbor in used or distance[vertex] + 1 != shortest:
+                        continue
+                    used.add(neighbor)
+                    path = []
+                    for (left_vertex, _), right_vertex in zip(stack, rights + [neighbor]):
+                        path.extend((left_vertex, right_vertex))
+                    paths.append(path)
+                    stack = []
+                    break
+                if partner not in visited and distance.get(partner) == distance[vertex] + 1:
+                    visited.add(partner)
+                    rights.append(neighbor)
+                    stack.append((partner, iter(adjacency[partner])))
+                    break
+            else:
+                stack.pop()
+                if rights:
+                    rights.pop()
+    return paths
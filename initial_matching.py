@@ -0,0 +1,128 @@
+from typing import List, Dict, Iterable, Tuple
+
+
+def greedy_matching(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int]) -> List[Tuple[int, int]]:
+    """
+    Matches every free vertex, in order, to its first free neighbour.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, extended in place.
+
+    Returns:
+        List[Tuple[int, int]]: The edges added to the matching.
+    """
+    added = []
+    for vertex in adjacency:
+        if vertex in mate:
+            continue
+        for neighbor in adjacency[vertex]:
+            if neighbor != vertex and neighbor not in mate:
+                mate[vertex], mate[neighbor] = neighbor, vertex
+                added.append((vertex, neighbor))
+                break
+    return added
+
+def min_degree_matching(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int]) -> List[Tuple[int, int]]:
+    """
+    Repeatedly matches a free vertex of minimum remaining degree to its free neighbour of minimum degree.
+
+    Degrees only count free neighbours and are kept in buckets, so the whole pass is O(V + E).
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, extended in place.
+
+    Returns:
+        List[Tuple[int, int]]: The edges added to the matching.
+    """
+    degree = free_degrees(adjacency, mate)
+    buckets = [[] for _ in range(max(degree.values(), default=0) + 1)]
+    for vertex, vertex_degree in degree.items():
+        buckets[vertex_degree].append(vertex)
+
+    def match(vertex1: int, vertex2: int) -> int:
+        mate[vertex1], mate[vertex2] = vertex2, vertex1
+        added.append((vertex1, vertex2))
+        lowest = len(buckets)
+        for vertex in (vertex1, vertex2):
+            for neighbor in adjacency[vertex]:
+                if neighbor not in mate:
+                    degree[neighbor] -= 1
+                    buckets[degree[neighbor]].append(neighbor)
+                    lowest = min(lowest, degree[neighbor])
+        return lowest
+
+    added = []
+    current = 1
+    while current < len(buckets):
+        if not buckets[current]:
+            current += 1
+            continue
+        vertex = buckets[current].pop()
+        if vertex in mate or degree[vertex] != current:
+            continue
+        partner = min((neighbor for neighbor in adjacency[vertex] if neighbor != vertex and neighbor not in mate),
+                      key=degree.__getitem__)
+        current = max(1, min(current, match(vertex, partner)))
+    return added
+
+def karp_sipser_matching(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int]) -> List[Tuple[int, int]]:
+    """
+    Runs the Karp-Sipser heuristic.
+
+    While some free vertex has exactly one free neighbour, that edge belongs to a maximum matching
+    and is taken first. Only when no such vertex is left is an arbitrary free edge matched.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, extended in place.
+
+    Returns:
+        List[Tuple[int, int]]: The edges added to the matching.
+    """
+    degree = free_degrees(adjacency, mate)
+    pendant = [vertex for vertex, vertex_degree in degree.items() if vertex_degree == 1]
+
+    def free_neighbor(vertex: int) -> int:
+        return next(neighbor for neighbor in adjacency[vertex] if neighbor != vertex and neighbor not in mate)
+
+    def match(vertex1: int, vertex2: int):
+        mate[vertex1], mate[vertex2] = vertex2, vertex1
+        added.append((vertex1, vertex2))
+        for vertex in (vertex1, vertex2):
+            for neighbor in adjacency[vertex]:
+                if neighbor not in mate:
+                    degree[neighbor] -= 1
+                    if degree[neighbor] == 1:
+                        pendant.append(neighbor)
+
+    added = []
+    for vertex in degree:
+        while pendant:
+            leaf = pendant.pop()
+            if leaf not in mate and degree[leaf] == 1:
+                match(leaf, free_neighbor(leaf))
+        if vertex not in mate and degree[vertex] > 0:
+            match(vertex, free_neighbor(vertex))
+    return added
+
+def free_degrees(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int]) -> Dict[int, int]:
+    """
+    Counts the free neighbours of every free vertex, ignoring self-loops.
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching.
+
+    Returns:
+        Dict[int, int]: The number of free neighbours of each free vertex.
+    """
+    return {vertex: sum(1 for neighbor in adjacency[vertex] if neighbor != vertex and neighbor not in mate)
+            for vertex in adjacency if vertex not in mate}
+
+INITIALIZERS = {
+    "greedy": greedy_matching,
+    "min_degree": min_degree_matching,
+    "karp_sipser": karp_sipser_matching,
+}
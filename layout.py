@@ -0,0 +1,442 @@
+import math
+from typing import Dict, Optional, Tuple
+from graphHelpers import Graph, two_coloring
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WIDTH = 600
+HEIGHT = 600
+MARGIN = 50
+LAYOUTS = ("auto", "force", "spectral", "circular", "bipartite")
+ITERATIONS = 50
+# Multilevel layouts coarsen graphs down to COARSEST_NODES nodes, stopping early when a level
+# keeps more than COARSENING_RATIO of the nodes of the previous one. Levels above REFINE_NODES
+# nodes take ITERATIONS // REFINE_DIVISOR steps, and all but the coarsest level start at a
+# temperature of REFINE_TEMPERATURE edge lengths.
+COARSEST_NODES = 100
+COARSENING_RATIO = 0.75
+REFINE_DIVISOR = 5
+REFINE_NODES = 3000
+REFINE_TEMPERATURE = 2.0
+SPECTRAL_ITERATIONS = 100
+# Spectral layouts iterate on SPECTRAL_BLOCK vectors and keep the best two.
+SPECTRAL_BLOCK = 6
+# Repulsion is computed exactly for graphs of at most EXACT_NODES vertices, EXACT_BLOCK
+# vertex pairs at a time. Larger graphs use Barnes-Hut grids whose finest level holds about
+# POINTS_PER_CELL vertices per cell, with at most MAX_DEPTH levels.
+EXACT_NODES = 300
+EXACT_BLOCK = 1 << 20
+POINTS_PER_CELL = 4
+MAX_DEPTH = 10
+EPSILON = 1e-12
+
+
+def _require_numpy(name: str):
+    if np is None:
+        raise ImportError(f"{name} needs NumPy")
+
+
+def _edge_arrays(graph: Graph) -> Tuple[list, 'np.ndarray', 'np.ndarray']:
+    # The nodes in order, and the two endpoints of every edge as indexes into that order.
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    count = len(graph.edges)
+    sources = np.fromiter((index[vertex1] for vertex1, _ in graph.edges), np.intp, count)
+    targets = np.fromiter((index[vertex2] for _, vertex2 in graph.edges), np.intp, count)
+    return nodes, sources, targets
+
+
+def circular_layout(graph: Graph) -> Dict[int, Tuple[float, float]]:
+    """
+    Places the nodes on a unit circle in node order, starting at the top and going clockwise.
+
+    Args:
+        graph (Graph): The graph to lay out.
+
+    Returns:
+        Dict[int, Tuple[float, float]]: The position of every node, with y growing downwards as for draw_node.
+    """
+    nodes = list(graph.nodes)
+    step = 2 * math.pi / max(1, len(nodes))
+    return {node: (math.sin(i * step), -math.cos(i * step)) for i, node in enumerate(nodes)}
+
+
+def bipartite_layout(graph: Graph, coloring: Optional[Dict[int, int]] = None) -> Dict[int, Tuple[float, float]]:
+    """
+    Places the two sides of a bipartite graph in two columns.
+
+    The left column keeps the node order and the right one is sorted by the average row of
+    each node's neighbours on the left, which removes most crossings of sparse graphs.
+
+    Args:
+        graph (Graph): The graph to lay out.
+        coloring (Dict[int, int], optional): The side (0 or 1) of every node. Defaults to two_coloring of the graph.
+
+    Returns:
+        Dict[int, Tuple[float, float]]: The position of every node, x being 0 on the left and 1 on the right.
+
+    Raises:
+        ValueError: If no coloring is given and the graph is not bipartite.
+    """
+    if coloring is None:
+        coloring = two_coloring(graph.adjacency)
+        if coloring is None:
+            raise ValueError("The graph is not bipartite")
+    left = [node for node in graph.nodes if coloring[node] == 0]
+    rows = {node: row for row, node in enumerate(left)}
+    right = [node for node in graph.nodes if coloring[node] != 0]
+
+    def barycenter(node):
+        neighbor_rows = [rows[neighbor] for neighbor in graph.neighbors(node) if neighbor in rows]
+        return sum(neighbor_rows) / len(neighbor_rows) if neighbor_rows else -1
+
+    right.sort(key=barycenter)
+    positions = {}
+    for x, column in ((0.0, left), (1.0, right)):
+        for row, node in enumerate(column):
+            positions[node] = (x, (row + 0.5) / len(column))
+    return positions
+
+
+def spectral_layout(graph: Graph, iterations: int = SPECTRAL_ITERATIONS, seed: int = 0) -> Dict[int, Tuple[float, float]]:
+    """
+    Places the nodes by the two eigenvectors of the normalised Laplacian with the smallest non-zero eigenvalues.
+
+    The eigenvectors are approximated by subspace iteration on (I + D^-1/2 A D^-1/2) / 2 with
+    the trivial eigenvector projected out, so every step is a sparse product over the edge
+    arrays and a QR factorisation of an n x SPECTRAL_BLOCK matrix. Subspace iteration alone
+    converges slowly on large sparse graphs, so as in ACE it runs on the levels of matching
+    coarsenings used by fruchterman_reingold_layout: the coarsest level starts from random
+    vectors and every finer level refines the vectors of its merged nodes.
+
+    Args:
+        graph (Graph): The graph to lay out.
+        iterations (int, optional): Number of subspace iterations on the coarsest level. Finer
+            levels take iterations // REFINE_DIVISOR.
+        seed (int, optional): Seed for the starting vectors.
+
+    Returns:
+        Dict[int, Tuple[float, float]]: The position of every node, within about a unit square.
+    """
+    _require_numpy("spectral_layout")
+    nodes, sources, targets = _edge_arrays(graph)
+    count = len(nodes)
+    if count <= 2:
+        return circular_layout(graph)
+    rng = np.random.default_rng(seed)
+    levels = _hierarchy(count, sources, targets, rng)
+    coordinates = None
+    for level in range(len(levels) - 1, -1, -1):
+        level_count, level_sources, level_targets, _ = levels[level]
+        degree = (np.bincount(level_sources, minlength=level_count) + np.bincount(level_targets, minlength=level_count)).astype(float)
+        scale = 1 / np.sqrt(np.maximum(degree, 1))
+        trivial = np.sqrt(degree) / max(np.linalg.norm(np.sqrt(degree)), EPSILON)
+        if coordinates is None:
+            vectors, steps = rng.standard_normal((level_count, SPECTRAL_BLOCK)), iterations
+        else:
+            # Eigenvectors of the random walk D^-1 A are about constant on merged nodes.
+            vectors, steps = coordinates[levels[level + 1][3]] / scale[:, None], max(1, iterations // REFINE_DIVISOR)
+        for _ in range(steps):
+            vectors -= np.outer(trivial, trivial @ vectors)
+            vectors, _ = np.linalg.qr(_shifted_product(vectors, level_sources, level_targets, scale))
+        # Rayleigh-Ritz: the block is reordered by the eigenvectors of its projection, best first.
+        _, ritz = np.linalg.eigh(vectors.T @ _shifted_product(vectors, level_sources, level_targets, scale))
+        coordinates = (vectors @ ritz[:, ::-1]) * scale[:, None]
+    coordinates = coordinates[:, :2]
+    coordinates /= max(np.abs(coordinates).max(), EPSILON)
+    return dict(zip(nodes, map(tuple, coordinates.tolist())))
+
+
+def _shifted_product(vectors: 'np.ndarray', sources: 'np.ndarray', targets: 'np.ndarray', scale: 'np.ndarray') -> 'np.ndarray':
+    # (I + D^-1/2 A D^-1/2) / 2 times every column, with scale = D^-1/2.
+    count = len(vectors)
+    scaled = vectors * scale[:, None]
+    product = np.empty_like(vectors)
+    for column in range(vectors.shape[1]):
+        product[:, column] = (np.bincount(sources, scaled[targets, column], count)
+                              + np.bincount(targets, scaled[sources, column], count))
+    return (vectors + product * scale[:, None]) / 2
+
+
+def fruchterman_reingold_layout(graph: Graph, iterations: int = ITERATIONS, positions: Optional[Dict[int, Tuple[float, float]]] = None,
+                                seed: int = 0, exact: Optional[bool] = None, multilevel: Optional[bool] = None) -> Dict[int, Tuple[float, float]]:
+    """
+    Places the nodes with the force-directed algorithm of Fruchterman and Reingold.
+
+    Nodes repel each other with force k^2 / d and edges pull their endpoints together with
+    force d^2 / k, where k is the ideal edge length. Every step moves each node along its total
+    force by at most a temperature that cools linearly to zero. All forces are computed on
+    NumPy arrays. Above EXACT_NODES nodes the repulsion is approximated Barnes-Hut style, see
+    _grid_repulsion, so a step costs O(n + m) instead of O(n^2).
+
+    Large graphs are laid out on several levels, as in sfdp: the graph is repeatedly coarsened
+    by merging the endpoints of a maximal matching until at most COARSEST_NODES nodes are left,
+    and every finer level starts from the positions of its merged nodes. Levels of up to
+    REFINE_NODES nodes get the full number of steps, larger ones iterations // REFINE_DIVISOR.
+
+    Args:
+        graph (Graph): The graph to lay out.
+        iterations (int, optional): Number of steps.
+        positions (Dict[int, Tuple[float, float]], optional): Starting positions, e.g. from
+            spectral_layout. Nodes without one start at random positions.
+        seed (int, optional): Seed for the random starting positions and the coarsening.
+        exact (bool, optional): Whether to compute the repulsion exactly. Defaults to levels of
+            at most EXACT_NODES nodes.
+        multilevel (bool, optional): Whether to lay out on several levels. Defaults to graphs of
+            more than COARSEST_NODES nodes without starting positions.
+
+    Returns:
+        Dict[int, Tuple[float, float]]: The position of every node, with edges about one unit long.
+    """
+    _require_numpy("fruchterman_reingold_layout")
+    nodes, sources, targets = _edge_arrays(graph)
+    count = len(nodes)
+    if count == 0:
+        return {}
+    rng = np.random.default_rng(seed)
+    if multilevel if multilevel is not None else count > COARSEST_NODES and not positions:
+        levels = _hierarchy(count, sources, targets, rng)
+        coarsest = levels[-1][0]
+        points = rng.uniform(0, math.sqrt(coarsest), (coarsest, 2))
+        _force_steps(points, *levels[-1][1:3], iterations, math.sqrt(coarsest) / 10, exact)
+        for level in range(len(levels) - 2, -1, -1):
+            level_count, level_sources, level_targets, _ = levels[level]
+            groups = levels[level + 1][3]
+            # Merged nodes start next to each other; the scale keeps the density of the coarser level.
+            points = points[groups] * math.sqrt(level_count / len(points)) + rng.uniform(-0.1, 0.1, (level_count, 2))
+            steps = iterations if level_count <= REFINE_NODES else max(1, iterations // REFINE_DIVISOR)
+            _force_steps(points, level_sources, level_targets, steps, REFINE_TEMPERATURE, exact)
+        return dict(zip(nodes, map(tuple, points.tolist())))
+    side = math.sqrt(count)
+    points = rng.uniform(0, side, (count, 2))
+    if positions:
+        known = np.array([node in positions for node in nodes])
+        given = np.array([positions[node] for node in nodes if node in positions], dtype=float)
+        low, extent = given.min(0), max(np.ptp(given, 0).max(), EPSILON)
+        # Jitter separates nodes given the same position, which would never repel each other.
+        points[known] = (given - low) * (side / extent) + rng.uniform(-1e-3, 1e-3, given.shape)
+    _force_steps(points, sources, targets, iterations, side / 10, exact)
+    return dict(zip(nodes, map(tuple, points.tolist())))
+
+
+def _force_steps(points: 'np.ndarray', sources: 'np.ndarray', targets: 'np.ndarray', iterations: int,
+                 temperature: float, exact: Optional[bool]):
+    # Moves the points in place by iterations Fruchterman-Reingold steps with k = 1.
+    count = len(points)
+    exact = count <= EXACT_NODES if exact is None else exact
+    for step in range(iterations):
+        forces = _exact_repulsion(points) if exact else _grid_repulsion(points)
+        delta = points[sources] - points[targets]
+        pull = delta * np.hypot(delta[:, 0], delta[:, 1])[:, None]
+        for axis in range(2):
+            forces[:, axis] += np.bincount(targets, pull[:, axis], count) - np.bincount(sources, pull[:, axis], count)
+        length = np.maximum(np.hypot(forces[:, 0], forces[:, 1]), EPSILON)
+        limit = temperature * (1 - step / iterations)
+        points += forces * (np.minimum(length, limit) / length)[:, None]
+
+
+def _hierarchy(count: int, sources: 'np.ndarray', targets: 'np.ndarray', rng) -> list:
+    # The graph and its coarsenings down to COARSEST_NODES nodes, as the tuples of _coarsen.
+    levels = [(count, sources, targets, None)]
+    while levels[-1][0] > COARSEST_NODES:
+        coarse = _coarsen(*levels[-1][:3], rng)
+        if coarse[0] > COARSENING_RATIO * levels[-1][0]:
+            break
+        levels.append(coarse)
+    return levels
+
+
+def _coarsen(count: int, sources: 'np.ndarray', targets: 'np.ndarray', rng) -> Tuple[int, 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+    # Merges the endpoints of a greedy maximal matching, taken over the edges in random order.
+    # Returns the coarse node count, the coarse edges without loops and duplicates, and the
+    # coarse node of every node.
+    mate = list(range(count))
+    source_list, target_list = sources.tolist(), targets.tolist()
+    for edge in rng.permutation(len(source_list)).tolist():
+        vertex1, vertex2 = source_list[edge], target_list[edge]
+        if mate[vertex1] == vertex1 and mate[vertex2] == vertex2 and vertex1 != vertex2:
+            mate[vertex1], mate[vertex2] = vertex2, vertex1
+    representatives = np.minimum(np.arange(count), np.array(mate, dtype=np.intp))
+    _, groups = np.unique(representatives, return_inverse=True)
+    coarse_count = int(groups.max()) + 1
+    coarse_sources, coarse_targets = groups[sources], groups[targets]
+    kept = coarse_sources != coarse_targets
+    keys = np.unique(np.minimum(coarse_sources, coarse_targets)[kept] * coarse_count
+                     + np.maximum(coarse_sources, coarse_targets)[kept])
+    return coarse_count, keys // coarse_count, keys % coarse_count, groups
+
+
+def _exact_repulsion(points: 'np.ndarray') -> 'np.ndarray':
+    # The sum of (p - q) / |p - q|^2 over all other nodes q, for every node p.
+    count = len(points)
+    forces = np.empty_like(points)
+    block = max(1, EXACT_BLOCK // count)
+    for start in range(0, count, block):
+        delta_x = points[start:start + block, 0, None] - points[None, :, 0]
+        delta_y = points[start:start + block, 1, None] - points[None, :, 1]
+        scale = 1 / np.maximum(delta_x * delta_x + delta_y * delta_y, EPSILON)
+        forces[start:start + block, 0] = np.einsum("ij,ij->i", delta_x, scale)
+        forces[start:start + block, 1] = np.einsum("ij,ij->i", delta_y, scale)
+    return forces
+
+
+def _grid_repulsion(points: 'np.ndarray') -> 'np.ndarray':
+    """
+    Approximates _exact_repulsion in O(n) on a hierarchy of square grids, 2^l cells wide at level l.
+
+    As in Barnes-Hut, far away nodes are replaced by the centre of mass of their cell. Level l
+    handles, for every cell, the cells that are not its neighbours but whose parents are
+    neighbours of its parent, which every level does at once as masked sums over 6 x 6 windows
+    of the grid. The force of these cells is expanded to first order around the centre of the
+    target cell and the expansions are passed down to the children, so each node reads one
+    expansion at the finest level. Pairs of nodes in the same or neighbouring finest cells are
+    handled exactly.
+    """
+    count = len(points)
+    depth = max(2, min(MAX_DEPTH, math.ceil(math.log(max(count / POINTS_PER_CELL, 1), 4))))
+    size = 1 << depth
+    low = points.min(0)
+    cell = max(np.ptp(points, 0).max(), EPSILON) * (1 + 1e-9) / size
+    cells = np.minimum(((points - low) / cell).astype(np.intp), size - 1)
+    flat = cells[:, 0] * size + cells[:, 1]
+    forces = _near_repulsion(points, flat, cells, size)
+
+    masses = [np.bincount(flat, minlength=size * size).reshape(size, size).astype(float)]
+    sums_x = [np.bincount(flat, points[:, 0], size * size).reshape(size, size)]
+    sums_y = [np.bincount(flat, points[:, 1], size * size).reshape(size, size)]
+    for _ in range(depth - 2):
+        for grids in (masses, sums_x, sums_y):
+            half = len(grids[-1]) // 2
+            grids.append(grids[-1].reshape(half, 2, half, 2).sum((1, 3)))
+    # masks[p, q] selects the sources of the target cells at row parity p and column parity q
+    # within the 6 x 6 window around their 2 x 2 block.
+    offsets = np.arange(6) - 2
+    far = np.abs(offsets[None, :] - np.arange(2)[:, None]) > 1
+    masks = far[:, None, :, None] | far[None, :, None, :]
+
+    expansion = None
+    for level in range(2, depth + 1):
+        mass, sum_x, sum_y = masses[depth - level], sums_x[depth - level], sums_y[depth - level]
+        width = cell * (1 << (depth - level))
+        grid = len(mass)
+        centre_x = np.divide(sum_x, mass, out=np.zeros_like(sum_x), where=mass > 0)
+        centre_y = np.divide(sum_y, mass, out=np.zeros_like(sum_y), where=mass > 0)
+        windows = [np.lib.stride_tricks.sliding_window_view(np.pad(values, 2), (6, 6))[::2, ::2].astype(np.float32)
+                   for values in (mass, centre_x - low[0], centre_y - low[1])]
+        level_expansion = np.empty((4, grid, grid))
+        for row in range(2):
+            for column in range(2):
+                target_x = ((np.arange(row, grid, 2) + 0.5) * width).astype(np.float32)
+                target_y = ((np.arange(column, grid, 2) + 0.5) * width).astype(np.float32)
+                delta_x = target_x[:, None, None, None] - windows[1]
+                delta_y = target_y[None, :, None, None] - windows[2]
+                square_x, square_y = delta_x * delta_x, delta_y * delta_y
+                distance = np.maximum(square_x + square_y, EPSILON)
+                weight = windows[0] * masks[row, column] / distance
+                curvature = weight / distance
+                square_y -= square_x
+                level_expansion[:, row::2, column::2] = (
+                    np.einsum("abij,abij->ab", weight, delta_x), np.einsum("abij,abij->ab", weight, delta_y),
+                    np.einsum("abij,abij->ab", curvature, square_y),
+                    -2 * np.einsum("abij,abij,abij->ab", curvature, delta_x, delta_y))
+        if expansion is not None:
+            parent = expansion.repeat(2, 1).repeat(2, 2)
+            shift_x = ((np.arange(grid) % 2 - 0.5) * width)[:, None]
+            shift_y = ((np.arange(grid) % 2 - 0.5) * width)[None, :]
+            level_expansion[0] += parent[0] + parent[2] * shift_x + parent[3] * shift_y
+            level_expansion[1] += parent[1] + parent[3] * shift_x - parent[2] * shift_y
+            level_expansion[2:] += parent[2:]
+        expansion = level_expansion
+
+    force_x, force_y, stretch, shear = expansion[:, cells[:, 0], cells[:, 1]]
+    offset = points - low - (cells + 0.5) * cell
+    forces[:, 0] += force_x + stretch * offset[:, 0] + shear * offset[:, 1]
+    forces[:, 1] += force_y + shear * offset[:, 0] - stretch * offset[:, 1]
+    return forces
+
+
+def _near_repulsion(points: 'np.ndarray', flat: 'np.ndarray', cells: 'np.ndarray', size: int) -> 'np.ndarray':
+    # Exact repulsion between the nodes of the same or neighbouring cells. Nodes are sorted by
+    # cell, and every pair is generated once: within a cell, and towards the four neighbours
+    # (1, -1), (1, 0), (1, 1) and (0, 1).
+    count = len(points)
+    order = np.argsort(flat)
+    occupancy = np.bincount(flat, minlength=size * size)
+    starts = np.cumsum(occupancy) - occupancy
+    rank = np.empty(count, np.intp)
+    rank[order] = np.arange(count)
+    lefts, rights = [], []
+    for offset_x, offset_y in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        if (offset_x, offset_y) == (0, 0):
+            first = rank + 1
+            pairs = starts[flat] + occupancy[flat] - first
+            nodes = np.arange(count)
+        else:
+            x, y = cells[:, 0] + offset_x, cells[:, 1] + offset_y
+            nodes = np.flatnonzero((x < size) & (y >= 0) & (y < size))
+            neighbour = x[nodes] * size + y[nodes]
+            first, pairs = starts[neighbour], occupancy[neighbour]
+        ends = np.cumsum(pairs)
+        lefts.append(np.repeat(nodes, pairs))
+        rights.append(order[np.repeat(first - ends + pairs, pairs) + np.arange(ends[-1] if len(ends) else 0)])
+    left, right = np.concatenate(lefts), np.concatenate(rights)
+    delta_x = points[:, 0][left] - points[:, 0][right]
+    delta_y = points[:, 1][left] - points[:, 1][right]
+    scale = 1 / np.maximum(delta_x * delta_x + delta_y * delta_y, EPSILON)
+    delta_x *= scale
+    delta_y *= scale
+    forces = np.empty_like(points)
+    forces[:, 0] = np.bincount(left, delta_x, count) - np.bincount(right, delta_x, count)
+    forces[:, 1] = np.bincount(left, delta_y, count) - np.bincount(right, delta_y, count)
+    return forces
+
+
+def scale_layout(positions: Dict[int, Tuple[float, float]], width: float = WIDTH, height: float = HEIGHT,
+                 margin: float = MARGIN) -> Dict[int, Tuple[float, float]]:
+    """
+    Scales and centres a layout into a width x height box, keeping its aspect ratio.
+
+    Returns:
+        Dict[int, Tuple[float, float]]: The positions in pixels, ready for draw_node.
+    """
+    if not positions:
+        return {}
+    xs = [x for x, _ in positions.values()]
+    ys = [y for _, y in positions.values()]
+    span_x, span_y = max(xs) - min(xs), max(ys) - min(ys)
+    scale = min((width - 2 * margin) / span_x if span_x else math.inf,
+                (height - 2 * margin) / span_y if span_y else math.inf)
+    if scale == math.inf:
+        scale = 1.0
+    offset_x = (width - span_x * scale) / 2 - min(xs) * scale
+    offset_y = (height - span_y * scale) / 2 - min(ys) * scale
+    return {node: (x * scale + offset_x, y * scale + offset_y) for node, (x, y) in positions.items()}
+
+
+def layout_graph(graph: Graph, method: str = "auto", width: float = WIDTH, height: float = HEIGHT,
+                 margin: float = MARGIN, **options) -> Dict[int, Tuple[float, float]]:
+    """
+    Lays out a graph and scales it into a width x height box, giving positions for draw_node.
+
+    Args:
+        graph (Graph): The graph to lay out.
+        method (str, optional): "force" (fruchterman_reingold_layout), "spectral", "circular" or
+            "bipartite". "auto" (default) uses "force" when NumPy is installed and "circular" otherwise.
+        width (float, optional): Width of the box.
+        height (float, optional): Height of the box.
+        margin (float, optional): Space left free on every side of the box.
+        **options: Passed to the layout function, e.g. iterations or seed.
+
+    Returns:
+        Dict[int, Tuple[float, float]]: The position of every node, in pixels.
+    """
+    if method not in LAYOUTS:
+        raise ValueError(f"Unknown layout {method!r}, expected one of {', '.join(LAYOUTS)}")
+    if method == "auto":
+        method = "force" if np is not None else "circular"
+    layout = {"force": fruchterman_reingold_layout, "spectral": spectral_layout,
+              "circular": circular_layout, "bipartite": bipartite_layout}[method]
+    return scale_layout(layout(graph, **options), width, height, margin)
@@ -0,0 +1,154 @@
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+EVENTS = ("phase_started", "phase_finished", "augmentation_started", "augmentation_finished", "edge_matched",
+          "edge_unmatched", "blossom_contracted", "blossom_expanded", "vertex_labelled", "edge_scanned")
+
+
+class MatchingListener:
+    """
+    Receives the events of a matching computation. Every method does nothing; subclasses override
+    the events they care about.
+
+    compute_maximum_matching reports phases and augmentations for every engine. The search
+    engines report what they can see: "edmonds" labels vertices, scans edges and contracts
+    blossoms, "contraction" also expands them, and "micali_vazirani" contracts petals. Blossoms
+    kept in place by union-find are never expanded one by one; they dissolve when the phase ends.
+
+    Attributes:
+        search_events (bool): Whether the engines send vertex_labelled and edge_scanned, by far the
+            most frequent events. A listener that ignores them sets it to False to spare their cost.
+    """
+
+    search_events = True
+
+    def phase_started(self, engine: str):
+        """
+        A search for augmenting paths starts.
+        """
+
+    def phase_finished(self, engine: str, paths: int):
+        """
+        A search ended after finding the given number of vertex-disjoint augmenting paths.
+        """
+
+    def augmentation_started(self, path: List[int]):
+        """
+        The matching is about to be flipped along an augmenting path.
+        """
+
+    def augmentation_finished(self, path: List[int]):
+        """
+        The matching has been flipped along an augmenting path.
+        """
+
+    def edge_matched(self, vertex1: int, vertex2: int):
+        """
+        An edge entered the matching.
+        """
+
+    def edge_unmatched(self, vertex1: int, vertex2: int):
+        """
+        An edge left the matching.
+        """
+
+    def blossom_contracted(self, base: int, vertices: List[int]):
+        """
+        An odd cycle was shrunk onto its base. vertices are the other vertices it absorbed.
+        """
+
+    def blossom_expanded(self, base: int, vertices: List[int]):
+        """
+        A contracted blossom was opened again to lift an augmenting path through it.
+        """
+
+    def vertex_labelled(self, vertex: int, label: int):
+        """
+        A vertex joined the alternating forest, or changed side, with label EVEN or ODD.
+        """
+
+    def edge_scanned(self, vertex1: int, vertex2: int):
+        """
+        The search looked at an edge from the even vertex vertex1.
+        """
+
+
+class NullListener(MatchingListener):
+    """
+    A listener that ignores every event. The engines recognise it and skip dispatching events
+    altogether, so it costs the same as passing no listener.
+    """
+
+
+class CountingListener(MatchingListener):
+    """
+    Tallies every event and measures the time spent in each phase.
+
+    Attributes:
+        counts (Counter): Number of times every event was received, keyed by method name.
+        phase_times (List[float]): Seconds spent in every phase, in order.
+        engine_times (Dict[str, float]): Total seconds spent in phases, per engine.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.phase_times = []
+        self.engine_times = {}
+        self._phase_start = None
+
+    def phase_started(self, engine: str):
+        self.counts["phase_started"] += 1
+        self._phase_start = time.perf_counter()
+
+    def phase_finished(self, engine: str, paths: int):
+        self.counts["phase_finished"] += 1
+        if self._phase_start is not None:
+            elapsed = time.perf_counter() - self._phase_start
+            self.phase_times.append(elapsed)
+            self.engine_times[engine] = self.engine_times.get(engine, 0.0) + elapsed
+            self._phase_start = None
+
+    def augmentation_started(self, path: List[int]):
+        self.counts["augmentation_started"] += 1
+
+    def augmentation_finished(self, path: List[int]):
+        self.counts["augmentation_finished"] += 1
+
+    def edge_matched(self, vertex1: int, vertex2: int):
+        self.counts["edge_matched"] += 1
+
+    def edge_unmatched(self, vertex1: int, vertex2: int):
+        self.counts["edge_unmatched"] += 1
+
+    def blossom_contracted(self, base: int, vertices: List[int]):
+        self.counts["blossom_contracted"] += 1
+
+    def blossom_expanded(self, base: int, vertices: List[int]):
+        self.counts["blossom_expanded"] += 1
+
+    def vertex_labelled(self, vertex: int, label: int):
+        self.counts["vertex_labelled"] += 1
+
+    def edge_scanned(self, vertex1: int, vertex2: int):
+        self.counts["edge_scanned"] += 1
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Returns:
+            Dict[str, object]: Every event count, zeros included, with the total and per-engine phase times.
+        """
+        summary = {event: self.counts[event] for event in EVENTS}
+        summary["phase_seconds"] = sum(self.phase_times)
+        summary["engine_seconds"] = dict(self.engine_times)
+        return summary
+
+
+def active_listener(listener: Optional[MatchingListener]) -> Optional[MatchingListener]:
+    """
+    Returns the listener events should be sent to, or None when there is nothing to notify,
+    so that the engines can skip building event arguments.
+    """
+    if listener is None or type(listener) is NullListener:
+        return None
+    return listener
@@ -25,19 +25,8 @@ def test_blossom_algorithm():
     # Create a GraphVisualizer instance
     visualizer = GraphVisualizer(600, 600)
 
-    # Draw nodes and edges
-    positions = {
-        0: (100, 100), 
-        1: (200, 100), 
-        2: (300, 100), 
-        3: (100, 200), 
-        4: (200, 200),
-        5: (300, 200)
-    }
-    for node, (x, y) in positions.items():
-        visualizer.draw_node(node, x, y)
-    for edge in graph.edges:
-        visualizer.draw_edge(edge[0], edge[1])
+    # Lay out and draw nodes and edges
+    visualizer.draw_graph(graph)
 
     # Compute the maximum matching
     max_matching = compute_maximum_matching(graph, matching, visualizer)
@@ -0,0 +1,290 @@
+import gzip
+import math
+import struct
+import zlib
+from xml.sax.saxutils import escape
+from typing import BinaryIO, Dict, IO, Iterator, Optional, Tuple, Union
+from graphHelpers import Graph, Matching
+from matching_trace import MATCHED_COLOR, UNMATCHED_COLOR, NODE_COLOR
+
+WIDTH = 1000
+HEIGHT = 1000
+MARGIN = 20
+MAX_NODE_RADIUS = 20
+# Labels are written to SVG pictures of at most MAX_LABELS nodes unless asked otherwise.
+MAX_LABELS = 500
+OUTLINE_COLOR = "black"
+BACKGROUND_COLOR = "white"
+MATCHED_WIDTH = 3
+# Edges written per SVG path element, and image rows compressed at a time for PNG.
+PATH_SEGMENTS = 4096
+ROWS_PER_BLOCK = 256
+COLORS = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+    "red": (255, 0, 0),
+    "yellow": (255, 255, 0),
+    "green": (0, 128, 0),
+    "blue": (0, 0, 255),
+    "gray": (128, 128, 128),
+}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class Raster:
+    """
+    An indexed-colour image held in one bytearray, one byte per pixel and row after row.
+
+    Shapes are drawn as runs of equal pixels: a line touches one run per row or column it
+    crosses, a disc one run per row, and every run is a single slice assignment, so no Python
+    code runs per pixel. The image is written as a PNG whose rows are compressed in blocks.
+    """
+
+    def __init__(self, width: int, height: int, background: str = BACKGROUND_COLOR):
+        """
+        Args:
+            width (int): Width in pixels.
+            height (int): Height in pixels.
+            background (str, optional): The colour every pixel starts with.
+        """
+        self.width = width
+        self.height = height
+        self.palette = []
+        self.indices = {}
+        self.pixels = bytearray([self.color_index(background)]) * (width * height)
+
+    def color_index(self, color: str) -> int:
+        """
+        Returns the palette index of a colour name from COLORS or a "#rrggbb" string, adding it if needed.
+        """
+        index = self.indices.get(color)
+        if index is None:
+            if len(self.palette) == 256:
+                raise ValueError("A PNG palette holds at most 256 colours")
+            index = self.indices[color] = len(self.palette)
+            self.palette.append(parse_color(color))
+        return index
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, color: str, thickness: int = 1):
+        """
+        Draws a segment between two pixel positions, thickness pixels wide across its main direction.
+        """
+        value = self.color_index(color)
+        if abs(x2 - x1) >= abs(y2 - y1):
+            self._runs(x1, y1, x2, y2, value, thickness, self.width, self.height, 1, self.width)
+        else:
+            self._runs(y1, x1, y2, x2, value, thickness, self.height, self.width, self.width, 1)
+
+    def _runs(self, u1, v1, u2, v2, value, thickness, u_size, v_size, u_stride, v_stride):
+        # u is the main direction of the segment and v the other one. Every pixel position u
+        # gets the pixel nearest to the segment in v, and positions sharing it form one run.
+        if u1 > u2:
+            u1, v1, u2, v2 = u2, v2, u1, v1
+        slope = (v2 - v1) / (u2 - u1) if u2 != u1 else 0.0
+        first, last = max(0, math.floor(u1 + 0.5)), min(u_size - 1, math.floor(u2 + 0.5))
+        offsets = range(-(thickness // 2), thickness - thickness // 2)
+        pixels = self.pixels
+        u = first
+        while u <= last:
+            v = math.floor(v1 + (u - u1) * slope + 0.5)
+            if slope > 0:
+                end = max(u + 1, math.ceil(u1 + (v + 0.5 - v1) / slope))
+            elif slope < 0:
+                end = max(u + 1, math.floor(u1 + (v - 0.5 - v1) / slope) + 1)
+            else:
+                end = last + 1
+            end = min(end, last + 1)
+            count = end - u
+            run = bytes((value,)) * count
+            for offset in offsets:
+                if 0 <= v + offset < v_size:
+                    start = (v + offset) * v_stride + u * u_stride
+                    pixels[start:start + (count - 1) * u_stride + 1:u_stride] = run
+            u = end
+
+    def disc(self, x: float, y: float, radius: float, color: str):
+        """
+        Fills the pixels within radius of (x, y).
+        """
+        value = self.color_index(color)
+        pixels, width = self.pixels, self.width
+        for row in range(max(0, math.ceil(y - radius)), min(self.height - 1, math.floor(y + radius)) + 1):
+            half = math.sqrt(max(0.0, radius * radius - (row - y) ** 2))
+            left, right = max(0, math.ceil(x - half)), min(width - 1, math.floor(x + half))
+            if left <= right:
+                pixels[row * width + left:row * width + right + 1] = bytes((value,)) * (right - left + 1)
+
+    def write_png(self, file: BinaryIO, level: int = 6):
+        """
+        Writes the image as an 8-bit indexed PNG, compressing ROWS_PER_BLOCK rows at a time.
+        """
+        file.write(PNG_SIGNATURE)
+        write_chunk(file, b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 3, 0, 0, 0))
+        write_chunk(file, b"PLTE", b"".join(bytes(rgb) for rgb in self.palette))
+        compressor = zlib.compressobj(level)
+        width, pixels = self.width, memoryview(self.pixels)
+        for first in range(0, self.height, ROWS_PER_BLOCK):
+            rows = b"".join(b"\x00" + pixels[row * width:(row + 1) * width]
+                            for row in range(first, min(first + ROWS_PER_BLOCK, self.height)))
+            data = compressor.compress(rows)
+            if data:
+                write_chunk(file, b"IDAT", data)
+        write_chunk(file, b"IDAT", compressor.flush())
+        write_chunk(file, b"IEND", b"")
+
+
+def write_chunk(file: BinaryIO, kind: bytes, data: bytes):
+    file.write(struct.pack(">I", len(data)))
+    file.write(kind)
+    file.write(data)
+    file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def parse_color(color: str) -> Tuple[int, int, int]:
+    """
+    Returns the red, green and blue values of a colour name from COLORS or a "#rrggbb" string.
+    """
+    if color in COLORS:
+        return COLORS[color]
+    if len(color) == 7 and color.startswith("#"):
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    raise ValueError(f"Unknown colour {color!r}")
+
+
+def fit_positions(positions: Dict[int, Tuple[float, float]], width: int, height: int,
+                  node_radius: Optional[float] = None) -> Tuple[Dict[int, Tuple[float, float]], float]:
+    """
+    Scales and centres node positions, given with y growing downwards as for draw_node, into a picture.
+
+    Args:
+        positions (Dict[int, Tuple[float, float]]): The position of every node.
+        width (int): Width of the picture.
+        height (int): Height of the picture.
+        node_radius (float, optional): Radius of the nodes in the picture. Defaults to a third of
+            the average spacing between nodes, at most MAX_NODE_RADIUS.
+
+    Returns:
+        Tuple[Dict, float]: The positions in the picture and the node radius.
+    """
+    if not positions:
+        return {}, node_radius or 0.0
+    xs = [x for x, _ in positions.values()]
+    ys = [y for _, y in positions.values()]
+    left, top = min(xs), min(ys)
+    span_x, span_y = max(xs) - left, max(ys) - top
+    # Pictures narrower than the margins keep at least one pixel to draw in.
+    usable_width, usable_height = max(1, width - 2 * MARGIN), max(1, height - 2 * MARGIN)
+    if node_radius is None:
+        node_radius = max(0.5, min(MAX_NODE_RADIUS, math.sqrt(usable_width * usable_height / len(positions)) / 3))
+    inner_width, inner_height = max(1.0, usable_width - 2 * node_radius), max(1.0, usable_height - 2 * node_radius)
+    scale = min(inner_width / span_x if span_x else math.inf, inner_height / span_y if span_y else math.inf)
+    if scale == math.inf:
+        scale = 1.0
+    offset_x = (width - span_x * scale) / 2 - left * scale
+    offset_y = (height - span_y * scale) / 2 - top * scale
+    return {node: (x * scale + offset_x, y * scale + offset_y) for node, (x, y) in positions.items()}, node_radius
+
+
+def split_edges(graph: Graph, matching: Matching) -> Tuple[list, list]:
+    """
+    Returns:
+        Tuple[list, list]: The unmatched and the matched edges of the graph, as (vertex1, vertex2) tuples.
+    """
+    mate = matching.mate
+    unmatched, matched = [], []
+    for vertex1, vertex2 in graph.edge_order.values():
+        (matched if mate.get(vertex1) == vertex2 else unmatched).append((vertex1, vertex2))
+    return unmatched, matched
+
+
+def svg_lines(graph: Graph, matching: Matching, positions: Dict[int, Tuple[float, float]], width: int = WIDTH,
+              height: int = HEIGHT, node_radius: Optional[float] = None, labels: Optional[bool] = None) -> Iterator[str]:
+    """
+    Yields an SVG picture of a matching piece by piece: unmatched edges, matched edges on top, then nodes.
+
+    Edges of one colour share path elements of PATH_SEGMENTS segments, so the document stays
+    small and is produced at the speed of string formatting.
+
+    Args:
+        graph (Graph): The graph to draw.
+        matching (Matching): Its matching, drawn in MATCHED_COLOR.
+        positions (Dict[int, Tuple[float, float]]): The position of every node, in any unit.
+        width (int, optional): Width of the picture.
+        height (int, optional): Height of the picture.
+        node_radius (float, optional): See fit_positions.
+        labels (bool, optional): Whether to write node labels. Defaults to pictures of at most MAX_LABELS nodes.
+    """
+    points, radius = fit_positions(positions, width, height, node_radius)
+    unmatched, matched = split_edges(graph, matching)
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+           f'<rect width="100%" height="100%" fill="{BACKGROUND_COLOR}"/>\n')
+    for edges, color, stroke in ((unmatched, UNMATCHED_COLOR, 1), (matched, MATCHED_COLOR, MATCHED_WIDTH)):
+        for first in range(0, len(edges), PATH_SEGMENTS):
+            segments = []
+            for vertex1, vertex2 in edges[first:first + PATH_SEGMENTS]:
+                (x1, y1), (x2, y2) = points[vertex1], points[vertex2]
+                segments.append(f"M{x1:.1f} {y1:.1f}L{x2:.1f} {y2:.1f}")
+            yield f'<path fill="none" stroke="{color}" stroke-width="{stroke}" d="{"".join(segments)}"/>\n'
+    yield f'<g fill="{NODE_COLOR}" stroke="{OUTLINE_COLOR}">\n'
+    for x, y in points.values():
+        yield f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius:.1f}"/>\n'
+    yield "</g>\n"
+    if labels if labels is not None else len(points) <= MAX_LABELS:
+        yield f'<g font-family="helvetica" font-size="{max(1.0, radius * 0.6):.1f}" text-anchor="middle" dominant-baseline="central">\n'
+        for node, (x, y) in points.items():
+            yield f'<text x="{x:.1f}" y="{y:.1f}">{escape(str(node))}</text>\n'
+        yield "</g>\n"
+    yield "</svg>\n"
+
+
+def write_svg(graph: Graph, matching: Matching, positions: Dict[int, Tuple[float, float]], file: Union[str, IO[str]], **options):
+    """
+    Streams the SVG picture of svg_lines to a file. A path ending in ".gz" or ".svgz" is compressed.
+
+    Args:
+        file (str or text file): A path, or an open text stream that the caller closes.
+        **options: width, height, node_radius and labels, as for svg_lines.
+    """
+    lines = svg_lines(graph, matching, positions, **options)
+    if not isinstance(file, str):
+        file.writelines(lines)
+        return
+    with (gzip.open(file, "wt") if file.endswith((".gz", ".svgz")) else open(file, "w")) as stream:
+        stream.writelines(lines)
+
+
+def render_raster(graph: Graph, matching: Matching, positions: Dict[int, Tuple[float, float]], width: int = WIDTH,
+                  height: int = HEIGHT, node_radius: Optional[float] = None) -> Raster:
+    """
+    Draws a matching on a Raster like svg_lines does, without labels.
+    """
+    points, radius = fit_positions(positions, width, height, node_radius)
+    unmatched, matched = split_edges(graph, matching)
+    raster = Raster(width, height)
+    for edges, color, stroke in ((unmatched, UNMATCHED_COLOR, 1), (matched, MATCHED_COLOR, MATCHED_WIDTH)):
+        for vertex1, vertex2 in edges:
+            (x1, y1), (x2, y2) = points[vertex1], points[vertex2]
+            raster.line(x1, y1, x2, y2, color, stroke)
+    for x, y in points.values():
+        if radius >= 2:
+            raster.disc(x, y, radius, OUTLINE_COLOR)
+            raster.disc(x, y, radius - 1, NODE_COLOR)
+        else:
+            raster.disc(x, y, radius, OUTLINE_COLOR)
+    return raster
+
+
+def write_png(graph: Graph, matching: Matching, positions: Dict[int, Tuple[float, float]], file: Union[str, BinaryIO], **options):
+    """
+    Writes a PNG picture of a matching, drawn by render_raster.
+
+    Args:
+        file (str or binary file): A path, or an open binary stream that the caller closes.
+        **options: width, height and node_radius, as for render_raster.
+    """
+    raster = render_raster(graph, matching, positions, **options)
+    if not isinstance(file, str):
+        raster.write_png(file)
+        return
+    with open(file, "wb") as stream:
+        raster.write_png(stream)
@@ -0,0 +1,288 @@
+import gzip
+import json
+import time
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple, Union
+from graphHelpers import ODD
+from listeners import MatchingListener
+
+FORMAT = "blossom-trace"
+VERSION = 1
+# One-letter code of every recorded event, written as the first element of its line.
+EVENT_CODES = {
+    "phase_started": "p",
+    "phase_finished": "f",
+    "augmentation_started": "a",
+    "augmentation_finished": "z",
+    "edge_matched": "m",
+    "edge_unmatched": "u",
+    "blossom_contracted": "b",
+    "blossom_expanded": "x",
+    "vertex_labelled": "l",
+    "edge_scanned": "s",
+}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+# What a recorder writes: "matching" keeps phases, augmentations, matched and unmatched edges and
+# blossoms, "search" adds vertex labels and "scans" adds every edge scan.
+DETAILS = ("matching", "search", "scans")
+BUFFERED_LINES = 4096
+# The colours GraphVisualizer shows for matched and unmatched edges and for odd vertices.
+MATCHED_COLOR = "red"
+UNMATCHED_COLOR = "black"
+ODD_COLOR = "yellow"
+NODE_COLOR = "white"
+FRAMES_PER_SECOND = 10.0
+
+
+class TraceRecorder(MatchingListener):
+    """
+    A listener that writes every event to a JSON-lines trace, one compact array per line.
+
+    The first line is a header object. Every other line is [code, *arguments] with the code
+    from EVENT_CODES, e.g. ["m",3,4] when the edge (3, 4) enters the matching. Lines are
+    buffered and written in blocks, and a path ending in ".gz" is compressed.
+
+    Vertex labels and edge scans outnumber the other events by orders of magnitude, so they are
+    only recorded at the "search" and "scans" levels of detail. At the default level the engines
+    do not send them at all and recording costs a few percent of the run.
+    """
+
+    def __init__(self, file: Union[str, IO[str]], detail: str = "matching", metadata: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            file (str or text file): A path, or an open text stream that the caller closes.
+            detail (str, optional): One of DETAILS.
+            metadata (Dict[str, Any], optional): Extra fields written to the header line.
+        """
+        if detail not in DETAILS:
+            raise ValueError("Unknown detail {!r}, expected one of {}".format(detail, ", ".join(DETAILS)))
+        if isinstance(file, str):
+            self.file = gzip.open(file, "wt") if file.endswith(".gz") else open(file, "w")
+            self.owns_file = True
+        else:
+            self.file = file
+            self.owns_file = False
+        self.lines = []
+        self.events = 0
+        self.encode = json.JSONEncoder(separators=(",", ":")).encode
+        self.detail = detail
+        self.search_events = detail != "matching"
+        self.file.write(self.encode(dict(metadata or {}, format=FORMAT, version=VERSION, detail=detail)) + "\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def record(self, event: list):
+        self.lines.append(self.encode(event))
+        self.events += 1
+        if len(self.lines) >= BUFFERED_LINES:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.file.write("\n".join(self.lines) + "\n")
+            self.lines = []
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self.owns_file:
+            self.file.close()
+
+    def phase_started(self, engine: str):
+        self.record(["p", engine])
+
+    def phase_finished(self, engine: str, paths: int):
+        self.record(["f", engine, paths])
+
+    def augmentation_started(self, path: List[int]):
+        self.record(["a", path])
+
+    def augmentation_finished(self, path: List[int]):
+        self.record(["z", path])
+
+    def edge_matched(self, vertex1: int, vertex2: int):
+        self.record(["m", vertex1, vertex2])
+
+    def edge_unmatched(self, vertex1: int, vertex2: int):
+        self.record(["u", vertex1, vertex2])
+
+    def blossom_contracted(self, base: int, vertices: List[int]):
+        self.record(["b", base, vertices])
+
+    def blossom_expanded(self, base: int, vertices: List[int]):
+        self.record(["x", base, vertices])
+
+    def vertex_labelled(self, vertex: int, label: int):
+        if self.search_events:
+            self.record(["l", vertex, label])
+
+    def edge_scanned(self, vertex1: int, vertex2: int):
+        if self.detail == "scans":
+            self.record(["s", vertex1, vertex2])
+
+
+class TraceReplayer:
+    """
+    Plays a recorded trace on a renderer, such as a GraphVisualizer on which the graph is drawn.
+
+    A frame is one visible change: an edge entering or leaving the matching, or a vertex turning
+    odd. The renderer only needs update_edge(vertex1, vertex2, color) and update_node(vertex, color).
+    Moving to another frame applies the events in between to an in-memory state and sends the
+    renderer only the edges and vertices whose colour differs from what it shows, so seeking
+    and skipping frames cost one update per changed item, not one per event.
+    """
+
+    def __init__(self, events: Union[str, List[list]], renderer: Any):
+        """
+        Args:
+            events (str or List[list]): The path of a trace, or events as returned by read_trace.
+            renderer: Receives update_edge and update_node calls.
+        """
+        if isinstance(events, str):
+            events = list(read_trace(events))
+        self.renderer = renderer
+        self.frames = []
+        self.phase_frames = []
+        for event in events:
+            code = event[0]
+            if code == "m" or code == "u":
+                self.frames.append((event[1], event[2], MATCHED_COLOR if code == "m" else UNMATCHED_COLOR))
+            elif code == "l" and event[2] == ODD:
+                self.frames.append((event[1], None, ODD_COLOR))
+            elif code == "p":
+                self.phase_frames.append(len(self.frames))
+        self.position = 0
+        self.skipped = 0
+        self.shown_edges = {}
+        self.shown_nodes = {}
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def state_at(self, frame: int) -> Tuple[Dict[frozenset, Tuple[int, int, str]], Dict[int, str]]:
+        """
+        Returns:
+            Tuple[Dict, Dict]: The edges and the vertices whose colour the trace changed before the
+            given frame, edges keyed by their endpoint set.
+        """
+        edges, nodes = {}, {}
+        for vertex1, vertex2, color in self.frames[:frame]:
+            if vertex2 is None:
+                nodes[vertex1] = color
+            else:
+                edges[frozenset((vertex1, vertex2))] = (vertex1, vertex2, color)
+        return edges, nodes
+
+    def seek(self, frame: int) -> int:
+        """
+        Shows the state after the first frame frames. Seeking forward only replays the frames in between.
+
+        Returns:
+            int: The number of renderer updates sent.
+        """
+        frame = max(0, min(frame, len(self.frames)))
+        if frame >= self.position:
+            edges, nodes = {}, {}
+            for vertex1, vertex2, color in self.frames[self.position:frame]:
+                if vertex2 is None:
+                    nodes[vertex1] = color
+                else:
+                    edges[frozenset((vertex1, vertex2))] = (vertex1, vertex2, color)
+        else:
+            edges, nodes = self.state_at(frame)
+            for key, (vertex1, vertex2, _) in self.shown_edges.items():
+                edges.setdefault(key, (vertex1, vertex2, UNMATCHED_COLOR))
+            for vertex in self.shown_nodes:
+                nodes.setdefault(vertex, NODE_COLOR)
+        updates = 0
+        for key, (vertex1, vertex2, color) in edges.items():
+            shown = self.shown_edges.get(key)
+            if (shown[2] if shown else UNMATCHED_COLOR) != color:
+                self.renderer.update_edge(vertex1, vertex2, color)
+                self.shown_edges[key] = (vertex1, vertex2, color)
+                updates += 1
+        for vertex, color in nodes.items():
+            if self.shown_nodes.get(vertex, NODE_COLOR) != color:
+                self.renderer.update_node(vertex, color)
+                self.shown_nodes[vertex] = color
+                updates += 1
+        self.position = frame
+        return updates
+
+    def step(self, frames: int = 1) -> int:
+        """
+        Moves forward, or backward for a negative count, by the given number of frames.
+        """
+        return self.seek(self.position + frames)
+
+    def seek_phase(self, phase: int) -> int:
+        """
+        Shows the state at the start of the given phase, counted from 0.
+        """
+        return self.seek(self.phase_frames[phase] if phase < len(self.phase_frames) else len(self.frames))
+
+    def play(self, speed: float = 1.0, fps: float = 30.0, until: Optional[int] = None,
+             clock: Callable[[], float] = time.perf_counter, sleep: Callable[[float], None] = time.sleep) -> int:
+        """
+        Plays the trace in real time from the current frame.
+
+        At speed 1 the trace advances FRAMES_PER_SECOND frames per second. The renderer is
+        refreshed at most fps times per second; when more than one frame is due at a refresh,
+        the frames in between are skipped and only their net change is drawn.
+
+        Args:
+            speed (float, optional): Playback speed; 2 plays twice as fast.
+            fps (float, optional): Maximum number of renderer refreshes per second.
+            until (int, optional): The frame to stop at. Defaults to the end of the trace.
+            clock (Callable, optional): The time source, in seconds.
+            sleep (Callable, optional): Waits for the given number of seconds.
+
+        Returns:
+            int: The number of refreshes drawn. Skipped frames are added to the skipped attribute.
+        """
+        end = len(self.frames) if until is None else min(until, len(self.frames))
+        start_frame, start_time = self.position, clock()
+        refreshes = 0
+        while self.position < end:
+            due = start_frame + int((clock() - start_time) * FRAMES_PER_SECOND * speed) + 1
+            target = min(max(due, self.position + 1), end)
+            self.skipped += target - self.position - 1
+            self.seek(target)
+            refreshes += 1
+            flush = getattr(self.renderer, "flush", None)
+            if flush is not None:
+                flush()
+            if self.position < end:
+                next_frame = (self.position - start_frame) / (FRAMES_PER_SECOND * speed)
+                sleep(max(1.0 / fps, next_frame - (clock() - start_time)))
+        return refreshes
+
+
+def read_trace(path: str) -> Iterator[list]:
+    """
+    Reads the events of a trace written by TraceRecorder, skipping the header line.
+
+    Raises:
+        ValueError: If the file is not a trace of a supported version.
+
+    Yields:
+        list: Every event as [code, *arguments].
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as file:
+        header = json.loads(file.readline() or "{}")
+        if header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} {FORMAT} file")
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+def replay_events(path: str, listener: MatchingListener):
+    """
+    Sends the events of a trace to a listener, e.g. a CountingListener, as if the run happened again.
+    """
+    for event in read_trace(path):
+        getattr(listener, EVENT_NAMES[event[0]])(*event[1:])
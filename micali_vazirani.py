@@ -0,0 +1,418 @@
+from collections import defaultdict
+from typing import List, Dict, Iterable, Tuple, Optional
+from listeners import MatchingListener, active_listener
+
+RED, GREEN = 0, 1
+INFINITY = float('inf')
+
+
+def micali_vazirani_phase(adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], stats: Optional[Dict[str, int]] = None,
+                          listener: Optional[MatchingListener] = None) -> List[List[int]]:
+    """
+    Runs one Micali-Vazirani search phase.
+
+    The phase finds a maximal set of vertex-disjoint shortest augmenting paths with respect to
+    the given matching. Each phase costs O(E) and only O(sqrt(V)) phases are needed, so repeating
+    phases until one returns no path computes a maximum matching in O(E * sqrt(V)).
+
+    Args:
+        adjacency (Dict[int, Iterable[int]]): Neighbours of every vertex.
+        mate (Dict[int, int]): The current matching, mapping each matched vertex to its partner.
+            It is not modified; the caller augments along the returned paths.
+        stats (Dict[str, int], optional): Its "blossoms" count is increased by the number of petals formed.
+        listener (MatchingListener, optional): Receives a blossom_contracted event for every petal.
+
+    Returns:
+        List[List[int]]: Vertex-disjoint augmenting paths of the shortest length. An empty list
+        means the matching is already maximum.
+    """
+    search = _SearchPhase(adjacency, mate, active_listener(listener))
+    paths = search.run()
+    if stats is not None:
+        stats["blossoms"] += len(search.petals)
+    return paths
+
+
+class _SearchPhase:
+    """
+    State of a single phase.
+
+    MIN steps grow the BFS levels (evenlevel/oddlevel) and record propagation edges as
+    predecessors and every other edge as a bridge keyed by its tenacity. MAX steps run a
+    double depth-first search (DDFS) from the two ends of each bridge, which either closes an
+    augmenting path or forms a petal whose vertices are collapsed onto the bottleneck (their bud).
+    """
+
+    def __init__(self, adjacency: Dict[int, Iterable[int]], mate: Dict[int, int], listener: Optional[MatchingListener] = None):
+        self.adjacency = adjacency
+        self.mate = mate
+        self.listener = listener
+        self.evenlevel = {}
+        self.oddlevel = {}
+        self.levels = defaultdict(list)
+        self.max_level = 0
+        self.pred = defaultdict(list)
+        self.succ = defaultdict(list)
+        self.pred_count = defaultdict(int)
+        self.props = set()
+        self.bridges = defaultdict(list)
+        self.bridge_keys = set()
+        self.max_tenacity = -1
+        self.erased = set()
+        self.bud = {}
+        self.star = {}
+        self.petal_of = {}
+        self.petal_color = {}
+        self.petals = []
+        self.paths = []
+
+    def run(self) -> List[List[int]]:
+        for vertex in self.adjacency:
+            if vertex not in self.mate:
+                self.set_level(vertex, 0)
+        search_level = 0
+        while search_level <= self.max_level or 2 * search_level + 1 <= self.max_tenacity:
+            self.min_step(search_level)
+            self.max_step(search_level)
+            if self.paths:
+                break
+            search_level += 1
+        return self.paths
+
+    def level(self, vertex: int) -> float:
+        return min(self.evenlevel.get(vertex, INFINITY), self.oddlevel.get(vertex, INFINITY))
+
+    def is_outer(self, vertex: int) -> bool:
+        return self.evenlevel.get(vertex, INFINITY) < self.oddlevel.get(vertex, INFINITY)
+
+    def set_level(self, vertex: int, level: int):
+        if level % 2 == 0:
+            self.evenlevel[vertex] = level
+        else:
+            self.oddlevel[vertex] = level
+        self.levels[level].append(vertex)
+        self.max_level = max(self.max_level, level)
+
+    def add_prop(self, lower: int, upper: int):
+        key = (lower, upper) if lower < upper else (upper, lower)
+        if key in self.props:
+            return
+        self.props.add(key)
+        self.pred[upper].append(lower)
+        self.succ[lower].append(upper)
+        self.pred_count[upper] += 1
+
+    def add_bridge(self, vertex1: int, vertex2: int):
+        key = (vertex1, vertex2) if vertex1 < vertex2 else (vertex2, vertex1)
+        if key in self.props or key in self.bridge_keys:
+            return
+        self.bridge_keys.add(key)
+        if self.mate.get(vertex1) == vertex2:
+            tenacity = self.oddlevel[vertex1] + self.oddlevel[vertex2] + 1
+        else:
+            tenacity = self.evenlevel[vertex1] + self.evenlevel[vertex2] + 1
+        self.bridges[tenacity].append((vertex1, vertex2))
+        self.max_tenacity = max(self.max_tenacity, tenacity)
+
+    def scan_even(self, vertex: int):
+        # Unmatched edges from a vertex at its even level either lead to a vertex with an even
+        # level (a bridge) or propagate an odd level one step further.
+        level = self.evenlevel[vertex]
+        matched_to = self.mate.get(vertex)
+        for neighbor in self.adjacency[vertex]:
+            if neighbor == vertex or neighbor == matched_to:
+                continue
+            if neighbor in self.evenlevel:
+                self.add_bridge(vertex, neighbor)
+                continue
+            if neighbor not in self.oddlevel:
+                self.set_level(neighbor, level + 1)
+            if self.oddlevel[neighbor] == level + 1:
+                self.add_prop(vertex, neighbor)
+
+    def scan_odd(self, vertex: int):
+        matched_to = self.mate.get(vertex)
+        if matched_to is None:
+            return
+        if matched_to in self.oddlevel:
+            self.add_bridge(vertex, matched_to)
+        elif matched_to not in self.evenlevel:
+            self.set_level(matched_to, self.oddlevel[vertex] + 1)
+            self.add_prop(vertex, matched_to)
+
+    def min_step(self, search_level: int):
+        for vertex in self.levels.pop(search_level, ()):
+            if search_level % 2 == 0:
+                self.scan_even(vertex)
+            else:
+                self.scan_odd(vertex)
+
+    def max_step(self, search_level: int):
+        tenacity = 2 * search_level + 1
+        bridges = self.bridges[tenacity]
+        index = 0
+        while index < len(bridges):
+            vertex1, vertex2 = bridges[index]
+            index += 1
+            if vertex1 in self.erased or vertex2 in self.erased:
+                continue
+            red_top, green_top = self.bud_star(vertex1), self.bud_star(vertex2)
+            if red_top == green_top or red_top in self.erased or green_top in self.erased:
+                continue
+            self.ddfs(vertex1, vertex2, red_top, green_top, tenacity)
+        del self.bridges[tenacity]
+
+    def bud_star(self, vertex: int) -> int:
+        root = vertex
+        while root in self.star:
+            root = self.star[root]
+        while vertex != root:
+            next_vertex = self.star[vertex]
+            self.star[vertex] = root
+            vertex = next_vertex
+        return root
+
+    def jump(self, vertex: int, petal: float) -> int:
+        # Follows buds of petals formed before the given petal, i.e. bud* as it was when that
+        # petal's DDFS ran.
+        while self.petal_of.get(vertex, INFINITY) < petal:
+            vertex = self.bud[vertex]
+        return vertex
+
+    def next_pred(self, vertex: int, cursor: Dict[int, int]) -> Optional[Tuple[int, int]]:
+        preds = self.pred[vertex]
+        index = cursor.get(vertex, 0)
+        while index < len(preds):
+            pred = preds[index]
+            index += 1
+            if pred in self.erased:
+                continue
+            top = self.bud_star(pred)
+            if top in self.erased:
+                continue
+            cursor[vertex] = index
+            return top, pred
+        cursor[vertex] = index
+        return None
+
+    def ddfs(self, red_end: int, green_end: int, red_top: int, green_top: int, tenacity: int):
+        """
+        Double depth-first search from the two ends of a bridge.
+
+        The centre at the higher level always moves (red on ties). When one search steps onto
+        the other's centre, red keeps the vertex and green looks for another way down; if green
+        cannot find one below its barrier, it takes the vertex back and red retreats instead.
+        If red runs out as well, the contested vertex is the bottleneck of a new petal.
+        """
+        color = {red_top: RED, green_top: GREEN}
+        parent = {red_top: None, green_top: None}
+        via = {}
+        cursor = {}
+        red, green = red_top, green_top
+        barrier = green_top
+        meeting = None
+        green_claim = None
+
+        while True:
+            if red != green and self.level(red) == 0 and self.level(green) == 0:
+                self.augment(red_end, green_end, red, green, parent, via)
+                return
+            if self.level(red) >= self.level(green):
+                found = self.next_pred(red, cursor)
+                if found is None:
+                    if parent[red] is None:
+                        break
+                    red = parent[red]
+                    continue
+                top, pred = found
+                if top not in color:
+                    color[top] = RED
+                    parent[top], via[top] = red, pred
+                    red = top
+                elif top == green:
+                    meeting = top
+                    green_claim = (parent[top], via.get(top))
+                    color[top] = RED
+                    parent[top], via[top] = red, pred
+                    red = top
+                    if green == barrier:
+                        red = self.green_retakes(meeting, green_claim, color, parent, via)
+                        if red is None:
+                            break
+                        green = barrier = meeting
+                    else:
+                        green = green_claim[0]
+            else:
+                found = self.next_pred(green, cursor)
+                if found is None:
+                    if green != barrier:
+                        green = parent[green]
+                        continue
+                    if meeting is None or color[meeting] == GREEN:
+                        break
+                    red = self.green_retakes(meeting, green_claim, color, parent, via)
+                    if red is None:
+                        break
+                    green = barrier = meeting
+                    continue
+                top, pred = found
+                if top not in color:
+                    color[top] = GREEN
+                    parent[top], via[top] = green, pred
+                    green = top
+                elif top == red:
+                    meeting = top
+                    green_claim = (green, pred)
+
+        if meeting is not None:
+            self.form_petal(red_end, green_end, meeting, color, tenacity)
+
+    def green_retakes(self, meeting, green_claim, color, parent, via) -> Optional[int]:
+        # Green gives up looking for an alternative: it takes the contested vertex back and red
+        # retreats to the vertex it came from. Returns red's new centre, or None if red has none.
+        red_parent = parent[meeting]
+        color[meeting] = GREEN
+        parent[meeting], via[meeting] = green_claim
+        return red_parent
+
+    def form_petal(self, red_end: int, green_end: int, bottleneck: int, color: Dict[int, int], tenacity: int):
+        petal = len(self.petals)
+        self.petals.append((red_end, green_end, bottleneck))
+        members = [vertex for vertex in color if vertex != bottleneck]
+        for vertex in members:
+            self.bud[vertex] = bottleneck
+            self.star[vertex] = bottleneck
+            self.petal_of[vertex] = petal
+            self.petal_color[vertex] = color[vertex]
+        if self.listener is not None:
+            self.listener.blossom_contracted(bottleneck, members)
+        for vertex in members:
+            if vertex in self.evenlevel:
+                self.set_level(vertex, tenacity - self.evenlevel[vertex])
+                matched_to = self.mate.get(vertex)
+                if matched_to is not None and matched_to in self.oddlevel:
+                    self.add_bridge(vertex, matched_to)
+            else:
+                self.set_level(vertex, tenacity - self.oddlevel[vertex])
+                # Edges that reached this vertex while it only had an odd level become bridges
+                # now that its even level is known.
+                matched_to = self.mate.get(vertex)
+                for neighbor in self.adjacency[vertex]:
+                    if neighbor != vertex and neighbor != matched_to and neighbor in self.evenlevel:
+                        self.add_bridge(vertex, neighbor)
+
+    def augment(self, red_end: int, green_end: int, red: int, green: int, parent, via):
+        red_half = self.expand(self.tree_tasks(red_end, red, parent, via))
+        green_half = self.expand(self.tree_tasks(green_end, green, parent, via))
+        path = red_half[::-1] + green_half
+        self.paths.append(path)
+        self.erase(path)
+
+    def tree_tasks(self, end: int, bottom: int, parent, via) -> List[tuple]:
+        # Walks the DDFS tree from the free vertex it reached back to the bridge, then turns the
+        # walk into tasks that open every petal crossed on the way down.
+        steps = []
+        vertex = bottom
+        while parent[vertex] is not None:
+            steps.append(via[vertex])
+            vertex = parent[vertex]
+        tasks = [("open", end, INFINITY)]
+        tasks.extend(("open", pred, INFINITY) for pred in reversed(steps))
+        return tasks
+
+    def expand(self, tasks: List[tuple]) -> List[int]:
+        """
+        Turns path tasks into a vertex list with an explicit stack.
+
+        Tasks describe pieces of the path (open a petal, descend inside a petal) and may be
+        reversed; reversing a composite task reverses the order of its parts and flips each
+        part, so arbitrarily nested petals never recurse.
+        """
+        path = []
+        stack = [(task, False) for task in reversed(tasks)]
+        while stack:
+            task, backwards = stack.pop()
+            if task[0] == "emit":
+                if not path or path[-1] != task[1]:
+                    path.append(task[1])
+                continue
+            parts = self.expand_task(task)
+            if backwards:
+                parts = [(part, not flag) for part, flag in reversed(parts)]
+            stack.extend(reversed(parts))
+        return path
+
+    def expand_task(self, task: tuple) -> List[Tuple[tuple, bool]]:
+        kind = task[0]
+        if kind == "open":
+            _, vertex, limit = task
+            if self.petal_of.get(vertex, INFINITY) >= limit:
+                return [(("emit", vertex), False)]
+            return [(("petal", vertex), False), (("open", self.bud[vertex], limit), False)]
+        if kind == "petal":
+            vertex = task[1]
+            petal = self.petal_of[vertex]
+            red_end, green_end, bud = self.petals[petal]
+            vertex_color = self.petal_color[vertex]
+            if self.is_outer(vertex):
+                return [(("descend", vertex, bud, petal, None), False)]
+            same_end, other_end = (red_end, green_end) if vertex_color == RED else (green_end, red_end)
+            return [
+                (("descend_from", same_end, vertex, petal, vertex_color), True),
+                (("descend_from", other_end, bud, petal, 1 - vertex_color), False),
+            ]
+        if kind == "descend_from":
+            _, high, low, petal, vertex_color = task
+            return [
+                (("open", high, petal), False),
+                (("descend", self.jump(high, petal), low, petal, vertex_color), False),
+            ]
+        _, high, low, petal, vertex_color = task
+        return [(("emit", high), False)] + [(("open", pred, petal), False) for pred in self.find_descent(high, low, petal, vertex_color)]
+
+    def find_descent(self, high: int, low: int, petal: int, vertex_color: Optional[int]) -> List[int]:
+        # DFS inside one petal from high down to low. Returns the predecessor used at every step.
+        # The two halves through an inner vertex must not meet, so each keeps to the colour whose
+        # DDFS reached it; an outer vertex may be a dead end of its own colour's DDFS, and its
+        # descent to the bud is alone in the petal, so it may use vertices of either colour.
+        if high == low:
+            return []
+        stack = [(high, iter(self.pred[high]))]
+        steps = []
+        visited = {high}
+        while stack:
+            vertex, preds = stack[-1]
+            for pred in preds:
+                if pred in self.erased:
+                    continue
+                top = self.jump(pred, petal)
+                if top == low:
+                    steps.append(pred)
+                    return steps
+                if top in visited or self.petal_of.get(top) != petal:
+                    continue
+                if vertex_color is not None and self.petal_color[top] != vertex_color:
+                    continue
+                visited.add(top)
+                steps.append(pred)
+                stack.append((top, iter(self.pred[top])))
+                break
+            else:
+                stack.pop()
+                if steps:
+                    steps.pop()
+        raise RuntimeError("no path from {} to {} inside petal {}".format(high, low, petal))
+
+    def erase(self, vertices: Iterable[int]):
+        # Vertices on an augmenting path are removed from the phase, and so is every vertex
+        # left without an unerased predecessor.
+        stack = list(vertices)
+        while stack:
+            vertex = stack.pop()
+            if vertex in self.erased:
+                continue
+            self.erased.add(vertex)
+            for successor in self.succ[vertex]:
+                self.pred_count[successor] -= 1
+                if self.pred_count[successor] == 0:
+                    stack.append(successor)
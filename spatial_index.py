@@ -0,0 +1,115 @@
+import math
+from typing import Any, Dict, Hashable, Iterator, Tuple
+
+DEPTH = 12
+
+
+class SpatialIndex:
+    """
+    A hierarchy of loose grids over axis-aligned bounding boxes.
+
+    Level l is a grid of square cells of side size / 2 ** l. An item is stored once, in the
+    finest level whose cells are at least as large as its box, in the cell containing the
+    centre of the box, so it never sticks out of that cell by more than half a cell. A query
+    visits the cells of every level that such items could overlap and checks their boxes.
+    Short edges land in fine levels and long ones in coarse levels, so both are found without
+    storing an item in several cells. Levels and cells are created on demand, so neither the
+    coordinates nor the size of the items are bounded.
+    """
+
+    def __init__(self, size: float, depth: int = DEPTH):
+        """
+        Args:
+            size (float): Side of the cells of level 0, e.g. the extent of the drawing.
+                Larger items go to negative levels.
+            depth (int, optional): Index of the finest level, which also holds the smaller items.
+        """
+        self.size = float(size) if size > 0 else 1.0
+        self.depth = depth
+        self.levels: Dict[int, Dict[Tuple[int, int], list]] = {}
+        self.cells: Dict[Hashable, Tuple[int, Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.cells
+
+    def insert(self, item: Hashable, x1: float, y1: float, x2: float, y2: float):
+        """
+        Adds an item with its bounding box. An item already in the index is moved.
+        """
+        if item in self.cells:
+            self.remove(item)
+        extent = max(x2 - x1, y2 - y1)
+        level = self.depth if extent <= 0 else min(self.depth, math.floor(math.log2(self.size / extent)))
+        cell = math.ldexp(self.size, -level)
+        key = (math.floor((x1 + x2) / 2 / cell), math.floor((y1 + y2) / 2 / cell))
+        cells = self.levels.get(level)
+        if cells is None:
+            cells = self.levels[level] = {}
+        bucket = cells.get(key)
+        if bucket is None:
+            cells[key] = [(item, x1, y1, x2, y2)]
+        else:
+            bucket.append((item, x1, y1, x2, y2))
+        self.cells[item] = (level, key)
+
+    def remove(self, item: Hashable):
+        """
+        Removes an item. Raises KeyError if it is not in the index.
+        """
+        level, key = self.cells.pop(item)
+        bucket = self.levels[level][key]
+        for position, entry in enumerate(bucket):
+            if entry[0] == item:
+                del bucket[position]
+                break
+        if not bucket:
+            del self.levels[level][key]
+
+    def clear(self):
+        self.levels.clear()
+        self.cells.clear()
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> Iterator[Any]:
+        """
+        Yields every item whose bounding box overlaps the rectangle from (x1, y1) to (x2, y2).
+        """
+        for level, cells in self.levels.items():
+            if not cells:
+                continue
+            cell = math.ldexp(self.size, -level)
+            column1, column2 = math.floor(x1 / cell - 1.5), math.floor(x2 / cell + 0.5)
+            row1, row2 = math.floor(y1 / cell - 1.5), math.floor(y2 / cell + 0.5)
+            if (column2 - column1 + 1) * (row2 - row1 + 1) <= len(cells):
+                buckets = (cells[key] for key in ((column, row) for column in range(column1, column2 + 1)
+                                                  for row in range(row1, row2 + 1)) if key in cells)
+            else:
+                buckets = (bucket for (column, row), bucket in cells.items()
+                           if column1 <= column <= column2 and row1 <= row <= row2)
+            for bucket in buckets:
+                for item, left, top, right, bottom in bucket:
+                    if left <= x2 and right >= x1 and top <= y2 and bottom >= y1:
+                        yield item
+
+
+def segment_intersects(x1: float, y1: float, x2: float, y2: float, left: float, top: float, right: float, bottom: float) -> bool:
+    """
+    Tells whether the segment from (x1, y1) to (x2, y2) crosses the rectangle, by Liang-Barsky clipping.
+    """
+    start, end = 0.0, 1.0
+    dx, dy = x2 - x1, y2 - y1
+    for step, distance in ((-dx, x1 - left), (dx, right - x1), (-dy, y1 - top), (dy, bottom - y1)):
+        if step == 0:
+            if distance < 0:
+                return False
+            continue
+        ratio = distance / step
+        if step < 0:
+            start = max(start, ratio)
+        else:
+            end = min(end, ratio)
+        if start > end:
+            return False
+    return True
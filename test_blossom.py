@@ -1,6 +1,18 @@
+import inspect
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
-from graphHelpers import Graph, Matching
-from blossomAlgo import compute_maximum_matching, GraphVisualizer
+from graphHelpers import Graph, Matching, CSRGraph, ContractedGraph, Forest, Tree, contract_nodes
+from blossomAlgo import compute_maximum_matching, compute_maximum_matching_csr, compute_maximum_weight_matching, compute_maximum_matching_batch, GraphVisualizer
+from dynamic_matching import DynamicMatching
+from components import connected_components
+from graph_io import save_graph, load_graph, read_graph
+from listeners import CountingListener
+from matching_trace import TraceRecorder, TraceReplayer, replay_events
+from matching_export import svg_lines, write_png, PNG_SIGNATURE
+from layout import layout_graph, fruchterman_reingold_layout, np
 
 class TestBlossomAlgorithm(unittest.TestCase):
     """
@@ -138,6 +150,562 @@ class TestBlossomAlgorithm(unittest.TestCase):
         expected_edges = [[0, 1]]
         self.assertCountEqual(max_matching.edges, expected_edges)
 
+    def test_augment_existing_matching(self):
+        """
+        Ensures an augmenting path longer than one edge flips the matched edge it passes through.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3]
+        graph.edges = [[0, 1], [1, 2], [2, 3]]
+        self.draw_graph(graph)
+        matching = Matching()
+        matching.nodes = [1, 2]
+        matching.edges = [[1, 2]]
+        max_matching = compute_maximum_matching(graph, matching, self.visualizer)
+        self.assertCountEqual([sorted(edge) for edge in max_matching.edges], [[0, 1], [2, 3]])
+
+    def test_backends_agree(self):
+        """
+        Ensures every backend finds a matching of the same size on a graph with nested odd cycles.
+        """
+        graph = Graph()
+        graph.nodes = list(range(10))
+        graph.edges = [
+            [0, 1], [1, 2], [2, 0],
+            [2, 3], [3, 4], [4, 5], [5, 6], [6, 2],
+            [6, 7], [7, 8], [8, 9], [9, 7]
+        ]
+        self.draw_graph(graph)
+        for backend in ("edmonds", "micali_vazirani"):
+            max_matching = compute_maximum_matching(graph, Matching(), self.visualizer, backend=backend)
+            self.assertEqual(len(max_matching.edges), 5, backend)
+
+    def test_micali_vazirani_partial_matching(self):
+        """
+        Ensures the Micali-Vazirani engine finishes a matching it did not start, where an outer
+        vertex of a petal is a dead end of its own colour.
+        """
+        graph = Graph()
+        graph.nodes = list(range(30))
+        graph.edges = [
+            [23, 7], [12, 9], [6, 5], [26, 15], [2, 17], [12, 6], [24, 7], [8, 28], [1, 22], [13, 3], [14, 4],
+            [22, 20], [5, 15], [10, 14], [17, 18], [23, 13], [11, 28], [2, 1], [26, 25], [25, 29], [4, 3], [8, 10],
+            [29, 8], [0, 27], [0, 16], [18, 24], [4, 21], [27, 19], [19, 21], [9, 19], [11, 16]
+        ]
+        self.draw_graph(graph)
+        for backend in ("edmonds", "micali_vazirani"):
+            matching = Matching()
+            matching.add_edge(9, 19)
+            max_matching = compute_maximum_matching(graph, matching, self.visualizer, backend=backend)
+            self.assertEqual(len(max_matching.edges), 15, backend)
+
+    def test_multi_path_phases(self):
+        """
+        Ensures the multi-path Edmonds mode augments several disjoint paths per search.
+        """
+        graph = Graph()
+        graph.nodes = list(range(8))
+        graph.edges = [[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 3], [2, 3], [6, 7]]
+        self.draw_graph(graph)
+        max_matching = compute_maximum_matching(graph, Matching(), self.visualizer, backend="edmonds", multi_path=True)
+        self.assertEqual(len(max_matching.edges), 4)
+        self.assertEqual(max_matching.phases, 1)
+
+    def test_initializers(self):
+        """
+        Ensures every initial matching heuristic leads to a maximum matching.
+        """
+        graph = Graph()
+        graph.nodes = list(range(10))
+        graph.edges = [
+            [0, 1], [1, 2], [2, 0],
+            [2, 3], [3, 4], [4, 5], [5, 6], [6, 2],
+            [6, 7], [7, 8], [8, 9], [9, 7]
+        ]
+        self.draw_graph(graph)
+        for initializer in ("greedy", "min_degree", "karp_sipser"):
+            max_matching = compute_maximum_matching(graph, Matching(), self.visualizer, initializer=initializer)
+            self.assertEqual(len(max_matching.edges), 5, initializer)
+        with self.assertRaises(ValueError):
+            compute_maximum_matching(graph, Matching(), self.visualizer, initializer="random")
+
+    def test_graph_views(self):
+        """
+        Ensures the nodes and edges views stay in sync with the adjacency sets and the mate map.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2]
+        graph.edges = [[0, 1]]
+        graph.edges.append([2, 1])
+        self.assertTrue(graph.has_edge(1, 2))
+        self.assertIn([1, 2], graph.edges)
+        self.assertCountEqual(graph.neighbors(1), [0, 2])
+        self.assertEqual(list(graph.edges), [[0, 1], [2, 1]])
+
+        matching = Matching()
+        matching.edges = [[0, 1]]
+        self.assertEqual(matching.mate, {0: 1, 1: 0})
+        matching.remove_edge(1, 0)
+        self.assertEqual(matching.mate, {})
+        self.assertEqual(list(matching.nodes), [])
+
+    def test_csr_graph(self):
+        """
+        Ensures the engines run on the CSR representation and convert back to a Matching.
+        """
+        graph = Graph()
+        graph.nodes = [10, 11, 12, 13, 14, 15]
+        graph.edges = [[10, 11], [11, 12], [12, 10], [12, 13], [13, 14], [14, 15]]
+        for backend in ("edmonds", "micali_vazirani"):
+            csr_graph = compute_maximum_matching_csr(CSRGraph.from_graph(graph), backend=backend)
+            self.assertEqual(csr_graph.mate.typecode, "i")
+            self.assertEqual(len(csr_graph.to_matching().edges), 3, backend)
+        self.assertCountEqual(CSRGraph.from_graph(graph).to_graph().edges, [sorted(edge) for edge in graph.edges])
+
+    def test_forest_lookups(self):
+        """
+        Ensures the forest records tree, root, parent and depth parity of every vertex as it grows.
+        """
+        forest = Forest()
+        forest.add_tree(Tree(0))
+        forest.add_tree(Tree(5))
+        forest.add_edge(0, 1, 0)
+        forest.add_edge(0, 1, 2)
+        forest.add_edge(1, 5, 6)
+        self.assertEqual([forest.get_tree_by_node(node) for node in (0, 1, 2, 6, 9)], [0, 0, 0, 1, -1])
+        self.assertEqual(forest.get_root(2), 0)
+        self.assertEqual(forest.get_parent(2), 1)
+        self.assertEqual([forest.get_parity(node) for node in (0, 1, 2, 6)], [0, 1, 0, 1])
+        self.assertFalse(forest.is_in_forest(9))
+        forest.add_edge(0, 1, 3)
+        forest.add_edge(0, 3, 4)
+        self.assertEqual(forest.tree(0).path_to_root(4), [4, 3, 1, 0])
+        self.assertEqual(forest.tree(0).lowest_common_ancestor(4, 2), 1)
+        self.assertEqual(forest.tree(0).path(4, 2), [4, 3, 1, 2])
+
+    def test_contracted_graph(self):
+        """
+        Ensures a contracted view answers queries through its representatives and leaves the base graph unchanged.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3, 4]
+        graph.edges = [[0, 1], [1, 2], [2, 0], [2, 3], [3, 4]]
+        view = ContractedGraph(graph)
+        view.contract(0, 2)
+        view.contract(1, 2)
+        self.assertEqual(view.nodes, [2, 3, 4])
+        self.assertEqual(view.find(0), 2)
+        self.assertEqual(view.neighbors(1), [3])
+        self.assertTrue(view.has_edge(0, 3))
+        self.assertFalse(view.has_edge(0, 4))
+        self.assertCountEqual(view.materialize().edges, [[2, 3], [3, 4]])
+        self.assertEqual(len(graph.edges), 5)
+
+    def test_chained_contractions(self):
+        """
+        Ensures chained contract_nodes calls extend one view in place and leave the base graph unchanged.
+        """
+        graph = Graph()
+        graph.nodes = list(range(1000))
+        graph.edges = [[node, node + 1] for node in range(999)]
+        view = contract_nodes(graph, 0, 1)
+        snapshot = view.copy()
+        for node in range(2, 999):
+            self.assertIs(contract_nodes(view, node - 1, node), view)
+        self.assertEqual(view.nodes, [998, 999])
+        self.assertEqual(view.neighbors(0), [999])
+        self.assertEqual(len(view.contractions), 998)
+        self.assertEqual(snapshot.nodes, list(range(1, 1000)))
+        self.assertEqual(len(graph.edges), 999)
+
+    def test_long_matchings(self):
+        """
+        Ensures matchings of more than a thousand edges are found without hitting the recursion limit,
+        which the driver used to reach by recursing once per augmentation.
+        """
+        def triangle_chain(count):
+            graph = Graph()
+            graph.nodes = list(range(3 * count))
+            graph.edges = ([[3 * k + i, 3 * k + (i + 1) % 3] for k in range(count) for i in range(3)]
+                           + [[3 * k + 2, 3 * k + 3] for k in range(count - 1)])
+            return graph
+
+        for backend in ("auto", "edmonds"):
+            self.assertEqual(len(compute_maximum_matching(triangle_chain(700), Matching(), backend=backend).edges), 1050, backend)
+        # The contraction engine is too slow for a thousand augmentations, so a hundred and fifty
+        # run with a stack of only a hundred frames above this one.
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack()) + 100)
+        try:
+            self.assertEqual(len(compute_maximum_matching(triangle_chain(100), Matching(), backend="contraction").edges), 150)
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def test_dynamic_matching(self):
+        """
+        Ensures the dynamic matching stays maximum under edge and vertex updates.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3]
+        graph.edges = [[0, 1], [1, 2], [2, 3]]
+        dynamic = DynamicMatching(graph)
+        self.assertEqual(len(dynamic.matching.edges), 2)
+        self.assertEqual(dynamic.delete_edge(2, 3), [])
+        self.assertEqual(len(dynamic.matching.edges), 1)
+        dynamic.delete_edge(0, 1)
+        self.assertEqual(len(dynamic.matching.edges), 1)
+        self.assertEqual(dynamic.insert_edge(3, 0), [3, 0])
+        self.assertEqual(len(dynamic.matching.edges), 2)
+        dynamic.insert_vertex(4, [3])
+        dynamic.delete_vertex(0)
+        self.assertCountEqual([sorted(edge) for edge in dynamic.matching.edges], [[1, 2], [3, 4]])
+
+    def test_dynamic_insert_between_matched(self):
+        """
+        Ensures an edge between two matched vertices is repaired through both of their partners.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3, 4, 5]
+        graph.edges = [[4, 0], [0, 1], [2, 3], [3, 5]]
+        matching = Matching()
+        matching.add_edge(0, 1)
+        matching.add_edge(2, 3)
+        dynamic = DynamicMatching(graph, matching)
+        self.assertEqual(dynamic.insert_edge(0, 2), [])
+        self.assertEqual(len(dynamic.matching.edges), 2)
+        aug_path = dynamic.insert_edge(1, 2)
+        self.assertIn(aug_path, ([4, 0, 1, 2, 3, 5], [5, 3, 2, 1, 0, 4]))
+        self.assertCountEqual([sorted(edge) for edge in dynamic.matching.edges], [[0, 4], [1, 2], [3, 5]])
+
+    def test_search_counters(self):
+        """
+        Ensures the engines report the augmentations applied and the blossoms contracted.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3]
+        graph.edges = [[0, 1], [1, 2], [2, 0], [2, 3]]
+        self.draw_graph(graph)
+        for multi_path in (False, True):
+            matching = Matching()
+            matching.add_edge(1, 2)
+            max_matching = compute_maximum_matching(graph, matching, self.visualizer, backend="edmonds", multi_path=multi_path)
+            self.assertEqual(len(max_matching.edges), 2)
+            self.assertEqual(max_matching.augmentations, 1)
+            self.assertEqual(max_matching.blossoms, 1)
+
+    def test_component_counters(self):
+        """
+        Ensures solving by components honours multi_path and reports the same counters as a single solve.
+        """
+        for multi_path in (False, True):
+            counters = set()
+            for workers in (None, 1, 2):
+                graph = Graph()
+                graph.nodes = list(range(7))
+                graph.edges = [[0, 1], [1, 2], [2, 3], [4, 5], [5, 6], [6, 4]]
+                max_matching = compute_maximum_matching(graph, Matching(), backend="edmonds", multi_path=multi_path, workers=workers)
+                self.assertEqual(len(max_matching.edges), 3)
+                counters.add((max_matching.phases, max_matching.augmentations, max_matching.blossoms))
+            self.assertEqual(counters, {(1 if multi_path else 3, 3, 1)})
+
+    def test_counting_listener(self):
+        """
+        Ensures the engines report their phases, augmentations and blossoms to a listener.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3]
+        graph.edges = [[0, 1], [1, 2], [2, 0], [2, 3]]
+        for backend in ("edmonds", "micali_vazirani"):
+            matching = Matching()
+            matching.add_edge(1, 2)
+            listener = CountingListener()
+            max_matching = compute_maximum_matching(graph, matching, listener, backend=backend)
+            self.assertEqual(len(max_matching.edges), 2)
+            self.assertEqual(listener.counts["augmentation_started"], 1)
+            self.assertEqual(listener.counts["edge_matched"], 2)
+            self.assertEqual(listener.counts["edge_unmatched"], 1)
+            self.assertEqual(listener.counts["blossom_contracted"], max_matching.blossoms)
+            self.assertEqual(listener.counts["phase_finished"], max_matching.phases + 1)
+            self.assertEqual(len(listener.phase_times), max_matching.phases + 1)
+        self.assertEqual(len(compute_maximum_matching(graph, Matching()).edges), 2)
+
+    def test_headless_import(self):
+        """
+        Ensures importing the algorithms loads neither tkinter nor the graphics module.
+        """
+        check = "import blossomAlgo, sys; print('tkinter' in sys.modules or 'graphics' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", check], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+    def test_trace_replay(self):
+        """
+        Ensures a recorded run replays to the same events and the same final matching.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3, 4, 5]
+        graph.edges = [[0, 1], [1, 2], [2, 0], [2, 3], [3, 4], [4, 5]]
+        self.draw_graph(graph)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.jsonl")
+            live = CountingListener()
+            with TraceRecorder(path, detail="scans") as recorder:
+                max_matching = compute_maximum_matching(graph, Matching(), recorder, backend="edmonds")
+            compute_maximum_matching(graph, Matching(), live, backend="edmonds")
+            replayed = CountingListener()
+            replay_events(path, replayed)
+            self.assertEqual(replayed.counts, live.counts)
+            replayer = TraceReplayer(path, self.visualizer)
+            odd_vertices = {frame[0] for frame in replayer.frames if frame[1] is None}
+            self.assertTrue(odd_vertices)
+            self.assertEqual(len(replayer) - sum(1 for frame in replayer.frames if frame[1] is None),
+                             live.counts["edge_matched"] + live.counts["edge_unmatched"])
+            self.assertEqual(replayer.seek(len(replayer)), len(max_matching.edges) + len(odd_vertices))
+            self.assertEqual(replayer.seek(0), len(max_matching.edges) + len(odd_vertices))
+            replayer.play(speed=1000, fps=1000)
+            self.assertEqual(replayer.position, len(replayer))
+
+    def test_batched_drawing(self):
+        """
+        Ensures items drawn in a batch are created when it ends and the graph can then be solved.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3]
+        graph.edges = [[0, 1], [1, 2], [2, 3]]
+        with self.visualizer.batch():
+            self.draw_graph(graph)
+            self.assertTrue(all(node.id is None for node in self.visualizer.node_objects.values()))
+        self.assertTrue(all(node.id is not None for node in self.visualizer.node_objects.values()))
+        max_matching = compute_maximum_matching(graph, Matching(), self.visualizer)
+        self.assertEqual(len(max_matching.edges), 2)
+
+    def test_viewport_culling(self):
+        """
+        Ensures only what is in view is drawn, labels and single edges are dropped when zoomed out, and colours survive.
+        """
+        graph = Graph()
+        graph.nodes = list(range(9))
+        graph.edges = [[0, 1], [1, 2], [3, 4], [4, 5], [6, 7], [7, 8], [2, 5], [5, 8]]
+        self.draw_graph(graph)
+        self.visualizer.set_view(250, 0, 1)
+        self.visualizer.flush()
+        self.assertCountEqual(self.visualizer.node_objects, [2, 5, 8])
+        self.assertCountEqual(self.visualizer.label_objects, [2, 5, 8])
+        self.assertCountEqual(self.visualizer.edge_objects, [(1, 2), (4, 5), (7, 8), (2, 5), (5, 8)])
+        self.visualizer.update_edge(5, 2, "red")
+        self.visualizer.update_edge(0, 1, "red")
+        self.visualizer.zoom_by(0.25)
+        self.visualizer.flush()
+        self.assertEqual(len(self.visualizer.node_objects), 9)
+        self.assertEqual(self.visualizer.label_objects, {})
+        self.assertEqual(self.visualizer.edge_objects[(0, 1)].config["fill"], "red")
+        self.visualizer.max_edges = 4
+        self.visualizer.fit()
+        self.visualizer.flush()
+        self.assertEqual(self.visualizer.edge_objects, {})
+        self.assertIn("red", [bundle.config["fill"] for bundle in self.visualizer.bundle_objects])
+        max_matching = compute_maximum_matching(graph, Matching(), self.visualizer)
+        self.assertEqual(len(max_matching.edges), 4)
+
+    def test_export(self):
+        """
+        Ensures a matching is exported as SVG with matched edges in their own path and as a well-formed PNG.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3]
+        graph.edges = [[0, 1], [1, 2], [2, 3]]
+        max_matching = compute_maximum_matching(graph, Matching())
+        positions = {i: (100 * i, 50 * (i % 2)) for i in graph.nodes}
+        svg = "".join(svg_lines(graph, max_matching, positions, width=200, height=100))
+        self.assertEqual(svg.count("<circle"), 4)
+        self.assertEqual(svg.count('stroke="red"'), 1)
+        self.assertEqual(svg.count("M"), 3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "matching.png")
+            write_png(graph, max_matching, positions, path, width=200, height=100)
+            with open(path, "rb") as file:
+                data = file.read()
+        self.assertTrue(data.startswith(PNG_SIGNATURE))
+        self.assertTrue(data.endswith(b"IEND\xaeB`\x82"))
+        # Pictures thinner than the margins still render, and labels are escaped.
+        labelled = Graph()
+        labelled.nodes = ["<a&b>", "c"]
+        labelled.edges = [["<a&b>", "c"]]
+        positions = {"<a&b>": (0, 0), "c": (1, 1)}
+        svg = "".join(svg_lines(labelled, Matching(), positions, width=3000, height=5))
+        self.assertIn(">&lt;a&amp;b&gt;</text>", svg)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "thin.png")
+            write_png(labelled, Matching(), positions, path, width=3000, height=5)
+            with open(path, "rb") as file:
+                self.assertTrue(file.read().startswith(PNG_SIGNATURE))
+
+    def test_layouts(self):
+        """
+        Ensures every layout places every node inside the window and draw_graph draws the laid out graph.
+        """
+        graph = Graph()
+        graph.nodes = list(range(12))
+        graph.edges = [[i, (i + 1) % 12] for i in range(12)] + [[0, 5], [3, 8]]
+        methods = ("auto", "force", "spectral", "circular", "bipartite") if np is not None else ("auto", "circular", "bipartite")
+        for method in methods:
+            positions = layout_graph(graph, method, 600, 400)
+            self.assertCountEqual(positions, graph.nodes)
+            self.assertTrue(all(0 <= x <= 600 and 0 <= y <= 400 for x, y in positions.values()))
+        self.assertEqual({x for x, _ in layout_graph(graph, "bipartite").values()}, {50, 550})
+        with self.assertRaises(ValueError):
+            layout_graph(graph, "grid")
+        if np is not None:
+            large = Graph()
+            large.edges = [[i, i + 1] for i in range(2999)]
+            positions = fruchterman_reingold_layout(large, iterations=10)
+            lengths = [abs(complex(*positions[i]) - complex(*positions[i + 1])) for i in range(2999)]
+            self.assertLess(sorted(lengths)[1500], 3)
+        self.visualizer.draw_graph(graph)
+        self.assertCountEqual(self.visualizer.positions, graph.nodes)
+        max_matching = compute_maximum_matching(graph, Matching(), self.visualizer)
+        self.assertEqual(len(max_matching.edges), 6)
+
+    def test_components(self):
+        """
+        Ensures solving connected components separately gives a maximum matching of the whole graph.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3, 4, 5, 6, 7]
+        graph.edges = [[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 6]]
+        self.assertCountEqual([sorted(component) for component in connected_components(graph.adjacency)],
+                              [[0, 1, 2], [3, 4, 5, 6], [7]])
+        matching = Matching()
+        matching.add_edge(4, 5)
+        self.draw_graph(graph)
+        max_matching = compute_maximum_matching(graph, matching, self.visualizer, workers=1)
+        self.assertEqual(len(max_matching.edges), 3)
+        self.assertEqual(max_matching.mate[3], 4)
+        self.assertEqual(max_matching.mate[5], 6)
+
+    def test_batch(self):
+        """
+        Ensures the batch API solves every graph and reports results in input order.
+        """
+        graphs = []
+        for size in range(1, 7):
+            graph = Graph()
+            graph.nodes = list(range(10, 10 + size))
+            graph.edges = [[10 + index, 11 + index] for index in range(size - 1)]
+            graphs.append(graph)
+        batch = compute_maximum_matching_batch(graphs, workers=1, chunk_size=4)
+        results = list(batch)
+        self.assertEqual([index for index, _ in results], list(range(6)))
+        self.assertEqual([len(matching.edges) for _, matching in results], [0, 1, 1, 2, 2, 3])
+        self.assertTrue(all(graphs[index].has_edge(*edge) for index, matching in results for edge in matching.edges))
+        self.assertEqual(batch.instances, 6)
+
+    def test_binary_graph_file(self):
+        """
+        Ensures a saved graph maps back with the same vertices and edges and can be solved in place.
+        """
+        graph = Graph()
+        graph.nodes = [5, 7, 9, 2 ** 40]
+        graph.edges = [[5, 7], [7, 9], [9, 2 ** 40]]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.bin")
+            save_graph(graph, path)
+            mapped = load_graph(path)
+            self.assertCountEqual([sorted(edge) for edge in mapped.to_graph().edges], [[5, 7], [7, 9], [9, 2 ** 40]])
+            compute_maximum_matching_csr(mapped)
+            self.assertCountEqual([sorted(edge) for edge in mapped.to_matching().edges], [[5, 7], [9, 2 ** 40]])
+            del mapped
+            with open(path, "r+b") as file:
+                file.write(b"NOTAGRAPH")
+            with self.assertRaises(ValueError):
+                load_graph(path)
+
+    def test_graph_readers(self):
+        """
+        Ensures every text format is read into the same graph, without self-loops or duplicate edges,
+        with node ids in order of first appearance.
+        """
+        files = {
+            "graph.tsv": "# edge list\n1\t2\n2\t1\n2\t3\n3\t3\n",
+            "graph.col": "c dimacs\np edge 4 4\ne 1 2\ne 2 1\ne 2 3\ne 3 3\n",
+            "graph.graph": "% metis\n4 2\n2\n1 3\n2\n\n",
+            "graph.mtx": "%%MatrixMarket matrix coordinate real symmetric\n4 4 3\n2 1 1.0\n3 2 1.0\n3 3 1.0\n",
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for name, text in files.items():
+                path = os.path.join(directory, name)
+                with open(path, "w") as file:
+                    file.write(text)
+                graph = read_graph(path, chunk_size=8)
+                self.assertCountEqual([sorted(edge) for edge in graph.edges], [[1, 2], [2, 3]], name)
+                self.assertEqual(len(graph.nodes), 3 if name == "graph.tsv" else 4, name)
+            path = os.path.join(directory, "order.tsv")
+            with open(path, "w") as file:
+                file.write("9 3\n3 7\n1 9\n")
+            for chunk_size in (4, 8, 1 << 20):
+                self.assertEqual(list(read_graph(path, chunk_size=chunk_size).nodes), [9, 3, 7, 1])
+            # A blank line in a weighted file must not shift the fields of the following lines.
+            path = os.path.join(directory, "weighted.tsv")
+            with open(path, "w") as file:
+                file.write("1 2 9\n\n3 4 8\n")
+            self.assertCountEqual([sorted(edge) for edge in read_graph(path).edges], [[1, 2], [3, 4]])
+
+    def test_weighted_matching(self):
+        """
+        Ensures the weighted engine prefers heavy edges and honours the cardinality options.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3]
+        graph.edges = [[0, 1, 2], [1, 2, 10], [2, 3, 2]]
+        self.draw_graph(graph)
+        max_matching = compute_maximum_weight_matching(graph, Matching(), self.visualizer)
+        self.assertEqual(max_matching.engine, "weighted")
+        self.assertEqual([sorted(edge) for edge in max_matching.edges], [[1, 2]])
+        self.assertEqual(max_matching.weight, 10)
+
+        max_matching = compute_maximum_weight_matching(graph, Matching(), self.visualizer, maxcardinality=True)
+        self.assertEqual(len(max_matching.edges), 2)
+        self.assertEqual(max_matching.weight, 4)
+
+        graph.edges.append([0, 3, 1])
+        max_matching = compute_maximum_weight_matching(graph, Matching(), self.visualizer, min_cost_perfect=True)
+        self.assertCountEqual([sorted(edge) for edge in max_matching.edges], [[0, 1], [2, 3]])
+        graph.remove_edge(0, 1)
+        graph.remove_edge(0, 3)
+        with self.assertRaises(ValueError):
+            compute_maximum_weight_matching(graph, Matching(), self.visualizer, min_cost_perfect=True)
+
+    def test_bipartite_uses_hopcroft_karp(self):
+        """
+        Ensures bipartite graphs are detected and solved by the Hopcroft-Karp engine.
+        """
+        graph = Graph()
+        graph.nodes = [0, 1, 2, 3, 4, 5]
+        graph.edges = [
+            [0, 3],
+            [0, 4],
+            [1, 3],
+            [2, 4],
+            [2, 5]
+        ]
+        self.draw_graph(graph)
+        max_matching = compute_maximum_matching(graph, Matching(), self.visualizer)
+        self.assertEqual(max_matching.engine, "hopcroft_karp")
+        self.assertEqual(len(max_matching.edges), 3)
+
+        graph.edges.append([3, 4])
+        max_matching = compute_maximum_matching(graph, Matching(), self.visualizer)
+        self.assertEqual(max_matching.engine, "edmonds")
+        self.assertEqual(len(max_matching.edges), 3)
+
+    def test_unknown_backend(self):
+        """
+        Ensures an unknown backend name is rejected.
+        """
+        graph = Graph()
+        with self.assertRaises(ValueError):
+            compute_maximum_matching(graph, Matching(), self.visualizer, backend="hungarian")
+
     def test_no_nodes(self):
         """
         Ensures the function handles an empty graph correctly and returns an empty matching.
@@ -0,0 +1,475 @@
+import itertools
+from typing import List, Tuple, Iterator
+from graphHelpers import Graph, Matching, EVEN, ODD, FREE
+
+MARKED = 2
+
+
+def maximum_weight_matching(graph: Graph, maxcardinality: bool = False, min_cost_perfect: bool = False) -> Matching:
+    """
+    Computes a maximum-weight matching of a general graph with the primal-dual blossom algorithm.
+
+    Edge weights are read with graph.weight(); edges added without a weight count as 1.
+
+    Args:
+        graph (Graph): An instance of the Graph class defined in graph_helpers.py.
+        maxcardinality (bool, optional): Only consider matchings of maximum cardinality and return
+            the heaviest of them. Defaults to False.
+        min_cost_perfect (bool, optional): Treat weights as costs and return the cheapest perfect
+            matching. Raises ValueError if the graph has no perfect matching. Defaults to False.
+
+    Returns:
+        Matching: The matching, with matching.engine set to "weighted" and matching.weight to its total weight.
+    """
+    nodes = list(graph.adjacency)
+    index = {node: position for position, node in enumerate(nodes)}
+    edges = []
+    for vertex1, vertex2 in graph.edge_order.values():
+        if vertex1 != vertex2:
+            weight = graph.weight(vertex1, vertex2)
+            edges.append((index[vertex1], index[vertex2], -weight if min_cost_perfect else weight))
+    mate = weighted_matching(len(nodes), edges, maxcardinality or min_cost_perfect)
+
+    matching = Matching()
+    for vertex, partner in enumerate(mate):
+        if vertex < partner:
+            matching.add_edge(nodes[vertex], nodes[partner])
+    if min_cost_perfect and 2 * len(matching.edge_order) != len(nodes):
+        raise ValueError("The graph has no perfect matching")
+    matching.engine = "weighted"
+    matching.weight = sum(graph.weight(vertex1, vertex2) for vertex1, vertex2 in matching.edge_order.values())
+    return matching
+
+def weighted_matching(vertex_count: int, edges: List[Tuple[int, int, float]], maxcardinality: bool = False) -> List[int]:
+    """
+    Runs the O(V^3) primal-dual blossom algorithm on vertices numbered from 0.
+
+    Args:
+        vertex_count (int): Number of vertices.
+        edges (List[Tuple[int, int, float]]): Edges as (vertex, vertex, weight), without self-loops.
+        maxcardinality (bool, optional): Restrict the search to maximum-cardinality matchings.
+
+    Returns:
+        List[int]: The partner of every vertex, or FREE (-1) for unmatched ones.
+    """
+    if not edges:
+        return [FREE] * vertex_count
+    return _PrimalDual(vertex_count, edges, maxcardinality).run()
+
+
+class _PrimalDual:
+    """
+    State of the weighted blossom algorithm.
+
+    Vertices are numbered 0..n-1 and blossoms n..2n-1. Every edge k has two endpoints 2k and
+    2k+1 so that endpoint ^ 1 is the opposite end. Each stage grows alternating trees of EVEN
+    (outer) and ODD (inner) top-level blossoms from the free vertices, using only tight edges,
+    and adjusts the dual variables whenever no tight edge is left to scan. Once an augmenting path
+    joins two trees, both are frozen and the other trees keep growing over tight edges, so a stage
+    can augment many times. It ends when the tight edges run out after at least one augmentation,
+    or with the proof that none of the remaining vertices can be matched profitably.
+    Blossom duals are kept non-negative, so odd blossoms are expanded when theirs reaches zero.
+    """
+
+    def __init__(self, vertex_count: int, edges: List[Tuple[int, int, float]], maxcardinality: bool):
+        self.vertex_count = vertex_count
+        self.edges = edges
+        self.maxcardinality = maxcardinality
+        self.integral = all(isinstance(weight, int) for _, _, weight in edges)
+        self.endpoint = [vertex for vertex1, vertex2, _ in edges for vertex in (vertex1, vertex2)]
+        self.neighbor_ends = [[] for _ in range(vertex_count)]
+        for edge, (vertex1, vertex2, _) in enumerate(edges):
+            self.neighbor_ends[vertex1].append(2 * edge + 1)
+            self.neighbor_ends[vertex2].append(2 * edge)
+        total = 2 * vertex_count
+        self.mate = [FREE] * vertex_count
+        self.label = [None] * total
+        self.label_end = [FREE] * total
+        self.in_blossom = list(range(vertex_count))
+        self.blossom_parent = [FREE] * total
+        self.blossom_children = [None] * total
+        self.blossom_base = list(range(vertex_count)) + [FREE] * vertex_count
+        self.blossom_ends = [None] * total
+        self.best_edge = [FREE] * total
+        self.blossom_best_edges = [None] * total
+        self.unused_blossoms = list(range(vertex_count, total))
+        max_weight = max(0, max(weight for _, _, weight in edges))
+        self.dual = [max_weight] * vertex_count + [0] * vertex_count
+        self.allowed = [False] * len(edges)
+        self.queue = []
+        self.tree = [FREE] * total
+        self.frozen = set()
+
+    def run(self) -> List[int]:
+        for _ in range(self.vertex_count):
+            self.start_stage()
+            if not self.grow():
+                break
+            for blossom in range(self.vertex_count, 2 * self.vertex_count):
+                if (self.blossom_parent[blossom] == FREE and self.blossom_base[blossom] >= 0
+                        and self.label[blossom] == EVEN and self.dual[blossom] == 0):
+                    self.expand(blossom, True)
+        return [FREE if partner == FREE else self.endpoint[partner] for partner in self.mate]
+
+    def slack(self, edge: int) -> float:
+        vertex1, vertex2, weight = self.edges[edge]
+        return self.dual[vertex1] + self.dual[vertex2] - 2 * weight
+
+    def leaves(self, blossom: int) -> Iterator[int]:
+        stack = [blossom]
+        while stack:
+            blossom = stack.pop()
+            if blossom < self.vertex_count:
+                yield blossom
+            else:
+                stack.extend(reversed(self.blossom_children[blossom]))
+
+    def start_stage(self):
+        total = 2 * self.vertex_count
+        self.label = [None] * total
+        self.best_edge = [FREE] * total
+        self.blossom_best_edges[self.vertex_count:] = [None] * self.vertex_count
+        self.allowed = [False] * len(self.edges)
+        self.queue = []
+        self.tree = [FREE] * total
+        self.frozen = set()
+        for vertex in range(self.vertex_count):
+            if self.mate[vertex] == FREE and self.label[self.in_blossom[vertex]] is None:
+                self.assign_label(vertex, EVEN, FREE, vertex)
+
+    def grow(self) -> bool:
+        """
+        Grows the trees of one stage, adjusting duals when needed.
+
+        Returns:
+            bool: True if the stage augmented the matching.
+        """
+        in_blossom, label, tree, frozen = self.in_blossom, self.label, self.tree, self.frozen
+        edges, dual, endpoint, allowed = self.edges, self.dual, self.endpoint, self.allowed
+        while True:
+            while self.queue:
+                vertex = self.queue.pop()
+                if tree[in_blossom[vertex]] in frozen:
+                    continue
+                for end in self.neighbor_ends[vertex]:
+                    edge = end // 2
+                    neighbor = endpoint[end]
+                    blossom, neighbor_blossom = in_blossom[vertex], in_blossom[neighbor]
+                    if blossom == neighbor_blossom:
+                        continue
+                    neighbor_label = label[neighbor_blossom]
+                    if neighbor_label is not None and frozen and tree[neighbor_blossom] in frozen:
+                        continue
+                    if not allowed[edge]:
+                        vertex1, vertex2, weight = edges[edge]
+                        edge_slack = dual[vertex1] + dual[vertex2] - 2 * weight
+                        if edge_slack <= 0:
+                            allowed[edge] = True
+                    if allowed[edge]:
+                        if neighbor_label is None:
+                            self.assign_label(neighbor, ODD, end ^ 1, tree[blossom])
+                        elif neighbor_label == EVEN:
+                            base = self.scan_blossom(vertex, neighbor)
+                            if base == FREE:
+                                frozen.update((tree[blossom], tree[neighbor_blossom]))
+                                self.augment(edge)
+                                break
+                            self.add_blossom(base, edge)
+                        elif self.label[neighbor] is None:
+                            self.label[neighbor] = ODD
+                            self.label_end[neighbor] = end ^ 1
+                    elif neighbor_label == EVEN:
+                        if self.best_edge[blossom] == FREE or edge_slack < self.slack(self.best_edge[blossom]):
+                            self.best_edge[blossom] = edge
+                    elif self.label[neighbor] is None:
+                        if self.best_edge[neighbor] == FREE or edge_slack < self.slack(self.best_edge[neighbor]):
+                            self.best_edge[neighbor] = edge
+            if frozen:
+                return True
+            if not self.adjust_duals():
+                return False
+
+    def adjust_duals(self) -> bool:
+        """
+        Changes the duals by the largest step that keeps every slack non-negative and acts on the
+        constraint that became tight.
+
+        Returns:
+            bool: False if the stage is over without an augmentation.
+        """
+        vertex_count = self.vertex_count
+        dual, label, in_blossom, best_edge = self.dual, self.label, self.in_blossom, self.best_edge
+        blossom_parent, blossom_base, slack = self.blossom_parent, self.blossom_base, self.slack
+        vertex_labels = [label[in_blossom[vertex]] for vertex in range(vertex_count)]
+        top_blossoms = [blossom for blossom in range(vertex_count, 2 * vertex_count)
+                        if blossom_base[blossom] >= 0 and blossom_parent[blossom] == FREE]
+        delta_type, delta, delta_edge, delta_blossom = None, None, FREE, FREE
+        if not self.maxcardinality:
+            delta_type, delta = 1, min(dual[:vertex_count])
+        for vertex in range(vertex_count):
+            if vertex_labels[vertex] is None and best_edge[vertex] != FREE:
+                candidate = slack(best_edge[vertex])
+                if delta_type is None or candidate < delta:
+                    delta_type, delta, delta_edge = 2, candidate, best_edge[vertex]
+        for blossom in itertools.chain(range(vertex_count), top_blossoms):
+            if blossom_parent[blossom] == FREE and label[blossom] == EVEN and best_edge[blossom] != FREE:
+                edge_slack = slack(best_edge[blossom])
+                candidate = edge_slack // 2 if self.integral else edge_slack / 2
+                if delta_type is None or candidate < delta:
+                    delta_type, delta, delta_edge = 3, candidate, best_edge[blossom]
+        for blossom in top_blossoms:
+            if label[blossom] == ODD and (delta_type is None or dual[blossom] < delta):
+                delta_type, delta, delta_blossom = 4, dual[blossom], blossom
+        if delta_type is None:
+            delta_type, delta = 1, max(0, min(dual[:vertex_count]))
+
+        for vertex in range(vertex_count):
+            if vertex_labels[vertex] == EVEN:
+                dual[vertex] -= delta
+            elif vertex_labels[vertex] == ODD:
+                dual[vertex] += delta
+        for blossom in top_blossoms:
+            if label[blossom] == EVEN:
+                dual[blossom] += delta
+            elif label[blossom] == ODD:
+                dual[blossom] -= delta
+
+        if delta_type == 1:
+            return False
+        if delta_type == 4:
+            self.expand(delta_blossom, False)
+            return True
+        self.allowed[delta_edge] = True
+        vertex1, vertex2, _ = self.edges[delta_edge]
+        if self.label[self.in_blossom[vertex1]] is None:
+            vertex1 = vertex2
+        self.queue.append(vertex1)
+        return True
+
+    def assign_label(self, vertex: int, label: int, end: int, root: int):
+        while True:
+            blossom = self.in_blossom[vertex]
+            self.tree[vertex] = self.tree[blossom] = root
+            self.label[vertex] = self.label[blossom] = label
+            self.label_end[vertex] = self.label_end[blossom] = end
+            self.best_edge[vertex] = self.best_edge[blossom] = FREE
+            if label == EVEN:
+                self.queue.extend(self.leaves(blossom))
+                return
+            matched_end = self.mate[self.blossom_base[blossom]]
+            vertex, label, end = self.endpoint[matched_end], EVEN, matched_end ^ 1
+
+    def scan_blossom(self, vertex1: int, vertex2: int) -> int:
+        """
+        Walks up both trees alternately until the paths meet.
+
+        Returns:
+            int: The base of the new blossom, or FREE if the trees are different (an augmenting path).
+        """
+        marked = []
+        base = FREE
+        while vertex1 != FREE:
+            blossom = self.in_blossom[vertex1]
+            if self.label[blossom] == MARKED:
+                base = self.blossom_base[blossom]
+                break
+            marked.append(blossom)
+            self.label[blossom] = MARKED
+            if self.label_end[blossom] == FREE:
+                vertex1 = FREE
+            else:
+                vertex1 = self.endpoint[self.label_end[blossom]]
+                vertex1 = self.endpoint[self.label_end[self.in_blossom[vertex1]]]
+            if vertex2 != FREE:
+                vertex1, vertex2 = vertex2, vertex1
+        for blossom in marked:
+            self.label[blossom] = EVEN
+        return base
+
+    def add_blossom(self, base: int, edge: int):
+        vertex1, vertex2, _ = self.edges[edge]
+        base_blossom = self.in_blossom[base]
+        blossom1, blossom2 = self.in_blossom[vertex1], self.in_blossom[vertex2]
+        blossom = self.unused_blossoms.pop()
+        self.blossom_base[blossom] = base
+        self.blossom_parent[blossom] = FREE
+        self.blossom_parent[base_blossom] = blossom
+        children, ends = [], []
+        while blossom1 != base_blossom:
+            self.blossom_parent[blossom1] = blossom
+            children.append(blossom1)
+            ends.append(self.label_end[blossom1])
+            blossom1 = self.in_blossom[self.endpoint[self.label_end[blossom1]]]
+        children.append(base_blossom)
+        children.reverse()
+        ends.reverse()
+        ends.append(2 * edge)
+        while blossom2 != base_blossom:
+            self.blossom_parent[blossom2] = blossom
+            children.append(blossom2)
+            ends.append(self.label_end[blossom2] ^ 1)
+            blossom2 = self.in_blossom[self.endpoint[self.label_end[blossom2]]]
+        self.blossom_children[blossom] = children
+        self.blossom_ends[blossom] = ends
+        self.label[blossom] = EVEN
+        self.label_end[blossom] = self.label_end[base_blossom]
+        self.tree[blossom] = self.tree[base_blossom]
+        self.dual[blossom] = 0
+        for vertex in self.leaves(blossom):
+            if self.label[self.in_blossom[vertex]] == ODD:
+                self.queue.append(vertex)
+            self.in_blossom[vertex] = blossom
+
+        best_to = {}
+        for child in children:
+            if self.blossom_best_edges[child] is None:
+                candidates = (end // 2 for vertex in self.leaves(child) for end in self.neighbor_ends[vertex])
+            else:
+                candidates = self.blossom_best_edges[child]
+            for candidate in candidates:
+                vertex1, vertex2, _ = self.edges[candidate]
+                if self.in_blossom[vertex2] == blossom:
+                    vertex1, vertex2 = vertex2, vertex1
+                other = self.in_blossom[vertex2]
+                if (other != blossom and self.label[other] == EVEN
+                        and (other not in best_to or self.slack(candidate) < self.slack(best_to[other]))):
+                    best_to[other] = candidate
+            self.blossom_best_edges[child] = None
+            self.best_edge[child] = FREE
+        self.blossom_best_edges[blossom] = list(best_to.values())
+        self.best_edge[blossom] = min(best_to.values(), key=self.slack, default=FREE)
+
+    def expand(self, blossom: int, end_stage: bool):
+        stack = [self.expand_steps(blossom, end_stage)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            else:
+                stack.append(self.expand_steps(child, end_stage))
+
+    def expand_steps(self, blossom: int, end_stage: bool) -> Iterator[int]:
+        for child in self.blossom_children[blossom]:
+            self.blossom_parent[child] = FREE
+            if child < self.vertex_count:
+                self.in_blossom[child] = child
+            elif end_stage and self.dual[child] == 0:
+                yield child
+            else:
+                for vertex in self.leaves(child):
+                    self.in_blossom[vertex] = child
+
+        if not end_stage and self.label[blossom] == ODD:
+            self.relabel_expanded(blossom)
+
+        self.label[blossom] = None
+        self.label_end[blossom] = FREE
+        self.blossom_children[blossom] = None
+        self.blossom_ends[blossom] = None
+        self.blossom_base[blossom] = FREE
+        self.blossom_best_edges[blossom] = None
+        self.best_edge[blossom] = FREE
+        self.unused_blossoms.append(blossom)
+
+    def relabel_expanded(self, blossom: int):
+        """
+        Relabels the children of an expanded ODD blossom: the ones on the even-length path from the
+        entry child to the base alternate ODD/EVEN, the others lose their labels unless they were
+        reached from outside.
+        """
+        children, ends = self.blossom_children[blossom], self.blossom_ends[blossom]
+        root = self.tree[blossom]
+        entry_child = self.in_blossom[self.endpoint[self.label_end[blossom] ^ 1]]
+        position = children.index(entry_child)
+        if position & 1:
+            position -= len(children)
+            step, trick = 1, 0
+        else:
+            step, trick = -1, 1
+        end = self.label_end[blossom]
+        while position != 0:
+            self.label[self.endpoint[end ^ 1]] = None
+            self.label[self.endpoint[ends[position - trick] ^ trick ^ 1]] = None
+            self.assign_label(self.endpoint[end ^ 1], ODD, end, root)
+            self.allowed[ends[position - trick] // 2] = True
+            position += step
+            end = ends[position - trick] ^ trick
+            self.allowed[end // 2] = True
+            position += step
+        child = children[position]
+        self.label[self.endpoint[end ^ 1]] = self.label[child] = ODD
+        self.label_end[self.endpoint[end ^ 1]] = self.label_end[child] = end
+        self.tree[child] = root
+        self.best_edge[child] = FREE
+        position += step
+        while children[position] != entry_child:
+            child = children[position]
+            position += step
+            if self.label[child] == EVEN:
+                continue
+            reached = next((vertex for vertex in self.leaves(child) if self.label[vertex] is not None), None)
+            if reached is not None:
+                self.label[reached] = None
+                self.label[self.endpoint[self.mate[self.blossom_base[child]]]] = None
+                self.assign_label(reached, ODD, self.label_end[reached], root)
+
+    def augment_blossom(self, blossom: int, vertex: int):
+        stack = [self.augment_blossom_steps(blossom, vertex)]
+        while stack:
+            task = next(stack[-1], None)
+            if task is None:
+                stack.pop()
+            else:
+                stack.append(self.augment_blossom_steps(*task))
+
+    def augment_blossom_steps(self, blossom: int, vertex: int) -> Iterator[Tuple[int, int]]:
+        """
+        Rotates a blossom so that vertex becomes its base, flipping the matched edges on the
+        even-length path between them. Nested blossoms on that path are yielded to the caller,
+        which rotates them before this step resumes.
+        """
+        child = vertex
+        while self.blossom_parent[child] != blossom:
+            child = self.blossom_parent[child]
+        if child >= self.vertex_count:
+            yield child, vertex
+        children, ends = self.blossom_children[blossom], self.blossom_ends[blossom]
+        start = position = children.index(child)
+        if start & 1:
+            position -= len(children)
+            step, trick = 1, 0
+        else:
+            step, trick = -1, 1
+        while position != 0:
+            position += step
+            child = children[position]
+            end = ends[position - trick] ^ trick
+            if child >= self.vertex_count:
+                yield child, self.endpoint[end]
+            position += step
+            child = children[position]
+            if child >= self.vertex_count:
+                yield child, self.endpoint[end ^ 1]
+            self.mate[self.endpoint[end]] = end ^ 1
+            self.mate[self.endpoint[end ^ 1]] = end
+        self.blossom_children[blossom] = children[start:] + children[:start]
+        self.blossom_ends[blossom] = ends[start:] + ends[:start]
+        self.blossom_base[blossom] = self.blossom_base[self.blossom_children[blossom][0]]
+
+    def augment(self, edge: int):
+        vertex1, vertex2, _ = self.edges[edge]
+        for vertex, end in ((vertex1, 2 * edge + 1), (vertex2, 2 * edge)):
+            while True:
+                blossom = self.in_blossom[vertex]
+                if blossom >= self.vertex_count:
+                    self.augment_blossom(blossom, vertex)
+                self.mate[vertex] = end
+                if self.label_end[blossom] == FREE:
+                    break
+                odd_blossom = self.in_blossom[self.endpoint[self.label_end[blossom]]]
+                vertex = self.endpoint[self.label_end[odd_blossom]]
+                entry = self.endpoint[self.label_end[odd_blossom] ^ 1]
+                if odd_blossom >= self.vertex_count:
+                    self.augment_blossom(odd_blossom, entry)
+                self.mate[entry] = self.label_end[odd_blossom]
+                end = self.label_end[odd_blossom] ^ 1